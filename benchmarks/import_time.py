@@ -0,0 +1,52 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+"""
+Measure how long `import pybulletX` takes in a fresh interpreter, and which of
+the heavy dependencies it pulls in.
+
+Usage:
+    python benchmarks/import_time.py [--repeat N]
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+_SNIPPET = """
+import sys, time, json
+t = time.perf_counter()
+import pybulletX
+elapsed = time.perf_counter() - t
+print(json.dumps({
+    "elapsed": elapsed,
+    "modules": [m for m in ("gym", "attrdict", "pybulletX.gui") if m in sys.modules],
+}))
+"""
+
+
+def measure(repeat):
+    results = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", _SNIPPET], stderr=subprocess.DEVNULL
+        )
+        results.append(json.loads(output.decode().strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    results = measure(args.repeat)
+    elapsed = [r["elapsed"] * 1000 for r in results]
+    print(
+        f"import pybulletX: median {statistics.median(elapsed):.1f} ms, "
+        f"min {min(elapsed):.1f} ms over {args.repeat} runs"
+    )
+    print(f"heavy modules imported: {results[-1]['modules']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+"""
+Compare the nested containers returned by get_states: attrdict.AttrMap (built
+on every call) and FixedDict (built once and refilled in place).
+
+Usage:
+    python benchmarks/states_container.py [--number N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+from attrdict import AttrMap
+
+import pybullet as p
+import pybulletX as px
+from pybulletX.utils.fixed_dict import FixedDict
+
+
+def _states():
+    # the states of an arm with a hand and 4 fingers
+    q = np.zeros(7)
+    return {
+        "joint_position": q,
+        "joint_velocity": q,
+        "hand": {
+            "joint_position": q,
+            **{f"finger{i}": {"joint_position": q} for i in range(4)},
+        },
+    }
+
+
+def _read(states):
+    return (
+        states.joint_position,
+        states.hand.joint_position,
+        states.hand.finger0.joint_position,
+        states["hand"]["finger3"]["joint_position"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    def attr_map():
+        _read(AttrMap(_states()))
+
+    container = FixedDict(_states())
+
+    def fixed_dict():
+        container.update(_states())
+        _read(container)
+
+    results = {}
+    for name, func in [("AttrMap", attr_map), ("FixedDict", fixed_dict)]:
+        results[name] = timeit.timeit(func, number=args.number) / args.number
+        print(f"{name:>10}: build + read {results[name] * 1e6:.2f} us")
+    print(f"speedup: {results['AttrMap'] / results['FixedDict']:.1f}x")
+
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        elapsed = timeit.timeit(robot.get_states, number=args.number) / args.number
+        print(f"Robot.get_states(): {elapsed * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
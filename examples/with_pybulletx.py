@@ -2,7 +2,6 @@
 import time
 import numpy as np
 
-import pybullet as p
 import pybulletX as px
 
 P_GAIN = 50
@@ -23,7 +22,7 @@ def main():
         actions.joint_torque = error * P_GAIN
         robot.set_actions(actions)
 
-        p.stepSimulation()
+        px.stepSimulation()
 
 
 if __name__ == "__main__":
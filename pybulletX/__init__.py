@@ -5,19 +5,77 @@ from .joint_info import JointInfo  # noqa: F401
 from .joint_state import JointState  # noqa: F401
 from .link_state import LinkState  # noqa: F401
 from .contact_point import ContactPoint  # noqa: F401
-from ._wrapper import _replace_original_methods
-from pybullet import stepSimulation, resetDebugVisualizerCamera  # noqa: F401
+from .dtype import set_default_dtype, get_default_dtype  # noqa: F401
+from ._wrapper import (  # noqa: F401
+    _replace_original_methods as patch_pybullet,
+    _restore_original_methods as unpatch_pybullet,
+    _getJointInfo as getJointInfo,
+    _getJointInfos as getJointInfos,
+    _getJointState as getJointState,
+    _getJointStates as getJointStates,
+    _getLinkState as getLinkState,
+    _getLinkStates as getLinkStates,
+    _getDynamicsInfo as getDynamicsInfo,
+    _getDynamicsInfos as getDynamicsInfos,
+)
+from pybullet import resetDebugVisualizerCamera  # noqa: F401
+import os as _os
 import pybullet_data as _p_data
 
-_replace_original_methods()
+# By default, pybullet.getJointInfo & co. are replaced by the versions returning
+# pybulletX structs. Set PYBULLETX_PATCH_PYBULLET=0 to leave pybullet untouched,
+# the wrapped versions are always available as pybulletX.getJointInfo & co.
+if _os.environ.get("PYBULLETX_PATCH_PYBULLET", "1") != "0":
+    patch_pybullet()
 
-from . import gui  # noqa: F401
 from . import helper  # noqa: F401
-from . import utils  # noqa: F401
-from .client import current_client, Client  # noqa: F401
+from .client import (  # noqa: F401
+    current_client,
+    Client,
+    stepSimulation,
+    setParameters,
+)
 from .body import Body  # noqa: F401
 from .robot import Robot  # noqa: F401
 
 from .helper import init, init_pybullet  # noqa: F401
 
 path = [_p_data.getDataPath()]
+
+# Submodules (and their attributes) that are only imported on first access, so
+# that `import pybulletX` stays cheap for processes that don't need them.
+# name => (module, attribute or None for the module itself)
+_LAZY_ATTRIBUTES = {
+    "gui": (".gui", None),
+    "utils": (".utils", None),
+    "kinematics": (".kinematics", None),
+    "randomization": (".randomization", None),
+    "logs": (".logs", None),
+    "gym": (".gym", None),
+    "fork": (".fork", None),
+    "checkpoint": (".checkpoint", None),
+    "server": (".server", None),
+    "CollisionChecker": (".collision_checker", "CollisionChecker"),
+    "BodyPool": (".body_pool", "BodyPool"),
+    "SpatialQuery": (".spatial_query", "SpatialQuery"),
+    "Camera": (".camera", "Camera"),
+    "RolloutCollector": (".rollout", "RolloutCollector"),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    import importlib
+
+    module_name, attr = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name, __name__)
+    if attr is not None:
+        value = getattr(value, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + list(_LAZY_ATTRIBUTES.keys()))
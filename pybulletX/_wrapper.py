@@ -7,6 +7,7 @@ from .joint_info import JointInfo
 from .joint_state import JointState
 from .link_state import LinkState
 from .dynamics_info import DynamicsInfo
+from .dtype import get_default_dtype
 
 
 _log = _logging.getLogger(__name__)
@@ -48,12 +49,19 @@ def _getJointInfo(*args, **kwargs):
     return joint_info
 
 
-def _getJointInfos(bodyUniqueId, jointIndices, **kwargs):
-    joint_info_tuples = [
+def _getJointInfosRaw(bodyUniqueId, jointIndices, **kwargs):
+    return [
         _orig_pybullet.getJointInfo(bodyUniqueId, joint_index, **kwargs)
         for joint_index in jointIndices
     ]
 
+
+def _getJointInfos(bodyUniqueId, jointIndices, **kwargs):
+    joint_info_tuples = _getJointInfosRaw(bodyUniqueId, jointIndices, **kwargs)
+    return _joint_infos_from_tuples(joint_info_tuples)
+
+
+def _joint_infos_from_tuples(joint_info_tuples):
     if joint_info_tuples:
         joint_infos = list(map(_numpy.array, zip(*joint_info_tuples)))
         joint_infos = JointInfo(*joint_infos)
@@ -70,13 +78,19 @@ def _getJointState(*args, **kwargs):
     return joint_state
 
 
-def _getJointStates(*args, **kwargs):
+def _getJointStates(*args, dtype=None, **kwargs):
+    """
+    Same as pybullet.getJointStates, but returns JointState of arrays of `dtype`
+    (px.get_default_dtype() by default).
+    """
     joint_state_tuples = _orig_pybullet.getJointStates(*args, **kwargs)
     if not joint_state_tuples:
         return None
 
     # tranpose tuple of tuples using zip & map
-    joint_states = list(map(_numpy.array, zip(*joint_state_tuples)))
+    if dtype is None:
+        dtype = get_default_dtype()
+    joint_states = [_numpy.array(x, dtype=dtype) for x in zip(*joint_state_tuples)]
     joint_states = JointState(*joint_states)
     joint_states._plural = True
     joint_states._data = joint_state_tuples
@@ -89,12 +103,18 @@ def _getLinkState(*args, **kwargs):
     return link_state
 
 
-def _getLinkStates(*args, **kwargs):
+def _getLinkStates(*args, dtype=None, **kwargs):
+    """
+    Same as pybullet.getLinkStates, but returns LinkState of arrays of `dtype`
+    (px.get_default_dtype() by default).
+    """
     link_state_tuples = _orig_pybullet.getLinkStates(*args, **kwargs)
     if not link_state_tuples:
         return None
 
-    link_states = list(map(_numpy.array, zip(*link_state_tuples)))
+    if dtype is None:
+        dtype = get_default_dtype()
+    link_states = [_numpy.array(x, dtype=dtype) for x in zip(*link_state_tuples)]
     link_states = LinkState(*link_states)
     link_states._plural = True
     link_states._data = link_state_tuples
@@ -109,12 +129,16 @@ def _getDynamicsInfo(bodyUniqueId, linkIndex, **kwargs):
     return dynamics_info
 
 
-def _getDynamicsInfos(bodyUniqueId, linkIndices, **kwargs):
-    dynamics_info_tuples = [
+def _getDynamicsInfosRaw(bodyUniqueId, linkIndices, **kwargs):
+    return [
         _orig_pybullet.getDynamicsInfo(bodyUniqueId, link_index, **kwargs)
         for link_index in linkIndices
     ]
 
+
+def _getDynamicsInfos(bodyUniqueId, linkIndices, **kwargs):
+    dynamics_info_tuples = _getDynamicsInfosRaw(bodyUniqueId, linkIndices, **kwargs)
+
     if dynamics_info_tuples:
         dynamics_infos = list(map(_numpy.array, zip(*dynamics_info_tuples)))
         dynamics_infos = DynamicsInfo(*dynamics_infos)
@@ -169,23 +193,57 @@ def _setParameters(cfg, physicsClientId=None):
         setter(*args, **kwargs)
 
 
-def _replace_original_methods():
-    _pybullet.getJointInfo = _getJointInfo
-    _pybullet.getJointInfos = _getJointInfos
+# name => function that returns pybulletX structs (JointInfo, JointState, ...)
+_wrapped_methods = {
+    "getJointInfo": _getJointInfo,
+    "getJointInfos": _getJointInfos,
+    "getJointState": _getJointState,
+    "getJointStates": _getJointStates,
+    "getLinkState": _getLinkState,
+    "getLinkStates": _getLinkStates,
+    "getDynamicsInfo": _getDynamicsInfo,
+    "getDynamicsInfos": _getDynamicsInfos,
+}
 
-    _pybullet.getJointState = _getJointState
-    _pybullet.getJointStates = _getJointStates
+# name => function that returns the tuples of the original pybullet functions
+_raw_methods = {
+    "getJointInfo": _orig_pybullet.getJointInfo,
+    "getJointInfos": _getJointInfosRaw,
+    "getJointState": _orig_pybullet.getJointState,
+    "getJointStates": _orig_pybullet.getJointStates,
+    "getLinkState": _orig_pybullet.getLinkState,
+    "getLinkStates": _orig_pybullet.getLinkStates,
+    "getDynamicsInfo": _orig_pybullet.getDynamicsInfo,
+    "getDynamicsInfos": _getDynamicsInfosRaw,
+}
 
-    _pybullet.getLinkState = _getLinkState
-    _pybullet.getLinkStates = _getLinkStates
 
-    _pybullet.getDynamicsInfo = _getDynamicsInfo
-    _pybullet.getDynamicsInfos = _getDynamicsInfos
+def _replace_original_methods():
+    """
+    Replace the functions in the global pybullet module by the ones returning
+    pybulletX structs, and add pybullet.setParameters. This affects every user of pybullet in the process.
+    """
+    for name, func in _wrapped_methods.items():
+        setattr(_pybullet, name, func)
 
-    assert not hasattr(_pybullet, "setParameters")
     _pybullet.setParameters = _setParameters
 
 
+def _restore_original_methods():
+    """
+    Undo _replace_original_methods, i.e. leave pybullet untouched. The wrapped
+    functions are still available as pybulletX.getJointInfo, etc.
+    """
+    for name in _wrapped_methods:
+        if hasattr(_orig_pybullet, name):
+            setattr(_pybullet, name, getattr(_orig_pybullet, name))
+        elif hasattr(_pybullet, name):
+            delattr(_pybullet, name)
+
+    if hasattr(_pybullet, "setParameters"):
+        del _pybullet.setParameters
+
+
 _exported_dunders = {
     "__version__",
 }
@@ -1,11 +1,13 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
 import logging
 import warnings
-import functools
 
 import pybulletX as px  # noqa: F401
 import pybullet as p
 
+from .dtype import _check_dtype, get_default_dtype
+from .utils.cache import cached_property
+
 log = logging.getLogger(__name__)
 
 
@@ -26,6 +28,7 @@ class Body:
         flags=0,
         global_scaling=None,
         physics_client: px.Client = None,
+        dtype=None,
     ):
         self.urdf_path = px.helper.find_file(urdf_path)
         self.init_base_position = list(base_position)
@@ -40,6 +43,14 @@ class Body:
             physics_client = px.current_client()
         self._physics_client = physics_client
 
+        # floating point type of the state arrays, px.get_default_dtype() if None
+        self._dtype = None if dtype is None else _check_dtype(dtype)
+
+        # bumped whenever the pose/velocity of this body is reset, so that
+        # per-step caches can tell the state changed without a stepSimulation
+        # (see _state_changed)
+        self._state_version = 0
+
         opts = {
             "file_name": urdf_path,
             "base_position": base_position,
@@ -71,6 +82,53 @@ class Body:
     def id(self):
         return self._id
 
+    def _get_checkpoint_state(self):
+        """
+        The pybulletX-side state of the body as JSON-serializable values, saved
+        in checkpoints (see px.checkpoint). Subclasses with their own state
+        extend it (and _set_checkpoint_state).
+        """
+        return {
+            "urdf_path": self.urdf_path,
+            "init_base_position": list(self.init_base_position),
+            "init_base_orientation": list(self.init_base_orientation),
+            "use_maximal_coordinates": self.use_maximal_coordinates,
+            "use_fixed_base": self.use_fixed_base,
+            "flags": self.flags,
+            "global_scaling": self.global_scaling,
+            "dtype": None if self._dtype is None else self._dtype.name,
+        }
+
+    def _set_checkpoint_state(self, state, body_id, physics_client):
+        """
+        Rebind an object created with cls.__new__ (instead of __init__) to the
+        body `body_id` loaded again when a checkpoint is restored.
+        """
+        self.urdf_path = state["urdf_path"]
+        self.init_base_position = state["init_base_position"]
+        self.init_base_orientation = state["init_base_orientation"]
+        self.use_maximal_coordinates = state["use_maximal_coordinates"]
+        self.use_fixed_base = state["use_fixed_base"]
+        self.flags = state["flags"]
+        self.global_scaling = state["global_scaling"]
+        self._physics_client = physics_client
+        self._dtype = None if state["dtype"] is None else _check_dtype(state["dtype"])
+        self._state_version = 0
+        self._id = body_id
+
+    def _state_changed(self):
+        """
+        Called whenever the state of this body is reset. Teleporting a body
+        changes the state of the whole simulation too, so bump both state
+        versions.
+        """
+        self._state_version += 1
+        px.client._state_versions[self.physics_client.id] += 1
+
+    @property
+    def dtype(self):
+        return get_default_dtype() if self._dtype is None else self._dtype
+
     @property
     def physics_client(self):
         return self._physics_client
@@ -83,8 +141,7 @@ class Body:
     def num_joints(self):
         return p.getNumJoints(self.id, **self._client_kwargs)
 
-    @property
-    @functools.lru_cache(maxsize=None)
+    @cached_property
     def _joint_name_to_index(self):
         return {
             j.joint_name.decode(): j.joint_index
@@ -101,7 +158,7 @@ class Body:
         """
         Get joint information and return as JointInfo, which is a structure.
         """
-        return p.getJointInfo(self.id, joint_index, **self._client_kwargs)
+        return px.getJointInfo(self.id, joint_index, **self._client_kwargs)
 
     def get_joint_info_by_name(self, joint_name):
         return self.get_joint_info(self.get_joint_index_by_name(joint_name))
@@ -110,13 +167,13 @@ class Body:
         """
         Get the joint informations and return JointInfo, which is a structure of arrays (SoA).
         """
-        return p.getJointInfos(self.id, joint_indices, **self._client_kwargs)
+        return px.getJointInfos(self.id, joint_indices, **self._client_kwargs)
 
     def get_joint_state(self, joint_index):
         """
         Get the state of a specific joint and return JointState, which is a structure.
         """
-        return p.getJointState(self.id, joint_index, **self._client_kwargs)
+        return px.getJointState(self.id, joint_index, **self._client_kwargs)
 
     def get_joint_state_by_name(self, joint_name):
         return self.get_joint_state(self.get_joint_index_by_name(joint_name))
@@ -125,13 +182,15 @@ class Body:
         """
         Get the states of all controllable joints and return JointState, which is a structure of arrays (SoA).
         """
-        return p.getJointStates(self.id, joint_indices, **self._client_kwargs)
+        return px.getJointStates(
+            self.id, joint_indices, dtype=self.dtype, **self._client_kwargs
+        )
 
     def get_link_state(self, link_index, **kwargs):
         """
         Get the state of a specific link and return LinkState, which is a structure.
         """
-        return p.getLinkState(self.id, link_index, **self._client_kwargs, **kwargs)
+        return px.getLinkState(self.id, link_index, **self._client_kwargs, **kwargs)
 
     def get_link_state_by_name(self, link_name, **kwargs):
         return self.get_link_state(self.get_joint_index_by_name(link_name), **kwargs)
@@ -140,19 +199,21 @@ class Body:
         """
         Get the states of all movable links and return LinkState, which is a structure of arrays (SoA).
         """
-        return p.getLinkStates(self.id, joint_indices, **self._client_kwargs, **kwargs)
+        return px.getLinkStates(
+            self.id, joint_indices, dtype=self.dtype, **self._client_kwargs, **kwargs
+        )
 
     def get_dynamics_info(self, link_index):
         """
         Get dynamics information and return as DynamicsInfo, which is a structure.
         """
-        return p.getDynamicsInfo(self.id, link_index, **self._client_kwargs)
+        return px.getDynamicsInfo(self.id, link_index, **self._client_kwargs)
 
     def get_dynamics_infos(self, link_indices):
         """
         Get dynamics informations and return as DynamicsInfo, which is a structure.
         """
-        return p.getDynamicsInfos(self.id, link_indices, **self._client_kwargs)
+        return px.getDynamicsInfos(self.id, link_indices, **self._client_kwargs)
 
     def set_base_pose(self, position, orientation=(0, 0, 0, 1)):
         """
@@ -161,6 +222,7 @@ class Body:
         p.resetBasePositionAndOrientation(
             self.id, position, orientation, **self._client_kwargs
         )
+        self._state_changed()
 
     def get_base_pose(self):
         """
@@ -181,6 +243,7 @@ class Body:
         p.resetBaseVelocity(
             self.id, linear_velocity, angular_velocity, **self._client_kwargs
         )
+        self._state_changed()
 
     def reset(self):
         self.set_base_pose(self.init_base_position, self.init_base_orientation)
@@ -0,0 +1,254 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import logging
+import collections
+
+import pybullet as p
+
+import pybulletX as px
+from .dtype import _check_dtype
+
+log = logging.getLogger(__name__)
+
+# default collision filters assigned by Bullet (btBroadphaseProxy)
+_DEFAULT_FILTER = 1
+_STATIC_FILTER = 2
+_ALL_FILTER = -1
+
+
+def _pool_key(
+    body_class,
+    urdf_path,
+    use_maximal_coordinates=None,
+    use_fixed_base=False,
+    flags=0,
+    global_scaling=None,
+    dtype=None,
+):
+    return (
+        body_class,
+        urdf_path,
+        use_maximal_coordinates,
+        use_fixed_base,
+        flags,
+        global_scaling,
+        None if dtype is None else _check_dtype(dtype),
+    )
+
+
+def _body_key(body):
+    return _pool_key(
+        type(body),
+        body.urdf_path,
+        body.use_maximal_coordinates,
+        body.use_fixed_base,
+        body.flags,
+        body.global_scaling,
+        body._dtype,
+    )
+
+
+class BodyPool:
+    """
+    A pool of bodies that recycles released bodies instead of removing them and
+    loading them again from URDF.
+
+    Released bodies are parked: they are teleported to `park_position`, put to
+    sleep and excluded from collision detection, so they cost (almost) nothing
+    to the simulation. Acquiring a body with the same URDF and load options
+    wakes a parked body up and teleports it, with zero velocity and all its
+    joints at zero, to the requested pose. Robots are reset like freshly loaded
+    ones: all movable joints free, default zero pose and state space, joints at
+    their zero pose, torque control off and motors locked.
+
+    At most `max_idle` parked bodies (and `max_idle_per_key` per URDF and load
+    options) are kept, the ones parked the longest ago are removed first.
+
+    Example::
+        >>> pool = px.BodyPool()
+        >>> pool.prewarm(10, "cube_small.urdf")
+        >>> cube = pool.acquire("cube_small.urdf", base_position=(0, 0, 1))
+        >>> pool.release(cube)
+    """
+
+    def __init__(
+        self,
+        max_idle=256,
+        max_idle_per_key=None,
+        park_position=(0, 0, -1000),
+        physics_client=None,
+    ):
+        if physics_client is None:
+            physics_client = px.current_client()
+        self.physics_client = physics_client
+        self.max_idle = max_idle
+        self.max_idle_per_key = max_idle_per_key
+        self.park_position = tuple(park_position)
+
+        # key => {body id: body} of the parked bodies, and all the parked bodies
+        # ordered from the least recently parked to the most recently parked.
+        self._idle = collections.defaultdict(collections.OrderedDict)
+        self._idle_lru = collections.OrderedDict()
+
+    @property
+    def num_idle(self):
+        return len(self._idle_lru)
+
+    def _load(self, body_class, urdf_path, **load_options):
+        return body_class(urdf_path, physics_client=self.physics_client, **load_options)
+
+    def acquire(
+        self,
+        urdf_path,
+        base_position=(0, 0, 0),
+        base_orientation=(0, 0, 0, 1),
+        body_class=None,
+        **load_options,
+    ):
+        """
+        Get a body of `body_class` (px.Body by default) loaded from `urdf_path`
+        with `load_options` (use_fixed_base, flags, ...) at the given pose,
+        reusing a parked one if possible.
+        """
+        if body_class is None:
+            body_class = px.Body
+        urdf_path = px.helper.find_file(urdf_path)
+        key = _pool_key(body_class, urdf_path, **load_options)
+
+        idle = self._idle.get(key)
+        if not idle:
+            return self._load(
+                body_class,
+                urdf_path,
+                base_position=base_position,
+                base_orientation=base_orientation,
+                **load_options,
+            )
+
+        _, body = idle.popitem(last=True)
+        del self._idle_lru[body.id]
+        self._unpark(body, base_position, base_orientation)
+        return body
+
+    def release(self, body):
+        """
+        Give a body back to the pool. The body must not be used afterwards.
+        """
+        assert (
+            body.physics_client.id == self.physics_client.id
+        ), "Can't release a body of another physics client"
+        assert body.id not in self._idle_lru, f"Body {body.id} is already released"
+
+        self._park(body)
+        key = _body_key(body)
+        self._idle[key][body.id] = body
+        self._idle_lru[body.id] = key
+
+        if self.max_idle_per_key is not None:
+            while len(self._idle[key]) > self.max_idle_per_key:
+                self._evict(next(iter(self._idle[key])))
+        while len(self._idle_lru) > self.max_idle:
+            self._evict(next(iter(self._idle_lru)))
+
+    def prewarm(self, n, urdf_path, body_class=None, **load_options):
+        """
+        Load bodies until there are at least `n` parked bodies of `urdf_path`
+        with `load_options`.
+        """
+        if body_class is None:
+            body_class = px.Body
+        urdf_path = px.helper.find_file(urdf_path)
+        key = _pool_key(body_class, urdf_path, **load_options)
+
+        num_missing = n - len(self._idle.get(key, ()))
+        for _ in range(num_missing):
+            body = self._load(
+                body_class, urdf_path, base_position=self.park_position, **load_options
+            )
+            self.release(body)
+
+    def clear(self):
+        """
+        Remove all the parked bodies from the simulation.
+        """
+        for body_id in list(self._idle_lru):
+            self._evict(body_id)
+
+    def _evict(self, body_id):
+        key = self._idle_lru.pop(body_id)
+        body = self._idle[key].pop(body_id)
+        if not self._idle[key]:
+            del self._idle[key]
+        log.debug(f"Evicting body {body_id} ({body.urdf_path}) from the pool")
+        self.physics_client.removeBody(body_id)
+
+    def _set_collision_filters(self, body, enable):
+        kwargs = body._client_kwargs
+        for link_index in range(-1, p.getNumJoints(body.id, **kwargs)):
+            if not enable:
+                group, mask = 0, 0
+            elif link_index == -1 and body.use_fixed_base:
+                group, mask = _STATIC_FILTER, _ALL_FILTER ^ _STATIC_FILTER
+            else:
+                group, mask = _DEFAULT_FILTER, _ALL_FILTER
+            p.setCollisionFilterGroupMask(body.id, link_index, group, mask, **kwargs)
+
+    def _reset_joints(self, body):
+        kwargs = body._client_kwargs
+        for joint_index in range(p.getNumJoints(body.id, **kwargs)):
+            p.resetJointState(body.id, joint_index, 0.0, 0.0, **kwargs)
+        body._state_changed()
+
+    def _reset_robot(self, robot):
+        """
+        Drop the configuration, the control mode and the motor targets of the
+        last user of a robot.
+        """
+        robot._torque_control = False
+        robot.configure_state_space(
+            joint_position=True,
+            joint_velocity=True,
+            joint_reaction_forces=True,
+            applied_joint_motor_torque=True,
+        )
+        robot.free_joint_indices = list(robot._get_free_joint_indices())
+        robot.zero_pose = robot._get_zero_joint_position()
+        robot._disable_torque_control()
+
+    def _park(self, body):
+        kwargs = body._client_kwargs
+        body.set_base_pose(self.park_position)
+        body.set_base_velocity((0, 0, 0), (0, 0, 0))
+        self._reset_joints(body)
+        self._set_collision_filters(body, False)
+
+        # Sleeping has to be allowed before the body can be put to sleep
+        p.changeDynamics(
+            body.id,
+            -1,
+            activationState=p.ACTIVATION_STATE_ENABLE_SLEEPING,
+            **kwargs,
+        )
+        p.changeDynamics(
+            body.id, -1, activationState=p.ACTIVATION_STATE_SLEEP, **kwargs
+        )
+
+    def _unpark(self, body, base_position, base_orientation):
+        kwargs = body._client_kwargs
+        p.changeDynamics(
+            body.id, -1, activationState=p.ACTIVATION_STATE_WAKE_UP, **kwargs
+        )
+        if not body.flags & p.URDF_ENABLE_SLEEPING:
+            p.changeDynamics(
+                body.id,
+                -1,
+                activationState=p.ACTIVATION_STATE_DISABLE_SLEEPING,
+                **kwargs,
+            )
+
+        self._set_collision_filters(body, True)
+        if isinstance(body, px.Robot):
+            self._reset_robot(body)
+        body.init_base_position = list(base_position)
+        body.init_base_orientation = list(base_orientation)
+        body.reset()
+        body.set_base_velocity((0, 0, 0), (0, 0, 0))
@@ -0,0 +1,206 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pybullet as p
+
+import pybulletX as px
+from .utils.cache import cached_property, clear_cache
+
+log = logging.getLogger(__name__)
+
+# With ER_SEGMENTATION_MASK_OBJECT_AND_LINKINDEX, pybullet packs the body unique
+# id in the lower 24 bits and the link index + 1 in the upper bits.
+_SEGMENTATION_BODY_MASK = (1 << 24) - 1
+
+
+def decode_segmentation_mask(seg):
+    """
+    Decode a segmentation mask rendered with
+    ER_SEGMENTATION_MASK_OBJECT_AND_LINKINDEX into body unique ids and link
+    indices (-1 for both where nothing was hit).
+    """
+    seg = np.asarray(seg, dtype=np.int64)
+    background = seg < 0
+    body_ids = np.where(background, -1, seg & _SEGMENTATION_BODY_MASK)
+    link_indices = np.where(background, -1, (seg >> 24) - 1)
+    return body_ids, link_indices
+
+
+@dataclass
+class PointCloud:
+    """
+    Points in world frame, with the body unique id and link index they belong
+    to (-1 where nothing was hit) and their RGB color.
+    """
+
+    points: np.ndarray  # (M, 3)
+    body_ids: np.ndarray  # (M,)
+    link_indices: np.ndarray  # (M,)
+    colors: np.ndarray  # (M, 3)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _select(self, indices):
+        return PointCloud(
+            self.points[indices],
+            self.body_ids[indices],
+            self.link_indices[indices],
+            self.colors[indices],
+        )
+
+    def voxel_downsample(self, voxel_size):
+        """
+        Keep one point per voxel of a grid of `voxel_size`: the centroid of the
+        points in the voxel, with the label and color of the first of them.
+        """
+        voxels = np.floor(self.points / voxel_size).astype(np.int64)
+        _, first, inverse, counts = np.unique(
+            voxels, axis=0, return_index=True, return_inverse=True, return_counts=True
+        )
+        inverse = inverse.reshape(-1)
+        points = np.stack(
+            [np.bincount(inverse, weights=x) for x in self.points.T], axis=-1
+        )
+        downsampled = self._select(first)
+        downsampled.points = points / counts[:, None]
+        return downsampled
+
+
+def _projection_parameter(name):
+    """
+    A Camera attribute the projection depends on: setting it invalidates the
+    cached projection matrix and pixel rays.
+    """
+    attr = "_" + name
+
+    def getter(self):
+        return getattr(self, attr)
+
+    def setter(self, value):
+        setattr(self, attr, value)
+        clear_cache(self, "projection_matrix", "_pixel_rays")
+
+    return property(getter, setter)
+
+
+class Camera:
+    """
+    A pinhole camera rendering through pybullet.getCameraImage.
+
+    Example::
+        >>> camera = px.Camera(width=320, height=240, fov=60)
+        >>> camera.look_at(eye=(1, 0, 1), target=(0, 0, 0))
+        >>> cloud = camera.point_cloud(voxel_size=0.01)
+    """
+
+    def __init__(
+        self,
+        width=320,
+        height=240,
+        fov=60.0,
+        near=0.01,
+        far=10.0,
+        renderer=p.ER_TINY_RENDERER,
+        physics_client=None,
+    ):
+        if physics_client is None:
+            physics_client = px.current_client()
+        self.physics_client = physics_client
+
+        self.width = width
+        self.height = height
+        self.fov = fov
+        self.near = near
+        self.far = far
+        self.renderer = renderer
+        self.look_at((1, 0, 1), (0, 0, 0))
+
+    width = _projection_parameter("width")
+    height = _projection_parameter("height")
+    fov = _projection_parameter("fov")
+    near = _projection_parameter("near")
+    far = _projection_parameter("far")
+
+    @cached_property
+    def projection_matrix(self):
+        return p.computeProjectionMatrixFOV(
+            self.fov, self.width / self.height, self.near, self.far
+        )
+
+    def look_at(self, eye, target, up=(0, 0, 1)):
+        self.view_matrix = p.computeViewMatrix(eye, target, up)
+
+    @cached_property
+    def _pixel_rays(self):
+        """
+        (H * W, 3) directions, in camera frame, of the rays through the pixel
+        centers, scaled such that a point at linear depth z is z * ray.
+        """
+        P = np.asarray(self.projection_matrix).reshape(4, 4).T
+        u = (np.arange(self.width) + 0.5) / self.width * 2 - 1
+        v = 1 - (np.arange(self.height) + 0.5) / self.height * 2
+        x, y = np.meshgrid(u / P[0, 0], v / P[1, 1])
+        # OpenGL cameras look along -z
+        return np.stack([x, y, -np.ones_like(x)], axis=-1).reshape(-1, 3)
+
+    def render(self, segmentation=True):
+        """
+        Render and return the (H, W, 4) RGBA image, the (H, W) raw depth buffer
+        and the (H, W) segmentation mask (or None).
+        """
+        flags = p.ER_SEGMENTATION_MASK_OBJECT_AND_LINKINDEX if segmentation else 0
+        if not segmentation:
+            flags |= p.ER_NO_SEGMENTATION_MASK
+        _, _, rgba, depth, seg = p.getCameraImage(
+            self.width,
+            self.height,
+            self.view_matrix,
+            self.projection_matrix,
+            renderer=self.renderer,
+            flags=flags,
+            physicsClientId=self.physics_client.id,
+        )
+        shape = (self.height, self.width)
+        rgba = np.asarray(rgba, dtype=np.uint8).reshape(shape + (4,))
+        depth = np.asarray(depth, dtype=np.float64).reshape(shape)
+        if segmentation:
+            seg = np.asarray(seg, dtype=np.int64).reshape(shape)
+        else:
+            seg = None
+        return rgba, depth, seg
+
+    def linearize_depth(self, depth):
+        """
+        Convert a raw depth buffer (in [0, 1]) to metric depth along the
+        optical axis.
+        """
+        near, far = self.near, self.far
+        return far * near / (far - (far - near) * np.asarray(depth))
+
+    def point_cloud(self, voxel_size=None, remove_background=False):
+        """
+        Render and back-project every pixel into a (H * W, 3) PointCloud in
+        world frame. Pixels where nothing was hit are at the far plane and
+        labeled -1, `remove_background` drops them. If `voxel_size` is given,
+        the cloud is downsampled with a voxel grid of that size.
+        """
+        rgba, depth, seg = self.render(segmentation=True)
+        z = self.linearize_depth(depth).reshape(-1, 1)
+        points_in_camera = self._pixel_rays * z
+
+        # view matrix is world => camera, column-major
+        V = np.asarray(self.view_matrix).reshape(4, 4).T
+        R, t = V[:3, :3], V[:3, 3]
+        points = (points_in_camera - t) @ R
+
+        body_ids, link_indices = decode_segmentation_mask(seg.reshape(-1))
+        cloud = PointCloud(points, body_ids, link_indices, rgba[..., :3].reshape(-1, 3))
+
+        if remove_background:
+            cloud = cloud._select(body_ids >= 0)
+        if voxel_size is not None:
+            cloud = cloud.voxel_downsample(voxel_size)
+        return cloud
@@ -0,0 +1,276 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+"""
+Checkpoints of a physics world together with the state of the pybulletX
+objects living in it, to resume a long simulation after a crash.
+
+A checkpoint is a single zip file holding the .bullet file written by
+pybullet's saveBullet (the state of the bodies) and a JSON file with what
+saveBullet doesn't capture: the loadURDF arguments of every body, the
+constraints created through pybulletX (Robot.attach, the control panels,
+Client.createConstraint), the physics engine parameters, the step stats and
+the state of the given Body/Robot objects (free_joint_indices, zero_pose,
+torque_control, state space configuration, ...).
+"""
+import os
+import json
+import logging
+import tempfile
+import threading
+import importlib
+import zipfile
+from dataclasses import dataclass, field
+
+import pybullet as p
+import pybulletX as px
+
+from .helper import _to_json
+from .utils.loop_thread import LoopThread
+
+log = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+_BULLET_FILE = "world.bullet"
+_METADATA_FILE = "pybulletx.json"
+
+# physics engine parameters set again on restore
+_ENGINE_PARAMETERS = (
+    "fixedTimeStep",
+    "numSubSteps",
+    "numSolverIterations",
+    "numNonContactInnerIterations",
+)
+
+
+@dataclass
+class Checkpoint:
+    """
+    What restore() rebuilt: the Body/Robot objects by name, and the new id of
+    every body and constraint (ids may change when they are created again, ex:
+    if bodies were removed before the checkpoint was saved).
+    """
+
+    physics_client: px.Client
+    bodies: dict = field(default_factory=dict)
+    body_ids: dict = field(default_factory=dict)
+    constraint_ids: dict = field(default_factory=dict)
+
+    def __getitem__(self, name):
+        return self.bodies[name]
+
+
+def _metadata(bodies, physics_client):
+    client_id = physics_client.id
+    # in the order of the bodies in the world, which is also the order of the
+    # bodies in the .bullet file (not the order of the ids once bodies have been
+    # removed)
+    num_bodies = p.getNumBodies(physicsClientId=client_id)
+    body_ids = [
+        p.getBodyUniqueId(i, physicsClientId=client_id) for i in range(num_bodies)
+    ]
+
+    urdfs = px.client._loaded_urdfs.get(client_id, {})
+    unknown = [body_id for body_id in body_ids if body_id not in urdfs]
+    if unknown:
+        raise ValueError(
+            f"Bodies {unknown} weren't loaded with px.Body, Client.loadURDF or "
+            "px.helper.loadURDF and can't be loaded again from a checkpoint"
+        )
+    objects = {}
+    for name, body in bodies.items():
+        if body.physics_client.id != client_id:
+            raise ValueError(f"{name} isn't in physics client {client_id}")
+        cls = type(body)
+        objects[name] = {
+            "class": f"{cls.__module__}:{cls.__qualname__}",
+            "id": body.id,
+            "state": body._get_checkpoint_state(),
+        }
+
+    params = p.getPhysicsEngineParameters(physicsClientId=client_id)
+    stats = px.client._get_step_stats(client_id)
+    constraints = px.client._constraints.get(client_id, {})
+    return {
+        "version": FORMAT_VERSION,
+        "body_ids": body_ids,
+        "urdfs": [urdfs[body_id] for body_id in body_ids],
+        "constraints": {str(k): _to_json(v) for k, v in sorted(constraints.items())},
+        "physics_engine_parameters": params,
+        "step_stats": {"num_steps": stats.num_steps, "sim_time": stats.sim_time},
+        "objects": objects,
+    }
+
+
+def save(path, bodies=None, physics_client=None):
+    """
+    Write a checkpoint of the world of `physics_client` (current client by
+    default) and of the Body/Robot objects `bodies` (a dict name => body) to
+    `path`. The file is replaced atomically: a crash while saving leaves the
+    previous checkpoint intact. Steps (px.stepSimulation or
+    Client.stepSimulation) of other threads wait for the checkpoint to be
+    taken, so that the .bullet file and the metadata describe the same step.
+
+    Every body of the world must have been loaded through pybulletX (px.Body,
+    Client.loadURDF), since pybullet can't rebuild bodies from a .bullet file.
+
+    Example::
+        >>> px.checkpoint.save("world.ckpt", {"robot": robot})
+        >>> ...  # after a crash
+        >>> robot = px.checkpoint.restore("world.ckpt")["robot"]
+    """
+    if physics_client is None:
+        physics_client = px.current_client()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        bullet_path = os.path.join(tmp, _BULLET_FILE)
+        with px.client._step_locks[physics_client.id]:
+            metadata = _metadata(bodies or {}, physics_client)
+            physics_client.saveBullet(bullet_path)
+
+        tmp_path = os.path.join(tmp, "checkpoint.zip")
+        with zipfile.ZipFile(tmp_path, "w") as f:
+            f.write(bullet_path, _BULLET_FILE)
+            f.writestr(_METADATA_FILE, json.dumps(metadata))
+        os.replace(tmp_path, path)
+
+
+def _import_class(name):
+    module_name, qualname = name.split(":")
+    value = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        value = getattr(value, attr)
+    return value
+
+
+def restore(path, physics_client=None):
+    """
+    Reset the world of `physics_client` (current client by default) to the
+    checkpoint `path`: load the bodies and create the constraints again,
+    restore their state from the .bullet file and rebuild the Body/Robot
+    objects saved with the checkpoint. The objects are rebuilt from their
+    saved state, without running their __init__ (nor querying pybullet for
+    joint infos, free joints, zero pose, ...). Bodies may get new ids, see
+    Checkpoint.body_ids.
+
+    The targets of the joint motors aren't part of the checkpoint, set the
+    actions again before stepping.
+    """
+    if physics_client is None:
+        physics_client = px.current_client()
+
+    with zipfile.ZipFile(path) as f:
+        metadata = json.loads(f.read(_METADATA_FILE))
+        if metadata["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"{path} has format version {metadata['version']}, "
+                f"expected {FORMAT_VERSION}"
+            )
+
+        physics_client.resetSimulation()
+
+        params = metadata["physics_engine_parameters"]
+        physics_client.setPhysicsEngineParameter(
+            **{k: params[k] for k in _ENGINE_PARAMETERS if k in params}
+        )
+        physics_client.setGravity(
+            params["gravityAccelerationX"],
+            params["gravityAccelerationY"],
+            params["gravityAccelerationZ"],
+        )
+
+        checkpoint = Checkpoint(physics_client)
+        body_ids = checkpoint.body_ids
+        for body_id, urdf in zip(metadata["body_ids"], metadata["urdfs"]):
+            body_ids[body_id] = physics_client.loadURDF(**urdf)
+
+        for constraint_id, args in metadata["constraints"].items():
+            args = dict(args)
+            changes = args.pop("changes")
+            for key in ("parentBodyUniqueId", "childBodyUniqueId"):
+                # -1 (no child body) isn't a body id
+                args[key] = body_ids.get(args[key], args[key])
+            new_id = physics_client.createConstraint(**args)
+            if changes:
+                physics_client.changeConstraint(new_id, **changes)
+            checkpoint.constraint_ids[int(constraint_id)] = new_id
+
+        with tempfile.TemporaryDirectory() as tmp:
+            physics_client.restoreState(fileName=f.extract(_BULLET_FILE, tmp))
+
+    for name, obj in metadata["objects"].items():
+        cls = _import_class(obj["class"])
+        body = cls.__new__(cls)
+        body._set_checkpoint_state(obj["state"], body_ids[obj["id"]], physics_client)
+        checkpoint.bodies[name] = body
+
+    stats = physics_client.step_stats
+    stats.reset()
+    stats.num_steps = metadata["step_stats"]["num_steps"]
+    stats.sim_time = metadata["step_stats"]["sim_time"]
+    return checkpoint
+
+
+class Checkpointer:
+    """
+    Periodically save checkpoints to `path` from a background thread, every
+    `interval` seconds (and once when started and stopped).
+
+    Checkpoints are never taken in the middle of a step (see save), but they
+    can be taken between any two calls of the control loop (ex: between
+    set_actions and stepSimulation). Call save() from the
+    loop instead to control exactly when checkpoints are taken.
+
+    Example::
+        >>> with px.checkpoint.Checkpointer("world.ckpt", {"robot": robot}, 60):
+        ...     for _ in range(steps):
+        ...         robot.set_actions(policy(robot.get_states()))
+        ...         px.stepSimulation()
+    """
+
+    def __init__(self, path, bodies=None, interval=60.0, physics_client=None):
+        if physics_client is None:
+            physics_client = px.current_client()
+        self.physics_client = physics_client
+
+        self.path = path
+        self.bodies = dict(bodies or {})
+        self.interval = interval
+        self.num_checkpoints = 0
+        self._lock = threading.Lock()
+        self._loop_thread = None
+
+    def save(self):
+        with self._lock:
+            save(self.path, self.bodies, self.physics_client)
+            self.num_checkpoints += 1
+
+    def _save_in_background(self):
+        try:
+            self.save()
+        except Exception:
+            # keep checkpointing, the next save may succeed
+            log.exception(f"Failed to save checkpoint {self.path}")
+
+    def start(self):
+        assert self._loop_thread is None, "Checkpointer already started"
+        self._loop_thread = LoopThread(self.interval, self._save_in_background)
+        self._loop_thread.daemon = True
+        self._loop_thread.start()
+
+    def stop(self, save=True):
+        """
+        Stop the background thread, and save a last checkpoint if `save`.
+        """
+        if self._loop_thread is not None:
+            self._loop_thread.stop()
+            self._loop_thread = None
+        if save:
+            self.save()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.stop()
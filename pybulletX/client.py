@@ -1,21 +1,83 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import time
 import logging
 import functools
 import threading
+import contextlib
+import collections
 
+import numpy as np
 import pybullet as p
 import pybulletX as px
 
+from ._wrapper import _wrapped_methods, _raw_methods, _setParameters
+from .contact_point import decorator as _contact_points_decorator
+from .contact_tracker import ContactTracker
+from .closest_points import closest_points_batch
+from .step_stats import StepStats
+
 log = logging.getLogger(__name__)
 
+# Several Client objects can refer to the same physics server (ex: the default
+# Client(client_id=0) and a Client created by the user), so the bookkeeping of
+# each physics server is keyed by its physics client id rather than stored in
+# the Client object.
+_state_versions = collections.Counter()
+_contact_trackers = collections.defaultdict(list)
+# physics client id => (state version, {query: ClosestPoints})
+_closest_points_cache = {}
+_step_stats = {}
+# physics client id => {body id: loadURDF arguments} of the bodies loaded by
+# px.helper.loadURDF (px.Body, Client.loadURDF, px.init)
+_loaded_urdfs = collections.defaultdict(dict)
+# physics client id => {constraint id: createConstraint arguments, updated by
+# changeConstraint} of the constraints created through pybulletX
+_constraints = collections.defaultdict(dict)
+# physics client id => lock held by stepSimulation, so that checkpoints (see
+# px.checkpoint) are never taken in the middle of a step. Locks hold no state
+# of the physics server and aren't dropped by _forget_client.
+_step_locks = collections.defaultdict(threading.RLock)
+
+# names of the positional arguments of pybullet.createConstraint and
+# pybullet.changeConstraint
+_CREATE_CONSTRAINT_ARGS = (
+    "parentBodyUniqueId",
+    "parentLinkIndex",
+    "childBodyUniqueId",
+    "childLinkIndex",
+    "jointType",
+    "jointAxis",
+    "parentFramePosition",
+    "childFramePosition",
+    "parentFrameOrientation",
+    "childFrameOrientation",
+)
+_CHANGE_CONSTRAINT_ARGS = ("userConstraintUniqueId", "jointChildPivot")
+
+# Client methods whose results are wrapped into pybulletX structs, unless the
+# client is in raw mode (see Client.raw_mode).
+_wrapped_client_methods = {
+    **_wrapped_methods,
+    "getContactPoints": _contact_points_decorator(p.getContactPoints),
+}
+_raw_client_methods = {
+    **_raw_methods,
+    "getContactPoints": p.getContactPoints,
+}
+
 
 class Client:
-    def __init__(self, mode: int = None, client_id: int = None):
+    def __init__(self, mode: int = None, client_id: int = None, raw: bool = False):
         # should provide either mode or client_id but not both
         # mode and client_id can't be both None at the same time.
         # This is equiv. to XOR test
         assert (mode is None) != (client_id is None)
 
+        # If True, getJointInfo, getJointState(s), getLinkState(s),
+        # getDynamicsInfo and getContactPoints return the plain tuples of
+        # pybullet instead of pybulletX structs.
+        self.raw = raw
+
         if client_id is None:
             self._initialized_by_us = True
             self._id = px.init(mode=mode)
@@ -27,6 +89,169 @@ class Client:
     def id(self):
         return self._id
 
+    @property
+    def state_version(self):
+        """
+        A counter that is bumped every time the state of the whole simulation
+        changes through pybulletX (stepSimulation, restoreState,
+        resetSimulation, the reset*, changeDynamics and setGravity methods of
+        the Client, or the state of a px.Body being reset). Queries that only
+        depend on the simulation state can be memoized on this counter.
+
+        Changes made with pybullet directly (ex: pybullet.stepSimulation) are
+        not seen: call invalidate_caches() after them.
+        """
+        return _state_versions[self._id]
+
+    def invalidate_caches(self):
+        """
+        Bump state_version, e.g. after changing the simulation with pybullet
+        directly, so that the caches memoized on it are recomputed.
+        """
+        _state_versions[self._id] += 1
+
+    @property
+    def step_stats(self):
+        """
+        StepStats (step count, simulated time, step durations, real-time
+        factor) of this physics client.
+        """
+        return _get_step_stats(self._id)
+
+    def stepSimulation(self):
+        return stepSimulation(physicsClientId=self._id)
+
+    def setParameters(self, cfg):
+        return setParameters(cfg, physicsClientId=self._id)
+
+    def setTimeStep(self, *args, **kwargs):
+        _get_step_stats(self._id).invalidate_time_step()
+        return self._apply("setTimeStep", *args, **kwargs)
+
+    def setPhysicsEngineParameter(self, *args, **kwargs):
+        _get_step_stats(self._id).invalidate_time_step()
+        return self._apply("setPhysicsEngineParameter", *args, **kwargs)
+
+    def restoreState(self, *args, **kwargs):
+        _state_versions[self._id] += 1
+        return self._apply("restoreState", *args, **kwargs)
+
+    def resetSimulation(self, *args, **kwargs):
+        _state_versions[self._id] += 1
+        _loaded_urdfs.pop(self._id, None)
+        _constraints.pop(self._id, None)
+        for tracker in _contact_trackers.get(self._id, ()):
+            tracker.reset()
+        return self._apply("resetSimulation", *args, **kwargs)
+
+    def disconnect(self, *args, **kwargs):
+        _forget_client(self._id)
+        return self._apply("disconnect", *args, **kwargs)
+
+    def loadURDF(self, *args, **kwargs):
+        return px.helper.loadURDF(*args, **kwargs, physicsClientId=self._id)
+
+    def removeBody(self, body_id):
+        _loaded_urdfs[self._id].pop(body_id, None)
+        return self._apply("removeBody", body_id)
+
+    def createConstraint(self, *args, **kwargs):
+        return createConstraint(*args, **kwargs, physicsClientId=self._id)
+
+    def changeConstraint(self, *args, **kwargs):
+        return changeConstraint(*args, **kwargs, physicsClientId=self._id)
+
+    def removeConstraint(self, *args, **kwargs):
+        return removeConstraint(*args, **kwargs, physicsClientId=self._id)
+
+    @contextlib.contextmanager
+    def raw_mode(self, raw: bool = True):
+        """
+        Temporarily return the plain tuples of pybullet, for hot paths that do
+        their own parsing.
+
+        Example::
+            >>> with client.raw_mode():
+            ...     joint_states = client.getJointStates(robot.id, joint_indices)
+        """
+        prev_raw, self.raw = self.raw, raw
+        try:
+            yield self
+        finally:
+            self.raw = prev_raw
+
+    def closest_points_batch(self, pairs, max_distance, stop_below=None, cache=False):
+        """
+        Get the closest points of many (body_a, link_a, body_b, link_b) pairs
+        at once as a ClosestPoints of arrays (see px.closest_points). Use
+        px.closest_points.ALL_LINKS as link index to consider all the links of
+        a body.
+
+        If `cache`, results are cached until state_version changes. Only use it
+        if the bodies are moved exclusively through pybulletX (px.Body,
+        px.stepSimulation, ...): state changes made with pybullet directly
+        (ex: pybullet.resetBasePositionAndOrientation) would return stale
+        distances.
+        """
+        pairs = np.ascontiguousarray(pairs, dtype=np.int64).reshape(-1, 4)
+        if not cache:
+            return closest_points_batch(
+                pairs, max_distance, stop_below, physicsClientId=self._id
+            )
+
+        key = (pairs.tobytes(), max_distance, stop_below)
+
+        version, cache = _closest_points_cache.get(self._id, (None, None))
+        if version != self.state_version:
+            cache = {}
+            _closest_points_cache[self._id] = (self.state_version, cache)
+
+        if key not in cache:
+            result = closest_points_batch(
+                pairs, max_distance, stop_below, physicsClientId=self._id
+            )
+            # the cached arrays are shared by all the callers
+            for value in result.__dict__.values():
+                if isinstance(value, np.ndarray):
+                    value.setflags(write=False)
+            cache[key] = result
+        return cache[key]
+
+    def track_contacts(self, bodies=None):
+        """
+        Create a ContactTracker (see px.contact_tracker) for this physics
+        client. It is updated after every px.stepSimulation/Client.stepSimulation
+        until it's passed to untrack_contacts.
+        """
+        tracker = ContactTracker(self._id, bodies)
+        _contact_trackers[self._id].append(tracker)
+        return tracker
+
+    def untrack_contacts(self, tracker):
+        _contact_trackers[self._id].remove(tracker)
+
+    def fork(self, n, fn):
+        """
+        Clone the physics world of this (DIRECT) client into `n` child
+        processes with os.fork, e.g. to run parallel branches from a scene
+        that is slow to build. Child i runs fn(i) with this client as current
+        client: the Client and Body objects of the parent are valid in the
+        children and refer to their own copy of the world. Returns a
+        px.fork.Fork handle to collect the (picklable) return values of fn.
+
+        Example::
+            >>> client = px.Client(mode=p.DIRECT)
+            >>> robot = px.Robot("kuka_iiwa/model.urdf", physics_client=client)
+            >>> def branch(i):
+            ...     robot.set_actions(sample_actions(i))
+            ...     client.stepSimulation()
+            ...     return robot.get_states().copy()
+            >>> states = client.fork(16, branch).results()
+        """
+        from .fork import fork
+
+        return fork(self, n, fn)
+
     def release(self):
         if not self._initialized_by_us:
             return
@@ -52,19 +277,28 @@ class Client:
     """
 
     def _apply(self, func_name, *args, **kwargs):
-        func = getattr(p, func_name)
+        methods = _raw_client_methods if self.raw else _wrapped_client_methods
+        func = methods.get(func_name) or getattr(p, func_name)
         return func(*args, **kwargs, physicsClientId=self._id)
 
+    def _apply_state_change(self, func_name, *args, **kwargs):
+        _state_versions[self._id] += 1
+        return self._apply(func_name, *args, **kwargs)
+
 
 # Note(poweic): This is very similar to torch.cuda.current_device,
 # torch.cuda.set_device
 _tls = threading.local()
 
 # By default, pybullet use client_id = 0 for all API.
-_tls.current_client = Client(client_id=0)
+_default_client = Client(client_id=0)
+_tls.current_client = _default_client
 
 
 def current_client() -> Client:
+    # threads other than the main thread start without a current client
+    if not hasattr(_tls, "current_client"):
+        _tls.current_client = _default_client
     return _tls.current_client
 
 
@@ -72,6 +306,101 @@ def set_client(client: Client):
     _tls.current_client = client
 
 
+def _get_step_stats(physicsClientId):
+    stats = _step_stats.get(physicsClientId)
+    if stats is None:
+        stats = _step_stats[physicsClientId] = StepStats(physicsClientId)
+    return stats
+
+
+def _forget_client(physicsClientId):
+    """
+    Drop the bookkeeping of a physics client. Physics client ids are reused
+    after a disconnect, so a new physics server must not inherit the state
+    versions, contact trackers, caches, step stats, bodies or constraints of a
+    previous one.
+    """
+    for registry in (
+        _state_versions,
+        _contact_trackers,
+        _closest_points_cache,
+        _step_stats,
+        _loaded_urdfs,
+        _constraints,
+    ):
+        registry.pop(physicsClientId, None)
+
+
+def setParameters(cfg, physicsClientId=None):
+    """
+    Same as pybullet.setParameters (see pybulletX._wrapper._setParameters), but
+    also lets the step stats of the physics server pick up a new time step.
+    """
+    if physicsClientId is None:
+        physicsClientId = current_client().id
+    _setParameters(cfg, physicsClientId)
+    _get_step_stats(physicsClientId).invalidate_time_step()
+
+
+def createConstraint(*args, physicsClientId=None, **kwargs):
+    """
+    Same as pybullet.createConstraint, but also records the constraint so that
+    it can be created again when a checkpoint is restored (see px.checkpoint).
+    """
+    if physicsClientId is None:
+        physicsClientId = current_client().id
+    constraint_id = p.createConstraint(*args, **kwargs, physicsClientId=physicsClientId)
+    _constraints[physicsClientId][constraint_id] = {
+        **dict(zip(_CREATE_CONSTRAINT_ARGS, args)),
+        **kwargs,
+        "changes": {},
+    }
+    return constraint_id
+
+
+def changeConstraint(*args, physicsClientId=None, **kwargs):
+    """
+    Same as pybullet.changeConstraint, also recorded for checkpoints.
+    """
+    if physicsClientId is None:
+        physicsClientId = current_client().id
+    p.changeConstraint(*args, **kwargs, physicsClientId=physicsClientId)
+
+    changes = {**dict(zip(_CHANGE_CONSTRAINT_ARGS, args)), **kwargs}
+    constraint = _constraints[physicsClientId].get(
+        changes.pop("userConstraintUniqueId")
+    )
+    if constraint is not None:
+        constraint["changes"].update(changes)
+
+
+def removeConstraint(constraint_id, physicsClientId=None):
+    if physicsClientId is None:
+        physicsClientId = current_client().id
+    _constraints[physicsClientId].pop(constraint_id, None)
+    p.removeConstraint(constraint_id, physicsClientId=physicsClientId)
+
+
+def stepSimulation(physicsClientId=None):
+    """
+    Same as pybullet.stepSimulation, but also bumps the state version of the
+    physics server so that per-step caches are invalidated, and updates the
+    contact trackers and the step stats. Calling pybullet.stepSimulation
+    directly bypasses this bookkeeping.
+    """
+    if physicsClientId is None:
+        physicsClientId = current_client().id
+    with _step_locks[physicsClientId]:
+        _state_versions[physicsClientId] += 1
+
+        start = time.perf_counter()
+        p.stepSimulation(physicsClientId=physicsClientId)
+        _get_step_stats(physicsClientId).record(start, time.perf_counter())
+
+        for tracker in _contact_trackers.get(physicsClientId, ()):
+            tracker.update()
+
+
 func_names = [
     # Basics
     "disconnect",
@@ -97,6 +426,7 @@ func_names = [
     # Controlling a robot
     "getNumJoints",
     "getJointInfo",
+    "getJointInfos",
     "setJointMotorControl2",
     "setJointMotorControlArray",
     "setJointMotorControlMultiDof",
@@ -129,6 +459,7 @@ func_names = [
     "getConstraintState",
     # Dynamics
     "getDynamicsInfo",
+    "getDynamicsInfos",
     "changeDynamics",
     # Physics Engine Parameters
     "setTimeStep",
@@ -181,9 +512,24 @@ func_names = [
     "unloadPlugin",
 ]
 
+# methods that change the state of the simulation and bump the state version
+_state_changing_func_names = {
+    "resetBasePositionAndOrientation",
+    "resetBaseVelocity",
+    "resetJointState",
+    "resetJointStateMultiDof",
+    "resetJointStatesMultiDof",
+    "changeDynamics",
+    "setGravity",
+}
+
 for func_name in func_names:
-    getattr(p, func_name)
-    partial = functools.partialmethod(Client._apply, func_name)
+    assert func_name in _wrapped_client_methods or hasattr(p, func_name)
+    # don't overwrite methods that need more than a plain passthrough
+    if func_name in Client.__dict__:
+        continue
+    if func_name in _state_changing_func_names:
+        partial = functools.partialmethod(Client._apply_state_change, func_name)
+    else:
+        partial = functools.partialmethod(Client._apply, func_name)
     setattr(Client, func_name, partial)
-
-Client.getContactPoints = px.contact_point.decorator(Client.getContactPoints)
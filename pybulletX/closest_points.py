@@ -0,0 +1,78 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+from dataclasses import dataclass
+
+import numpy as np
+import pybullet as p
+
+# Use as link index in closest_points_batch to consider all the links of a body
+ALL_LINKS = -2
+
+
+@dataclass
+class ClosestPoints:
+    """
+    The closest points of K (body_a, link_a, body_b, link_b) pairs, as arrays.
+    Pairs with nothing within max_distance have an infinite distance and NaN
+    positions/normals, pairs that were not evaluated (because of an early
+    exit) have a NaN distance.
+    """
+
+    distance: np.ndarray  # (K,)
+    position_on_a: np.ndarray  # (K, 3)
+    position_on_b: np.ndarray  # (K, 3)
+    normal_on_b: np.ndarray  # (K, 3)
+    link_index_a: np.ndarray  # (K,), useful with ALL_LINKS
+    link_index_b: np.ndarray  # (K,)
+    num_evaluated: int
+
+    def __len__(self):
+        return len(self.distance)
+
+
+def closest_points_batch(pairs, max_distance, stop_below=None, physicsClientId=0):
+    """
+    Get the closest points of each (body_a, link_a, body_b, link_b) row of
+    `pairs` as a ClosestPoints. If `stop_below` is given, the pairs after the
+    first one closer than `stop_below` are not evaluated.
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 4)
+    K = len(pairs)
+
+    distance = np.full(K, np.nan)
+    points = np.full((K, 3, 3), np.nan)
+    link_indices = np.full((K, 2), ALL_LINKS, dtype=np.int64)
+
+    num_evaluated = 0
+    for i, (body_a, link_a, body_b, link_b) in enumerate(pairs.tolist()):
+        num_evaluated += 1
+        results = p.getClosestPoints(
+            body_a,
+            body_b,
+            max_distance,
+            link_a,
+            link_b,
+            physicsClientId=physicsClientId,
+        )
+        if not results:
+            distance[i] = np.inf
+            continue
+
+        # contact_flag, body_a, body_b, link_a, link_b, position_on_a,
+        # position_on_b, normal_on_b, distance, ...
+        closest = min(results, key=lambda point: point[8])
+        distance[i] = closest[8]
+        points[i] = closest[5:8]
+        link_indices[i] = closest[3:5]
+
+        if stop_below is not None and closest[8] < stop_below:
+            break
+
+    return ClosestPoints(
+        distance=distance,
+        position_on_a=points[:, 0],
+        position_on_b=points[:, 1],
+        normal_on_b=points[:, 2],
+        link_index_a=link_indices[:, 0],
+        link_index_b=link_indices[:, 1],
+        num_evaluated=num_evaluated,
+    )
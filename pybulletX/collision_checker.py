@@ -0,0 +1,230 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import logging
+import weakref
+import warnings
+import multiprocessing
+
+import numpy as np
+import pybullet as p
+
+import pybulletX as px
+
+log = logging.getLogger(__name__)
+
+
+def _body_spec(body):
+    """
+    Everything needed to load a copy of `body` (in its current configuration)
+    into another physics client. Only contains plain Python objects so that it
+    can be sent to worker processes.
+    """
+    position, orientation = body.get_base_pose()
+    joint_positions = []
+    if body.num_joints > 0:
+        joint_positions = body.get_joint_states(range(body.num_joints)).joint_position
+    return {
+        "urdf_path": body.urdf_path,
+        "base_position": tuple(position),
+        "base_orientation": tuple(orientation),
+        "use_maximal_coordinates": body.use_maximal_coordinates,
+        "use_fixed_base": body.use_fixed_base,
+        "flags": body.flags,
+        "global_scaling": body.global_scaling,
+        "joint_positions": list(joint_positions),
+    }
+
+
+class _MirroredScene:
+    """
+    A copy of the robot and the obstacles loaded into a private DIRECT client.
+    """
+
+    def __init__(self, spec):
+        self.client_id = p.connect(p.DIRECT)
+        client = px.Client(client_id=self.client_id)
+        self._kwargs = {"physicsClientId": self.client_id}
+
+        robot = self._load(spec["robot"], client)
+        self.robot_id = robot.id
+        self.obstacle_ids = [self._load(s, client).id for s in spec["obstacles"]]
+        self.free_joint_indices = spec["free_joint_indices"]
+        self.self_collision = spec["self_collision"]
+        self.max_distance = spec["max_distance"]
+
+        # ignored[a + 1, b + 1] tells whether the collision between link a and
+        # link b of the robot should be ignored (index 0 is the base).
+        self.ignored = np.eye(robot.num_joints + 1, dtype=bool)
+        for joint_index in range(robot.num_joints):
+            parent_index = robot.get_joint_info(joint_index).parent_index
+            self.ignored[joint_index + 1, parent_index + 1] = True
+            self.ignored[parent_index + 1, joint_index + 1] = True
+        for a, b in spec["ignored_link_pairs"]:
+            self.ignored[a + 1, b + 1] = self.ignored[b + 1, a + 1] = True
+
+    def _load(self, spec, client):
+        spec = dict(spec)
+        joint_positions = spec.pop("joint_positions")
+        with warnings.catch_warnings():
+            # the user has already been warned when loading the original body
+            warnings.simplefilter("ignore")
+            body = px.Body(**spec, physics_client=client)
+        for joint_index, joint_position in enumerate(joint_positions):
+            p.resetJointState(body.id, joint_index, joint_position, **self._kwargs)
+        return body
+
+    def _min_distance(self, body_a, body_b):
+        points = p.getClosestPoints(body_a, body_b, self.max_distance, **self._kwargs)
+        if not points:
+            return np.inf
+
+        if body_a != body_b:
+            return min(point[8] for point in points)
+
+        # self collision, skip the link pairs that are always in contact
+        points = np.array([point[3:5] + (point[8],) for point in points])
+        link_a = points[:, 0].astype(np.int64) + 1
+        link_b = points[:, 1].astype(np.int64) + 1
+        distances = points[~self.ignored[link_a, link_b], 2]
+        return distances.min() if distances.size else np.inf
+
+    def min_distances(self, joint_positions):
+        min_distances = np.empty(len(joint_positions))
+        for i, q in enumerate(joint_positions):
+            p.resetJointStatesMultiDof(
+                self.robot_id,
+                self.free_joint_indices,
+                [[x] for x in q],
+                **self._kwargs,
+            )
+
+            distances = [
+                self._min_distance(self.robot_id, o) for o in self.obstacle_ids
+            ]
+            if self.self_collision:
+                distances.append(self._min_distance(self.robot_id, self.robot_id))
+            min_distances[i] = min(distances, default=np.inf)
+
+        return min_distances
+
+    def release(self):
+        p.disconnect(**self._kwargs)
+
+
+# The mirrored scene owned by each worker process of the pool
+_worker_scene = None
+
+
+def _init_worker(spec):
+    global _worker_scene
+    _worker_scene = _MirroredScene(spec)
+
+
+def _worker_min_distances(joint_positions):
+    return _worker_scene.min_distances(joint_positions)
+
+
+class CollisionChecker:
+    """
+    Check a batch of joint configurations of a robot for self-collisions and
+    collisions with a set of obstacles.
+
+    The robot and the obstacles (in their current poses) are mirrored into a
+    separate DIRECT physics client, so checking configurations never disturbs
+    the simulation the robot lives in. Only bodies loaded from URDF (i.e.
+    px.Body and px.Robot) can be mirrored.
+
+    Example::
+        >>> checker = px.CollisionChecker(robot, [table, shelf])
+        >>> in_collision, min_distances = checker.check(joint_positions)
+    """
+
+    def __init__(
+        self,
+        robot,
+        obstacles=(),
+        self_collision=True,
+        ignored_link_pairs=(),
+        max_distance=0.1,
+        margin=0.0,
+        num_workers=0,
+    ):
+        """
+        `max_distance` bounds the search for closest points (distances larger
+        than that are reported as np.inf) and configurations closer than
+        `margin` to any obstacle are reported as in collision. Adjacent links of
+        the robot are never checked against each other, `ignored_link_pairs`
+        adds more (link_a, link_b) pairs to skip. If `num_workers` > 0, large
+        batches are split across a pool of processes, each with its own copy of
+        the scene.
+        """
+        assert margin <= max_distance, "margin can't be larger than max_distance"
+        self.margin = margin
+        self.num_workers = num_workers
+
+        self._spec = {
+            "robot": _body_spec(robot),
+            "obstacles": [_body_spec(obstacle) for obstacle in obstacles],
+            "free_joint_indices": list(robot.free_joint_indices),
+            "self_collision": self_collision,
+            "ignored_link_pairs": [tuple(pair) for pair in ignored_link_pairs],
+            "max_distance": max_distance,
+        }
+        self.num_dofs = len(self._spec["free_joint_indices"])
+
+        self._scene = None
+        self._pool = None
+        # terminate the pool and disconnect the scene even if the checker is
+        # garbage collected without being released
+        self._finalizers = []
+
+    def min_distances(self, joint_positions):
+        """
+        Get the minimum distance between the robot and the obstacles (including
+        the robot itself) for each of the (N, num_dofs) joint configurations.
+        """
+        joint_positions = np.asarray(joint_positions, dtype=np.float64)
+        if joint_positions.ndim == 1:
+            joint_positions = joint_positions[None]
+        assert joint_positions.shape[1] == self.num_dofs, (
+            f"joint_positions should be of shape (N, {self.num_dofs}), "
+            f"got {joint_positions.shape}"
+        )
+
+        if self.num_workers > 0 and len(joint_positions) > self.num_workers:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(
+                    self.num_workers, initializer=_init_worker, initargs=(self._spec,)
+                )
+                self._finalizers.append(weakref.finalize(self, self._pool.terminate))
+            chunks = np.array_split(joint_positions, self.num_workers * 4)
+            return np.concatenate(self._pool.map(_worker_min_distances, chunks))
+
+        if self._scene is None:
+            self._scene = _MirroredScene(self._spec)
+            self._finalizers.append(weakref.finalize(self, self._scene.release))
+        return self._scene.min_distances(joint_positions)
+
+    def check(self, joint_positions):
+        """
+        Check the (N, num_dofs) joint configurations and return a boolean array
+        that tells whether each configuration is in collision, as well as the
+        minimum distances.
+        """
+        min_distances = self.min_distances(joint_positions)
+        return min_distances < self.margin, min_distances
+
+    def release(self):
+        """
+        Terminate the worker pool and disconnect the mirrored scene. Also done
+        when the checker is garbage collected, or on exiting its context.
+        """
+        while self._finalizers:
+            self._finalizers.pop()()
+        self._pool = None
+        self._scene = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.release()
@@ -0,0 +1,175 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import logging
+from dataclasses import dataclass, field
+
+import numpy as np
+import pybullet as p
+
+log = logging.getLogger(__name__)
+
+# A (body, link) pair is packed into 32 bits: 20 bits for the body unique id,
+# 12 bits for the link index + 1. A contact pair is packed into 64 bits.
+_LINK_BITS = 12
+_MAX_BODY_ID = 1 << (31 - _LINK_BITS)
+
+
+def _pack_pairs(pairs):
+    """
+    Pack (N, 4) [body_a, link_a, body_b, link_b] pairs into (N,) int64 keys.
+    """
+    a = (pairs[:, 0] << _LINK_BITS) | (pairs[:, 1] + 1)
+    b = (pairs[:, 2] << _LINK_BITS) | (pairs[:, 3] + 1)
+    return (a << 32) | b
+
+
+def _unpack_keys(keys):
+    a, b = keys >> 32, keys & 0xFFFFFFFF
+    mask = (1 << _LINK_BITS) - 1
+    return np.stack(
+        [a >> _LINK_BITS, (a & mask) - 1, b >> _LINK_BITS, (b & mask) - 1], axis=-1
+    )
+
+
+def _body_id(body):
+    return body if isinstance(body, (int, np.integer)) else body.id
+
+
+@dataclass
+class ContactPairs:
+    """
+    A set of contacting (body_a, link_a, body_b, link_b) pairs as a (K, 4)
+    array, with the normal forces summed over the contact points of each pair
+    and the number of contact points. Pairs are ordered such that
+    (body_a, link_a) < (body_b, link_b).
+    """
+
+    pairs: np.ndarray = field(default_factory=lambda: np.empty((0, 4), np.int64))
+    normal_force: np.ndarray = field(default_factory=lambda: np.empty(0))
+    num_points: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def _select(self, mask):
+        return ContactPairs(
+            self.pairs[mask], self.normal_force[mask], self.num_points[mask]
+        )
+
+    def involving(self, body, link=None, other=None):
+        """
+        Get the pairs where `body` (or one of its links) is in contact, with
+        `other` (a body) if given.
+        """
+        body = _body_id(body)
+        in_a = self.pairs[:, 0] == body
+        in_b = self.pairs[:, 2] == body
+        if link is not None:
+            in_a &= self.pairs[:, 1] == link
+            in_b &= self.pairs[:, 3] == link
+        if other is not None:
+            other = _body_id(other)
+            in_a &= self.pairs[:, 2] == other
+            in_b &= self.pairs[:, 0] == other
+        return self._select(in_a | in_b)
+
+
+@dataclass
+class ContactEvents:
+    """
+    The contact pairs that started (begin), are still in contact (persist) and
+    stopped (end) during the last step. The forces of the pairs that ended are
+    the ones of the step before.
+    """
+
+    begin: ContactPairs = field(default_factory=ContactPairs)
+    persist: ContactPairs = field(default_factory=ContactPairs)
+    end: ContactPairs = field(default_factory=ContactPairs)
+
+
+class ContactTracker:
+    """
+    Keep track of the contacting (body, link, body, link) pairs of a physics
+    client from one step to the next, and report the pairs that started,
+    persisted and ended as ContactEvents.
+
+    If `bodies` is given, only the contacts involving one of them are tracked.
+    Trackers created by Client.track_contacts are updated by
+    px.stepSimulation / Client.stepSimulation, otherwise call update() after
+    each step.
+
+    Example::
+        >>> tracker = client.track_contacts([finger, cube])
+        >>> client.stepSimulation()
+        >>> touched = len(tracker.events.begin.involving(finger, other=cube)) > 0
+    """
+
+    def __init__(self, physics_client_id, bodies=None):
+        self.physics_client_id = physics_client_id
+        self.bodies = None if bodies is None else [_body_id(b) for b in bodies]
+        self.contacts = ContactPairs()
+        self.events = ContactEvents()
+        self._keys = np.empty(0, np.int64)
+
+    def _get_contact_points(self):
+        kwargs = {"physicsClientId": self.physics_client_id}
+        if self.bodies is None:
+            return [p.getContactPoints(**kwargs)]
+
+        # contact points between two tracked bodies are only kept the first time
+        points = []
+        for i, body in enumerate(self.bodies):
+            body_points = p.getContactPoints(bodyA=body, **kwargs)
+            if i > 0:
+                body_points = [pt for pt in body_points if pt[2] not in self.bodies[:i]]
+            points.append(body_points)
+        return points
+
+    def _read_contacts(self):
+        points = [
+            pt for body_points in self._get_contact_points() for pt in body_points
+        ]
+        if not points:
+            return np.empty(0, np.int64), ContactPairs()
+
+        # contact_flag, body_a, body_b, link_a, link_b, ..., normal_force (index 9)
+        ids = np.array([pt[1:5] for pt in points], dtype=np.int64)
+        normal_force = np.array([pt[9] for pt in points])
+        assert ids[:, :2].max() < _MAX_BODY_ID, "Body unique id too large"
+
+        pairs = ids[:, [0, 2, 1, 3]]
+        swap = (pairs[:, 0] > pairs[:, 2]) | (
+            (pairs[:, 0] == pairs[:, 2]) & (pairs[:, 1] > pairs[:, 3])
+        )
+        pairs[swap] = pairs[swap][:, [2, 3, 0, 1]]
+
+        keys, inverse, num_points = np.unique(
+            _pack_pairs(pairs), return_inverse=True, return_counts=True
+        )
+        normal_force = np.bincount(inverse, weights=normal_force, minlength=len(keys))
+        return keys, ContactPairs(_unpack_keys(keys), normal_force, num_points)
+
+    def update(self):
+        """
+        Read the contact points of the current step and compute the events
+        w.r.t. the previous update.
+        """
+        keys, contacts = self._read_contacts()
+
+        began = ~np.isin(keys, self._keys, assume_unique=True)
+        ended = ~np.isin(self._keys, keys, assume_unique=True)
+        self.events = ContactEvents(
+            begin=contacts._select(began),
+            persist=contacts._select(~began),
+            end=self.contacts._select(ended),
+        )
+        self.contacts = contacts
+        self._keys = keys
+        return self.events
+
+    def reset(self):
+        """
+        Forget the contacts of the previous step.
+        """
+        self.contacts = ContactPairs()
+        self.events = ContactEvents()
+        self._keys = np.empty(0, np.int64)
@@ -0,0 +1,31 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+# floating point type of the arrays pybulletX builds from the (double) values
+# returned by pybullet: joint/link states, gym spaces, states and logs
+_default_dtype = np.dtype(np.float64)
+
+
+def _check_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype.kind != "f":
+        raise TypeError(f"Expected a floating point dtype, got {dtype}")
+    return dtype
+
+
+def set_default_dtype(dtype):
+    """
+    Set the floating point type of the state arrays built by pybulletX (default
+    float64). Bodies and robots created with dtype=... use their own.
+
+    Example::
+        >>> px.set_default_dtype(np.float32)
+        >>> robot.get_states().joint_position.dtype
+        dtype('float32')
+    """
+    global _default_dtype
+    _default_dtype = _check_dtype(dtype)
+
+
+def get_default_dtype():
+    return _default_dtype
@@ -0,0 +1,190 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+"""
+Clone a DIRECT physics world into child processes with os.fork (see
+Client.fork).
+"""
+import os
+import sys
+import random
+import signal
+import logging
+import threading
+import traceback
+from multiprocessing.connection import Pipe, wait
+
+import numpy as np
+import pybullet as p
+
+log = logging.getLogger(__name__)
+
+
+class ForkError(RuntimeError):
+    """
+    Raised by Fork.results() when a child raised or died.
+    """
+
+
+class Fork:
+    """
+    Handle on the children started by Client.fork(n, fn). Child i runs fn(i)
+    and sends its return value (which must be picklable) back through a pipe.
+
+    Example::
+        >>> with client.fork(8, lambda i: rollout(seed=i)) as children:
+        ...     returns = children.results()
+    """
+
+    def __init__(self, pids, connections):
+        self.pids = pids
+        self._connections = connections
+        self._results = [None] * len(pids)
+        # index => (error type name, message, traceback)
+        self._errors = {}
+        self._pending = set(range(len(pids)))
+
+    def __len__(self):
+        return len(self.pids)
+
+    @property
+    def done(self):
+        return not self._pending
+
+    def _receive(self, index):
+        connection = self._connections[index]
+        try:
+            success, value = connection.recv()
+        except EOFError:
+            success, value = False, ("EOFError", "child exited without a result", "")
+        connection.close()
+
+        _, status = os.waitpid(self.pids[index], 0)
+        if success:
+            self._results[index] = value
+        else:
+            if os.WIFSIGNALED(status):
+                value = (
+                    "Signal",
+                    f"child killed by signal {os.WTERMSIG(status)}",
+                    "",
+                )
+            self._errors[index] = value
+        self._pending.discard(index)
+
+    def wait(self, timeout=None):
+        """
+        Wait until all the children are done (or `timeout` seconds). Returns
+        True if they are all done.
+        """
+        while self._pending:
+            pending = {self._connections[i]: i for i in self._pending}
+            ready = wait(list(pending), timeout)
+            if not ready:
+                return False
+            for connection in ready:
+                self._receive(pending[connection])
+        return True
+
+    def results(self, timeout=None):
+        """
+        Wait for the children and get the return values of fn(0) .. fn(n - 1).
+        Raises ForkError if any child raised or died.
+        """
+        if not self.wait(timeout):
+            raise TimeoutError(f"{len(self._pending)} children are still running")
+        if self._errors:
+            index = min(self._errors)
+            name, message, trace = self._errors[index]
+            if trace:
+                log.error(f"Child {index} failed:\n{trace}")
+            raise ForkError(f"Child {index} raised {name}: {message}")
+        return list(self._results)
+
+    def kill(self):
+        """
+        Kill the children that are still running.
+        """
+        for index in sorted(self._pending):
+            try:
+                os.kill(self.pids[index], signal.SIGKILL)
+            except ProcessLookupError:
+                ...
+            self._receive(index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.kill()
+
+
+def _run_child(client, index, fn, connection):
+    from .client import set_client
+
+    code = 0
+    try:
+        # the Client and Body objects inherited from the parent still refer to
+        # the same physics client id, which is now the copy of this child
+        set_client(client)
+        # don't let every child sample the same random numbers
+        np.random.seed()
+        random.seed()
+        result = fn(index)
+        try:
+            connection.send((True, result))
+        except Exception:
+            connection.send((False, _format_error()))
+    except BaseException:
+        code = 1
+        try:
+            connection.send((False, _format_error()))
+        except Exception:
+            ...
+    finally:
+        connection.close()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # skip the atexit handlers and finalizers of the parent (which would
+        # disconnect its physics clients)
+        os._exit(code)
+
+
+def _format_error():
+    error_type, error, _ = sys.exc_info()
+    return (error_type.__name__, str(error), traceback.format_exc())
+
+
+def fork(client, n, fn):
+    """
+    Start `n` children with os.fork, each with a copy-on-write copy of the
+    physics world of `client` (which must be a DIRECT client), and run fn(i)
+    in child i with `client` as current client. Returns a Fork handle to
+    collect the return values of fn.
+    """
+    if not hasattr(os, "fork"):
+        raise NotImplementedError("Client.fork requires os.fork (Linux, macOS)")
+
+    info = p.getConnectionInfo(physicsClientId=client.id)
+    if not info["isConnected"] or info["connectionMethod"] != p.DIRECT:
+        raise ValueError(
+            f"Only DIRECT physics clients can be forked, client {client.id} "
+            f"uses connection method {info['connectionMethod']}"
+        )
+    if threading.active_count() > 1:
+        log.warning(
+            "Forking with other threads running, the children only get the "
+            "calling thread and locks held by the others stay locked"
+        )
+
+    pids, connections = [], []
+    for index in range(n):
+        parent_connection, child_connection = Pipe(duplex=False)
+        pid = os.fork()
+        if pid == 0:
+            for connection in connections:
+                connection.close()
+            parent_connection.close()
+            _run_child(client, index, fn, child_connection)
+        child_connection.close()
+        pids.append(pid)
+        connections.append(parent_connection)
+    return Fork(pids, connections)
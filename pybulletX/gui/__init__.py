@@ -1,4 +1,5 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
 from .control_panel import RobotControlPanel, PoseControlPanel  # noqa: F401
+from .debug_draw import DebugDraw  # noqa: F401
 
-del control_panel  # noqa: F821
+del control_panel, debug_draw  # noqa: F821
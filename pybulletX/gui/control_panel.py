@@ -124,7 +124,7 @@ class PoseControlPanel(ControlPanel):
         pos, ori = self.robot.get_base_pose()
         self.pose_slider = PoseSlider(f"base_{id(robot)}", pos, ori, **slider_params)
 
-        self.cid = p.createConstraint(
+        self.cid = self.robot.physics_client.createConstraint(
             self.robot.id,
             -1,
             -1,
@@ -138,7 +138,9 @@ class PoseControlPanel(ControlPanel):
 
     def update(self):
         pos, ori = self.pose_slider.value
-        p.changeConstraint(self.cid, pos, ori, maxForce=self.max_force)
+        self.robot.physics_client.changeConstraint(
+            self.cid, pos, ori, maxForce=self.max_force
+        )
 
 
 class RobotControlPanel(ControlPanel):
@@ -0,0 +1,267 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import logging
+import time
+
+import numpy as np
+import pybullet as p
+
+import pybulletX as px
+from ..contact_point import ContactPoint
+
+log = logging.getLogger(__name__)
+
+_LINE = "line"
+_TEXT = "text"
+
+
+def _body_id(body):
+    if body is None:
+        return -1
+    return body if isinstance(body, (int, np.integer)) else body.id
+
+
+def _as_points(x):
+    return np.asarray(x, dtype=np.float64).reshape(-1, 3)
+
+
+def _contact_arrow(contact_point):
+    if isinstance(contact_point, ContactPoint):
+        return (
+            contact_point.position_on_b,
+            contact_point.contact_normal_on_b,
+            contact_point.normal_force,
+        )
+    # position_on_b, contact_normal_on_b, contact_distance, normal_force
+    return contact_point[6], contact_point[7], contact_point[9]
+
+
+class DebugDraw:
+    """
+    Keyed debug drawings (lines, frame axes, arrows, contacts, trajectories and
+    text) that are updated in place.
+
+    Drawing under a key only records what should be shown. flush() then sends
+    all the drawings changed since the last flush to the GUI at once: the
+    debug items of a key are reused with replaceItemUniqueId, items that did
+    not change are left alone, and only the surplus items are removed. With
+    `max_rate` (in Hz), flushes that come too early are skipped and their
+    drawings coalesced into the next one, so drawing at control rate doesn't
+    flood the GUI server.
+
+    Example::
+        >>> draw = px.gui.DebugDraw(max_rate=30)
+        >>> while True:
+        >>>     draw.axes("ee", *robot.get_link_state(ee_link)[4:6])
+        >>>     draw.contacts("contacts", p.getContactPoints(robot.id))
+        >>>     draw.flush()
+    """
+
+    def __init__(self, max_rate=None, physics_client=None):
+        if physics_client is None:
+            physics_client = px.current_client()
+        self.physics_client = physics_client
+        self.max_rate = max_rate
+
+        # key => debug item ids and the primitives they show
+        self._items = {}
+        self._drawn = {}
+        # key => primitives to show at the next flush
+        self._pending = {}
+        self._last_flush = -np.inf
+
+    @property
+    def _client_kwargs(self):
+        return {"physicsClientId": self.physics_client.id}
+
+    @property
+    def num_items(self):
+        """
+        Number of debug items currently alive in the GUI.
+        """
+        return sum(item >= 0 for ids in self._items.values() for item in ids)
+
+    def keys(self):
+        return self._drawn.keys()
+
+    def lines(
+        self, key, starts, ends, colors=(1, 0, 0), width=1.0, parent=None, link=-1
+    ):
+        """
+        Draw N line segments from `starts` to `ends` (N x 3), in the frame of
+        the `link` of `parent` if given.
+        """
+        starts, ends = _as_points(starts), _as_points(ends)
+        colors = np.broadcast_to(np.asarray(colors, dtype=np.float64), starts.shape)
+        parent = _body_id(parent)
+        self._pending[key] = [
+            (_LINE, tuple(start), tuple(end), tuple(color), width, parent, link)
+            for start, end, color in zip(
+                starts.tolist(), ends.tolist(), colors.tolist()
+            )
+        ]
+
+    def line(self, key, start, end, color=(1, 0, 0), width=1.0, parent=None, link=-1):
+        self.lines(key, [start], [end], [color], width, parent, link)
+
+    def axes(
+        self,
+        key,
+        position=(0, 0, 0),
+        orientation=(0, 0, 0, 1),
+        size=0.1,
+        width=3.0,
+        parent=None,
+        link=-1,
+    ):
+        """
+        Draw the X (red), Y (green) and Z (blue) axes of a frame.
+        """
+        rotation = np.array(p.getMatrixFromQuaternion(orientation)).reshape(3, 3)
+        position = np.asarray(position, dtype=np.float64)
+        self.lines(
+            key,
+            [position] * 3,
+            position + size * rotation.T,
+            np.eye(3),
+            width,
+            parent,
+            link,
+        )
+
+    def arrows(self, key, starts, vectors, colors=(1, 0, 0), width=2.0, head=0.2):
+        """
+        Draw N arrows from `starts` along `vectors` (N x 3). `head` is the size
+        of the arrow heads relative to the length of the arrows.
+        """
+        starts, vectors = _as_points(starts), _as_points(vectors)
+        ends = starts + vectors
+
+        # the two barbs of a head are in the plane of the arrow and of z (or x
+        # for arrows along z)
+        reference = np.zeros_like(vectors)
+        along_z = np.abs(vectors[:, 2]) > 0.99 * np.linalg.norm(vectors, axis=-1)
+        reference[along_z, 0] = 1
+        reference[~along_z, 2] = 1
+        side = np.cross(vectors, reference)
+        side *= np.linalg.norm(vectors, axis=-1, keepdims=True) / np.maximum(
+            np.linalg.norm(side, axis=-1, keepdims=True), 1e-12
+        )
+        back = ends - head * vectors
+        barbs = [back + 0.5 * head * side, back - 0.5 * head * side]
+
+        colors = np.broadcast_to(np.asarray(colors, dtype=np.float64), starts.shape)
+        self.lines(
+            key,
+            np.concatenate([starts, ends, ends]),
+            np.concatenate([ends] + barbs),
+            np.concatenate([colors] * 3),
+            width,
+        )
+
+    def contacts(self, key, contact_points, scale=0.01, color=(1, 0, 1), width=2.0):
+        """
+        Draw the normal forces of contact points (as returned by
+        getContactPoints, tuples or ContactPoint) as arrows of length
+        `scale` * normal force.
+        """
+        arrows = [_contact_arrow(pt) for pt in contact_points]
+        if not arrows:
+            self.remove(key)
+            return
+        positions, normals, forces = zip(*arrows)
+        vectors = _as_points(normals) * (scale * np.asarray(forces))[:, None]
+        self.arrows(key, positions, vectors, color, width)
+
+    def trajectory(self, key, points, color=(0, 0, 1), width=1.0, max_points=None):
+        """
+        Draw the polyline going through `points` (N x 3), keeping only the last
+        `max_points` points if given.
+        """
+        points = _as_points(points)
+        if max_points is not None:
+            points = points[-max_points:]
+        self.lines(key, points[:-1], points[1:], color, width)
+
+    def text(
+        self, key, text, position, color=(0, 0, 0), size=1.0, parent=None, link=-1
+    ):
+        self._pending[key] = [
+            (_TEXT, text, tuple(position), tuple(color), size, _body_id(parent), link)
+        ]
+
+    def remove(self, key):
+        """
+        Remove the drawing of `key` at the next flush.
+        """
+        self._pending[key] = []
+
+    def clear(self):
+        """
+        Remove all the drawings at the next flush.
+        """
+        for key in set(self._drawn) | set(self._pending):
+            self._pending[key] = []
+
+    def flush(self, force=False):
+        """
+        Send the drawings changed since the last flush to the GUI, unless the
+        last flush was less than 1 / max_rate ago (and `force` is False).
+        Returns whether the drawings were sent.
+        """
+        now = time.perf_counter()
+        if not force and self.max_rate is not None:
+            if now - self._last_flush < 1.0 / self.max_rate:
+                return False
+
+        for key, primitives in self._pending.items():
+            self._update(key, primitives)
+        self._pending.clear()
+        self._last_flush = now
+        return True
+
+    def _update(self, key, primitives):
+        ids = self._items.pop(key, [])
+        drawn = self._drawn.pop(key, [])
+
+        new_ids = []
+        for i, primitive in enumerate(primitives):
+            if i >= len(ids):
+                new_ids.append(self._draw(primitive))
+            elif drawn[i] == primitive:
+                new_ids.append(ids[i])
+            elif drawn[i][0] != primitive[0]:
+                self._remove_item(ids[i])
+                new_ids.append(self._draw(primitive))
+            else:
+                new_ids.append(self._draw(primitive, replace=ids[i]))
+
+        for item in ids[len(primitives) :]:
+            self._remove_item(item)
+
+        if primitives:
+            self._items[key] = new_ids
+            self._drawn[key] = list(primitives)
+
+    def _draw(self, primitive, replace=-1):
+        kind, *args, parent, link = primitive
+        kwargs = dict(
+            parentObjectUniqueId=parent,
+            parentLinkIndex=link,
+            **self._client_kwargs,
+        )
+        # debug items can only be replaced when they exist (i.e. in the GUI)
+        if replace >= 0:
+            kwargs["replaceItemUniqueId"] = replace
+
+        if kind == _LINE:
+            start, end, color, width = args
+            return p.addUserDebugLine(start, end, color, lineWidth=width, **kwargs)
+
+        text, position, color, size = args
+        return p.addUserDebugText(
+            text, position, textColorRGB=color, textSize=size, **kwargs
+        )
+
+    def _remove_item(self, item):
+        if item >= 0:
+            p.removeUserDebugItem(item, **self._client_kwargs)
@@ -0,0 +1,289 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import sys
+import logging
+import traceback
+import collections
+import multiprocessing as mp
+
+import gym
+import numpy as np
+from gym.vector.utils import CloudpickleWrapper
+
+import pybulletX as px
+from .rollout import _leaves, _nest
+from .utils.shared_arrays import SharedArrays
+
+log = logging.getLogger(__name__)
+
+
+class RobotEnv(gym.Env):
+    """
+    A gym environment around a robot (any IRobot): observations are copies of
+    robot.get_states() (which reuses its arrays), actions go to robot.set_actions() and every step calls
+    px.stepSimulation once.
+
+    `reward_fn(states, actions)` and `done_fn(states)` compute the reward and
+    the end of the episodes (0 and never by default), `reset_fn(robot)` resets
+    the episodes (robot.reset() by default).
+    """
+
+    def __init__(
+        self,
+        robot,
+        reward_fn=None,
+        done_fn=None,
+        reset_fn=None,
+        max_episode_steps=None,
+        physics_client=None,
+    ):
+        if physics_client is None:
+            physics_client = getattr(robot, "physics_client", None)
+        if physics_client is None:
+            physics_client = px.current_client()
+        self.physics_client = physics_client
+
+        self.robot = robot
+        self.reward_fn = reward_fn
+        self.done_fn = done_fn
+        self.reset_fn = reset_fn
+        self.max_episode_steps = max_episode_steps
+        self.num_steps = 0
+
+        self.observation_space = robot.state_space
+        self.action_space = robot.action_space
+
+    def reset(self):
+        if self.reset_fn is None:
+            self.robot.reset()
+        else:
+            self.reset_fn(self.robot)
+        self.num_steps = 0
+        return _copy_nested(self.robot.get_states())
+
+    def step(self, actions):
+        self.robot.set_actions(actions)
+        px.stepSimulation(physicsClientId=self.physics_client.id)
+        self.num_steps += 1
+
+        states = _copy_nested(self.robot.get_states())
+        reward = 0.0 if self.reward_fn is None else self.reward_fn(states, actions)
+        done = self.done_fn is not None and bool(self.done_fn(states))
+        info = {}
+        if self.max_episode_steps is not None:
+            if self.num_steps >= self.max_episode_steps and not done:
+                done = True
+                info["TimeLimit.truncated"] = True
+        return states, reward, done, info
+
+    def seed(self, seed=None):
+        return [seed]
+
+    def close(self):
+        self.physics_client.release()
+
+
+def _worker(index, env_fn, pipe, parent_pipe):
+    parent_pipe.close()
+    env = None
+    observations = actions = None
+    try:
+        env = env_fn()
+        pipe.send(((env.observation_space, env.action_space), True))
+
+        while True:
+            command, data = pipe.recv()
+            if command == "attach":
+                observations = SharedArrays(
+                    env.observation_space, data["num_envs"], data["observations"]
+                )
+                actions = SharedArrays(
+                    env.action_space, data["num_envs"], data["actions"]
+                )
+                action_views = actions.views(index)
+                pipe.send((None, True))
+            elif command == "reset":
+                observations.write(env.reset(), index)
+                pipe.send((None, True))
+            elif command == "step":
+                states, reward, done, info = env.step(action_views)
+                if done:
+                    info["terminal_observation"] = states
+                    states = env.reset()
+                observations.write(states, index)
+                pipe.send(((reward, done, info), True))
+            elif command == "seed":
+                pipe.send((env.seed(data), True))
+            elif command == "close":
+                pipe.send((None, True))
+                break
+            else:
+                raise RuntimeError(f"Unknown command {command}")
+    except (KeyboardInterrupt, Exception):
+        error_type, error, _ = sys.exc_info()
+        pipe.send(((error_type.__name__, str(error), traceback.format_exc()), False))
+    finally:
+        action_views = None
+        for shared in (observations, actions):
+            if shared is not None:
+                shared.close()
+        if env is not None:
+            env.close()
+        pipe.close()
+
+
+class VecEnv(gym.vector.VectorEnv):
+    """
+    Run `env_fns` (functions building a gym environment, ex: a RobotEnv, with
+    its own physics client) in worker processes.
+
+    The observations and actions of all the environments are exchanged
+    through shared memory arrays laid out from their SpaceDict (one
+    (num_envs, *shape) array per leaf), the pipes to the workers only carry
+    commands, rewards, dones and infos. Like gym's AsyncVectorEnv, episodes
+    are reset automatically when they end, and step/reset can be split into
+    *_async and *_wait calls.
+
+    Example::
+        >>> def make_env():
+        ...     client = px.Client(mode=p.DIRECT)
+        ...     robot = px.Robot("kuka_iiwa/model.urdf", physics_client=client)
+        ...     return px.gym.RobotEnv(robot)
+        >>> env = px.gym.VecEnv([make_env] * 8)
+        >>> states = env.reset()
+        >>> states, rewards, dones, infos = env.step(actions)
+    """
+
+    def __init__(self, env_fns, copy=True, context=None):
+        ctx = mp.get_context(context)
+        self.copy = copy
+        self.parent_pipes, self.processes = [], []
+        for index, env_fn in enumerate(env_fns):
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name=f"pybulletX.VecEnv-{index}",
+                args=(index, CloudpickleWrapper(env_fn), child_pipe, parent_pipe),
+                daemon=True,
+            )
+            self.parent_pipes.append(parent_pipe)
+            self.processes.append(process)
+            process.start()
+            child_pipe.close()
+
+        self._observations = self._actions = None
+        self._observation_views = None
+        self._waiting = None
+        spaces = self._receive_all()
+        observation_space, action_space = spaces[0]
+        super().__init__(len(env_fns), observation_space, action_space)
+
+        self._observations = SharedArrays(observation_space, self.num_envs)
+        self._actions = SharedArrays(action_space, self.num_envs)
+        self._observation_views = self._observations.views()
+        self._send_all(
+            "attach",
+            {
+                "num_envs": self.num_envs,
+                "observations": self._observations.name,
+                "actions": self._actions.name,
+            },
+        )
+        self._receive_all()
+
+    def _send_all(self, command, data=None):
+        for pipe in self.parent_pipes:
+            pipe.send((command, data))
+
+    def _receive_all(self):
+        results, errors = [], []
+        for index, pipe in enumerate(self.parent_pipes):
+            result, success = pipe.recv()
+            if success:
+                results.append(result)
+            else:
+                errors.append((index, result))
+        if errors:
+            index, (name, message, trace) = errors[0]
+            log.error(f"Worker {index} failed:\n{trace}")
+            self.close_extras(terminate=True)
+            self.closed = True
+            raise RuntimeError(f"Worker {index} raised {name}: {message}")
+        return results
+
+    def _start(self, command, data=None):
+        assert self._waiting is None, f"Still waiting for {self._waiting}_wait()"
+        self._send_all(command, data)
+        self._waiting = command
+
+    def _wait(self, command):
+        assert self._waiting == command, f"Call {command}_async() first"
+        results = self._receive_all()
+        self._waiting = None
+        return results
+
+    def _get_observations(self):
+        if self.copy:
+            return _copy_nested(self._observation_views)
+        return self._observation_views
+
+    def reset_async(self):
+        self._start("reset")
+
+    def reset_wait(self):
+        self._wait("reset")
+        return self._get_observations()
+
+    def step_async(self, actions):
+        """
+        `actions` is either a nested mapping of (num_envs, ...) arrays or a
+        sequence of num_envs nested mappings.
+        """
+        if isinstance(actions, collections.abc.Mapping):
+            self._actions.write(actions)
+        else:
+            for index, action in enumerate(actions):
+                self._actions.write(action, index)
+        self._start("step")
+
+    def step_wait(self):
+        results = self._wait("step")
+        rewards, dones, infos = zip(*results)
+        return (
+            self._get_observations(),
+            np.array(rewards, dtype=np.float64),
+            np.array(dones, dtype=np.bool_),
+            list(infos),
+        )
+
+    def seed(self, seeds=None):
+        if seeds is None or isinstance(seeds, int):
+            seeds = [None if seeds is None else seeds + i for i in range(self.num_envs)]
+        for pipe, seed in zip(self.parent_pipes, seeds):
+            pipe.send(("seed", seed))
+        return self._receive_all()
+
+    def close_extras(self, timeout=None, terminate=False):
+        if not terminate:
+            try:
+                if self._waiting is not None:
+                    self._wait(self._waiting)
+                self._send_all("close")
+                self._receive_all()
+            except (BrokenPipeError, EOFError, RuntimeError):
+                terminate = True
+
+        for process in self.processes:
+            if terminate and process.is_alive():
+                process.terminate()
+            process.join(timeout)
+        for pipe in self.parent_pipes:
+            pipe.close()
+        self._observation_views = None
+        for shared in (self._observations, self._actions):
+            if shared is not None:
+                shared.close(unlink=True)
+        self._observations = self._actions = None
+
+
+def _copy_nested(values):
+    return _nest((keys, np.array(value)) for keys, value in _leaves(values))
@@ -10,6 +10,11 @@ import pybullet as p
 import pybullet_data
 
 import pybulletX as px
+from ._wrapper import _setParameters
+from .utils.asset_resolver import AssetResolver
+
+# Used by find_file to look up files in pybulletX.path
+asset_resolver = AssetResolver()
 
 DEFAULT_CONFIG = {
     "gravity": {"gravX": 0, "gravY": 0, "gravZ": -9.81},
@@ -28,13 +33,15 @@ def init(cfg=DEFAULT_CONFIG, mode=p.GUI):
     """
     # Initialize pybullet
     client = p.connect(mode)
+    # physics client ids are reused after a disconnect
+    px.client._forget_client(client)
 
     # Use config to set pybullet simulation parameters
-    p.setParameters(cfg, client)
+    _setParameters(cfg, client)
 
     # Load the classic plane
     p.setAdditionalSearchPath(pybullet_data.getDataPath())
-    p.loadURDF("plane.urdf", physicsClientId=client)
+    loadURDF("plane.urdf", physicsClientId=client)
 
     return client
 
@@ -126,17 +133,54 @@ def find_file(file_path):
         return file_path
 
     # if file_path is relative path, then we will go through pybulletX.path,
-    # see if file is in any directories.
+    # see if file is in any directories (using an index of the directories).
     # if file_path is absolute path, nothing we can do :(
     if not os.path.isabs(file_path):
-        for search_path in px.path:
-            path = os.path.join(search_path, file_path)
-            if os.path.isfile(path):
-                return path
+        path = asset_resolver.find(file_path, px.path)
+        if path is not None:
+            return path
 
     raise FileNotFoundError(f"No such file: '{file_path}'")
 
 
+# names of the positional arguments of pybullet.loadURDF
+_LOAD_URDF_ARGS = (
+    "basePosition",
+    "baseOrientation",
+    "useMaximalCoordinates",
+    "useFixedBase",
+    "flags",
+    "globalScaling",
+)
+
+
 def loadURDF(fileName, *args, **kwargs):
+    """
+    Same as pybullet.loadURDF, but looks up fileName in pybulletX.path and
+    records the arguments so that the body can be loaded again when a
+    checkpoint is restored (see px.checkpoint).
+    """
     fileName = find_file(fileName)
-    return p.loadURDF(fileName, *args, **kwargs)
+    body_id = p.loadURDF(fileName, *args, **kwargs)
+
+    kwargs = {**dict(zip(_LOAD_URDF_ARGS, args)), **kwargs}
+    physics_client_id = kwargs.pop("physicsClientId", 0)
+    px.client._loaded_urdfs[physics_client_id][body_id] = {
+        "fileName": fileName,
+        **_to_json(kwargs),
+    }
+    return body_id
+
+
+def _to_json(value):
+    """
+    Convert NumPy arrays and scalars (in nested lists and dicts) to plain
+    Python values.
+    """
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
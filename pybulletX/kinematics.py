@@ -0,0 +1,184 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+import pybullet as p
+
+from .joint_type import GetJointTypeName
+from ._wrapper import _getJointStates
+
+_SUPPORTED_JOINT_TYPES = (p.JOINT_REVOLUTE, p.JOINT_PRISMATIC, p.JOINT_FIXED)
+
+
+def _quat_multiply(a, b):
+    """
+    Hamilton product of two (batches of) quaternions in pybullet's (x, y, z, w)
+    convention.
+    """
+    ax, ay, az, aw = np.moveaxis(a, -1, 0)
+    bx, by, bz, bw = np.moveaxis(b, -1, 0)
+    return np.stack(
+        [
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+            aw * bw - ax * bx - ay * by - az * bz,
+        ],
+        axis=-1,
+    )
+
+
+def _quat_inverse(q):
+    return q * np.array([-1.0, -1.0, -1.0, 1.0])
+
+
+def _quat_rotate(q, v):
+    """
+    Rotate (batches of) vectors v by (batches of) unit quaternions q.
+    """
+    u, w = q[..., :3], q[..., 3:]
+    t = 2.0 * np.cross(u, v)
+    return v + w * t + np.cross(u, t)
+
+
+class KinematicTree:
+    """
+    A pure NumPy forward kinematics solver built from the (static) joint
+    information of a robot. Once constructed, it computes the world poses of all
+    the links for a whole batch of joint configurations without touching the
+    physics client.
+
+    Note that pybullet expresses the joint frames (parent_frame_pos/orn) w.r.t.
+    the center of mass (i.e. inertial frame) of the parent link, and the
+    orientation it returns is the rotation from the parent frame to the child
+    frame. The link frames in URDF are recovered using the local inertial frames
+    from the dynamics info.
+    """
+
+    def __init__(self, robot):
+        self.num_joints = robot.num_joints
+        self.free_joint_indices = list(robot.free_joint_indices)
+
+        joint_indices = range(self.num_joints)
+        joint_infos = robot.get_joint_infos(joint_indices)
+        dynamics_infos = robot.get_dynamics_infos(joint_indices)
+
+        self.joint_types = np.asarray(joint_infos.joint_type)
+        unsupported = set(self.joint_types.tolist()) - set(_SUPPORTED_JOINT_TYPES)
+        if unsupported:
+            raise ValueError(
+                f"KinematicTree doesn't support {GetJointTypeName(unsupported)}"
+            )
+
+        self.parent_indices = np.asarray(joint_infos.parent_index)
+        self.joint_axes = np.asarray(joint_infos.joint_axis, dtype=np.float64)
+        self.parent_frame_positions = np.asarray(
+            joint_infos.parent_frame_pos, dtype=np.float64
+        )
+        self.parent_frame_orientations = _quat_inverse(
+            np.asarray(joint_infos.parent_frame_orn, dtype=np.float64)
+        )
+        self.local_inertial_positions = np.asarray(
+            dynamics_infos.local_inertial_pos, dtype=np.float64
+        )
+        self.local_inertial_orientations = np.asarray(
+            dynamics_infos.local_inertial_orn, dtype=np.float64
+        )
+
+        # joints that are not free keep the positions they have right now (in
+        # float64, whatever the dtype of the robot states)
+        joint_states = _getJointStates(
+            robot.id, joint_indices, dtype=np.float64, **robot._client_kwargs
+        )
+        self.default_joint_positions = np.where(
+            self.joint_types == p.JOINT_FIXED, 0.0, joint_states.joint_position
+        )
+
+        base_position, base_orientation = robot.get_base_pose()
+        self.base_position = np.array(base_position, dtype=np.float64)
+        self.base_orientation = np.array(base_orientation, dtype=np.float64)
+
+        # Links in pybullet are sorted such that parent_index < joint_index.
+        # Group them by depth so that each level of the tree is computed at once.
+        depths = np.zeros(self.num_joints, dtype=np.int64)
+        for i, parent_index in enumerate(self.parent_indices):
+            depths[i] = 0 if parent_index == -1 else depths[parent_index] + 1
+        self._levels = [np.flatnonzero(depths == d) for d in np.unique(depths)]
+
+    def forward_kinematics(
+        self, joint_positions, base_position=None, base_orientation=None
+    ):
+        """
+        Compute the world poses of all links for a batch of joint positions of
+        shape (N, num_dofs), where the columns follow the robot's free joints.
+
+        Returns a dict with (N, num_joints, 3) positions and (N, num_joints, 4)
+        orientations of both the center of mass frames ("link_world_position",
+        "link_world_orientation") and the URDF link frames
+        ("world_link_frame_position", "world_link_frame_orientation"), i.e. the
+        same field names as LinkState. Like Body.get_base_pose, the base pose
+        is the pose of the center of mass of the base.
+        """
+        joint_positions = np.asarray(joint_positions, dtype=np.float64)
+        if joint_positions.ndim == 1:
+            joint_positions = joint_positions[None]
+        N = joint_positions.shape[0]
+
+        q = np.tile(self.default_joint_positions, (N, 1))
+        q[:, self.free_joint_indices] = joint_positions
+
+        if base_position is None:
+            base_position = self.base_position
+        if base_orientation is None:
+            base_orientation = self.base_orientation
+
+        # index 0 is the base, index i + 1 is link i
+        com_positions = np.empty((N, self.num_joints + 1, 3))
+        com_orientations = np.empty((N, self.num_joints + 1, 4))
+        link_positions = np.empty((N, self.num_joints, 3))
+        link_orientations = np.empty((N, self.num_joints, 4))
+        com_positions[:, 0] = base_position
+        com_orientations[:, 0] = base_orientation
+
+        for links in self._levels:
+            parents = self.parent_indices[links] + 1
+            parent_position = com_positions[:, parents]
+            parent_orientation = com_orientations[:, parents]
+
+            # joint frame (at zero joint position) in world frame
+            position = parent_position + _quat_rotate(
+                parent_orientation, self.parent_frame_positions[links]
+            )
+            orientation = _quat_multiply(
+                parent_orientation, self.parent_frame_orientations[links]
+            )
+
+            # joint motion, along/about the joint axis
+            axes = self.joint_axes[links]
+            joint_types = self.joint_types[links]
+            angles = np.where(joint_types == p.JOINT_REVOLUTE, q[:, links], 0.0)
+            offsets = np.where(joint_types == p.JOINT_PRISMATIC, q[:, links], 0.0)
+
+            half_angles = angles[..., None] / 2
+            rotation = np.concatenate(
+                [axes * np.sin(half_angles), np.cos(half_angles)], axis=-1
+            )
+            orientation = _quat_multiply(orientation, rotation)
+            position = position + _quat_rotate(orientation, axes * offsets[..., None])
+
+            # the joint frame is the center of mass frame of the child link, the
+            # URDF link frame is offset by the local inertial frame.
+            link_orientation = _quat_multiply(
+                orientation, _quat_inverse(self.local_inertial_orientations[links])
+            )
+            com_positions[:, links + 1] = position + _quat_rotate(
+                link_orientation, self.local_inertial_positions[links]
+            )
+            com_orientations[:, links + 1] = orientation
+            link_positions[:, links] = position
+            link_orientations[:, links] = link_orientation
+
+        return {
+            "link_world_position": com_positions[:, 1:],
+            "link_world_orientation": com_orientations[:, 1:],
+            "world_link_frame_position": link_positions,
+            "world_link_frame_orientation": link_orientations,
+        }
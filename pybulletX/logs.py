@@ -0,0 +1,167 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+"""
+Readers for the binary logs written by pybullet's native state loggers
+(p.startStateLogging / Client.startStateLogging).
+"""
+import os
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+from .dtype import get_default_dtype
+
+log = logging.getLogger(__name__)
+
+# Every record of a generic robot log starts with these 2 bytes
+_RECORD_MARKER = (0xAA, 0xBB)
+
+# struct format character => little-endian NumPy type
+_STRUCT_TO_NUMPY = {
+    "b": "i1",
+    "B": "u1",
+    "h": "<i2",
+    "H": "<u2",
+    "i": "<i4",
+    "I": "<u4",
+    "q": "<i8",
+    "Q": "<u8",
+    "f": "<f4",
+    "d": "<f8",
+}
+
+
+def _record_dtype(keys, fmt):
+    if len(keys) != len(fmt):
+        raise ValueError(f"Log header has {len(keys)} keys but format is '{fmt}'")
+    try:
+        fields = [(key, _STRUCT_TO_NUMPY[c]) for key, c in zip(keys, fmt)]
+    except KeyError as e:
+        raise ValueError(f"Unsupported type {e} in log format '{fmt}'")
+    return np.dtype([("_marker", "u1", 2)] + fields)
+
+
+def read_records(path):
+    """
+    Memory-map the records of a log made of a line of comma-separated keys, a
+    line with the struct format of the records and the records, each prefixed
+    with 0xAA 0xBB. Returns the records as a read-only structured array whose
+    fields are named after the keys. A truncated last record is ignored.
+    """
+    with open(path, "rb") as f:
+        keys = f.readline().decode("utf8").rstrip("\n").split(",")
+        fmt = f.readline().decode("utf8").rstrip("\n")
+        offset = f.tell()
+
+    dtype = _record_dtype(keys, fmt)
+    num_records = (os.path.getsize(path) - offset) // dtype.itemsize
+    if num_records == 0:
+        records = np.empty(0, dtype)
+        records.setflags(write=False)
+        return records
+
+    records = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=num_records)
+    if not np.all(records["_marker"] == _RECORD_MARKER):
+        raise ValueError(f"{path} is corrupted or its records aren't '{fmt}'")
+    return records
+
+
+@dataclass
+class BodyStateLog:
+    """
+    The logged states of one body, with the field names of pybulletX. Every
+    array has the number of logged steps T as first dimension, the joint
+    arrays are over the movable (revolute and prismatic) joints of the body in
+    index order, i.e. the free joints of a px.Robot by default.
+    """
+
+    body_id: int
+    step_count: np.ndarray  # (T,)
+    timestamp: np.ndarray  # (T,)
+    base_position: np.ndarray  # (T, 3)
+    base_orientation: np.ndarray  # (T, 4)
+    base_linear_velocity: np.ndarray  # (T, 3)
+    base_angular_velocity: np.ndarray  # (T, 3)
+    joint_position: np.ndarray  # (T, num_dofs)
+    joint_velocity: np.ndarray  # (T, num_dofs)
+
+    def __len__(self):
+        return len(self.step_count)
+
+
+class GenericRobotLog:
+    """
+    A log written with p.STATE_LOGGING_GENERIC_ROBOT, with one record per
+    logged body and step.
+
+    Example::
+        >>> log_id = client.startStateLogging(
+        >>>     p.STATE_LOGGING_GENERIC_ROBOT, "robot.log", objectUniqueIds=[robot.id]
+        >>> )
+        >>> ...
+        >>> client.stopStateLogging(log_id)
+        >>> states = px.logs.GenericRobotLog("robot.log")[robot]
+        >>> states.joint_position  # (T, num_dofs)
+    """
+
+    def __init__(self, path, dtype=None):
+        self.path = path
+        # floating point type of the BodyStateLog arrays
+        self.dtype = get_default_dtype() if dtype is None else np.dtype(dtype)
+        self.records = read_records(path)
+
+        num_fields = len(self.records.dtype.names)
+        self.max_log_dof = sum(
+            name.startswith("q") and name[1:].isdigit()
+            for name in self.records.dtype.names
+        )
+        assert num_fields == 1 + 17 + 2 * self.max_log_dof, "Not a generic robot log"
+
+        self.body_ids = np.unique(self.records["objectId"]).tolist()
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, body):
+        return _body_id(body) in self.body_ids
+
+    def __getitem__(self, body):
+        body_id = _body_id(body)
+        if body_id not in self.body_ids:
+            raise KeyError(f"Body {body_id} is not in {self.path}")
+
+        records = self.records[self.records["objectId"] == body_id]
+        # bodies with more degrees of freedom than logged are truncated
+        num_dofs = min(int(records["qNum"][0]), self.max_log_dof) if len(records) else 0
+
+        def _stack(*names):
+            return structured_to_unstructured(records[list(names)], dtype=self.dtype)
+
+        def _joints(prefix):
+            names = [f"{prefix}{i}" for i in range(num_dofs)]
+            if not names:
+                return np.empty((len(records), 0), self.dtype)
+            return _stack(*names)
+
+        return BodyStateLog(
+            body_id=body_id,
+            step_count=np.asarray(records["stepCount"], dtype=np.int64),
+            timestamp=np.asarray(records["timeStamp"], dtype=self.dtype),
+            base_position=_stack("posX", "posY", "posZ"),
+            base_orientation=_stack("oriX", "oriY", "oriZ", "oriW"),
+            base_linear_velocity=_stack("velX", "velY", "velZ"),
+            base_angular_velocity=_stack("omegaX", "omegaY", "omegaZ"),
+            joint_position=_joints("q"),
+            joint_velocity=_joints("u"),
+        )
+
+    def bodies(self):
+        """
+        Get the BodyStateLog of every logged body as a dict keyed by body id.
+        """
+        return {body_id: self[body_id] for body_id in self.body_ids}
+
+
+def _body_id(body):
+    return body if isinstance(body, (int, np.integer)) else body.id
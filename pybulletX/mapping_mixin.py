@@ -9,6 +9,11 @@ class MappingMixin(collections.abc.Mapping):
         inst._data = args
         return inst
 
+    def __reduce__(self):
+        # __new__ would call __init__ without the fields, and _data isn't
+        # always the arguments of __init__ (ex: JointState of arrays)
+        return (_rebuild, (self.__class__, self.__dict__))
+
     def __setitem__(self, key, value):
         self.__dict__[key] = value
 
@@ -44,3 +49,9 @@ class MappingMixin(collections.abc.Mapping):
     def __len__(self):
         # return len(self.__dict__)
         return len(self._data)
+
+
+def _rebuild(cls, state):
+    inst = object.__new__(cls)
+    inst.__dict__.update(state)
+    return inst
@@ -0,0 +1,216 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import logging
+
+import numpy as np
+import pybullet as p
+
+import pybulletX as px
+
+log = logging.getLogger(__name__)
+
+# name of the parameter => keyword argument of pybullet.changeDynamics
+_CHANGE_DYNAMICS_KWARGS = {
+    "mass": "mass",
+    "lateral_friction": "lateralFriction",
+    "restitution": "restitution",
+    "rolling_friction": "rollingFriction",
+    "spinning_friction": "spinningFriction",
+    "linear_damping": "linearDamping",
+    "angular_damping": "angularDamping",
+    "joint_damping": "jointDamping",
+}
+
+# pybullet doesn't provide a getter for these, use the defaults of Bullet.
+_DEFAULT_LINEAR_DAMPING = 0.04
+_DEFAULT_ANGULAR_DAMPING = 0.04
+
+PARAMETERS = tuple(_CHANGE_DYNAMICS_KWARGS.keys()) + ("joint_friction",)
+
+
+class DynamicsRandomizer:
+    """
+    Randomize the dynamics parameters of all the links of a set of bodies.
+
+    The nominal parameters of all the links (including the base, i.e. link -1)
+    are read once and stored as flat arrays, one entry per link. Perturbations
+    for all the links are sampled at once, and only the parameters that
+    actually changed are sent to pybullet.
+
+    Each keyword argument is the name of a parameter (see PARAMETERS) and is
+    either a (low, high) range of scale factors applied to the nominal values,
+    or a callable `f(rng, nominal) -> values` that returns the new values.
+    Joint parameters (joint_damping, joint_friction) are NaN for the bases and
+    are never applied to them. Joint friction is applied the pybullet way, i.e.
+    as a velocity motor with zero target velocity and the friction as maximum
+    force, and therefore only makes sense for joints under torque control. The
+    friction motors of a px.Robot replace its motors: when its joint friction
+    changes, its control mode (torque control or locked motors, see
+    Robot.torque_control) is applied again before the friction motors of the
+    joints whose friction isn't nominal, e.g. restore() gives the robot its
+    motors back. The targets of the last actions are lost, set them again.
+
+    Dynamics changes go through Client.changeDynamics, which invalidates the
+    per-step caches of the robots (ex: Robot.mass_matrix).
+
+    Example::
+        >>> randomizer = DynamicsRandomizer(
+                [robot, cube], mass=(0.8, 1.2), lateral_friction=(0.5, 1.5)
+            )
+        >>> randomizer.randomize()  # at each episode reset
+        >>> randomizer.restore()
+    """
+
+    def __init__(self, bodies, seed=None, **ranges):
+        unknown = set(ranges.keys()) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown dynamics parameters: {unknown}")
+
+        self.bodies = list(bodies)
+        self.ranges = ranges
+        self.rng = np.random.default_rng(seed)
+
+        body_indices, link_indices, nominal = [], [], []
+        for i, body in enumerate(self.bodies):
+            indices = np.arange(-1, body.num_joints)
+            body_indices.append(np.full(len(indices), i))
+            link_indices.append(indices)
+            nominal.append(self._read_nominal(body, indices))
+
+        # flat arrays with one entry per link of every body
+        self.body_indices = np.concatenate(body_indices)
+        self.link_indices = np.concatenate(link_indices)
+        self.nominal = {k: np.concatenate([n[k] for n in nominal]) for k in PARAMETERS}
+        self.current = {k: v.copy() for k, v in self.nominal.items()}
+
+    @staticmethod
+    def _read_nominal(body, link_indices):
+        dynamics_infos = body.get_dynamics_infos(link_indices)
+        nominal = {
+            "mass": dynamics_infos.mass,
+            "lateral_friction": dynamics_infos.lateral_friction,
+            "restitution": dynamics_infos.restitution,
+            "rolling_friction": dynamics_infos.rolling_friction,
+            "spinning_friction": dynamics_infos.spinning_friction,
+            "linear_damping": np.full(len(link_indices), _DEFAULT_LINEAR_DAMPING),
+            "angular_damping": np.full(len(link_indices), _DEFAULT_ANGULAR_DAMPING),
+            "joint_damping": np.full(len(link_indices), np.nan),
+            "joint_friction": np.full(len(link_indices), np.nan),
+        }
+
+        # the base (link -1) has no joint
+        if body.num_joints > 0:
+            joint_infos = body.get_joint_infos(link_indices[1:])
+            nominal["joint_damping"][1:] = joint_infos.joint_dampling
+            nominal["joint_friction"][1:] = joint_infos.joint_friction
+
+        return {k: np.asarray(v, dtype=np.float64) for k, v in nominal.items()}
+
+    @property
+    def num_links(self):
+        return len(self.link_indices)
+
+    def sample(self):
+        """
+        Sample new values of the randomized parameters for all the links.
+        """
+        values = {}
+        for name, spec in self.ranges.items():
+            nominal = self.nominal[name]
+            if callable(spec):
+                values[name] = np.asarray(spec(self.rng, nominal), dtype=np.float64)
+            else:
+                low, high = spec
+                values[name] = nominal * self.rng.uniform(low, high, self.num_links)
+        return values
+
+    def apply(self, values):
+        """
+        Apply the parameters in `values` (a dict of flat arrays, one entry per
+        link). Only the parameters that differ from the ones currently applied
+        are sent to pybullet. Returns the number of pybullet calls it took.
+        """
+        changed = {}
+        for name, value in values.items():
+            mask = (value != self.current[name]) & ~np.isnan(value)
+            if np.any(mask):
+                changed[name] = mask
+
+        num_calls = 0
+
+        dynamics_params = [k for k in changed if k in _CHANGE_DYNAMICS_KWARGS]
+        if dynamics_params:
+            any_changed = np.logical_or.reduce([changed[k] for k in dynamics_params])
+            for i in np.flatnonzero(any_changed):
+                kwargs = {
+                    _CHANGE_DYNAMICS_KWARGS[k]: values[k][i]
+                    for k in dynamics_params
+                    if changed[k][i]
+                }
+                body = self.bodies[self.body_indices[i]]
+                body.physics_client.changeDynamics(
+                    body.id, int(self.link_indices[i]), **kwargs
+                )
+                num_calls += 1
+
+        for name, mask in changed.items():
+            self.current[name][mask] = values[name][mask]
+
+        if "joint_friction" in changed:
+            num_calls += self._apply_joint_friction(changed["joint_friction"])
+
+        log.debug(f"Applied dynamics parameters with {num_calls} pybullet calls")
+        return num_calls
+
+    def _apply_joint_friction(self, changed):
+        num_calls = 0
+        friction = self.current["joint_friction"]
+        nominal = self.nominal["joint_friction"]
+        for b in np.unique(self.body_indices[changed]):
+            body = self.bodies[b]
+            rows = changed & (self.body_indices == b)
+            if isinstance(body, px.Robot):
+                # put the motors of the robot back, then the friction motors of
+                # all its joints whose friction isn't nominal
+                if body.torque_control:
+                    body._enable_torque_control()
+                else:
+                    body._disable_torque_control()
+                num_calls += 1
+                rows = (self.body_indices == b) & (friction != nominal)
+                rows &= ~np.isnan(friction)
+
+            rows = np.flatnonzero(rows)
+            if len(rows) == 0:
+                continue
+            p.setJointMotorControlArray(
+                body.id,
+                self.link_indices[rows].tolist(),
+                p.VELOCITY_CONTROL,
+                targetVelocities=np.zeros(len(rows)),
+                forces=friction[rows],
+                **body._client_kwargs,
+            )
+            num_calls += 1
+        return num_calls
+
+    def randomize(self):
+        """
+        Sample and apply new parameters, and return the sampled values.
+        """
+        values = self.sample()
+        self.apply(values)
+        return values
+
+    def restore(self):
+        """
+        Restore the nominal values of all the randomized parameters.
+        """
+        return self.apply({name: self.nominal[name] for name in self.ranges})
+
+    def get_values(self, body):
+        """
+        Get the currently applied parameters of a body as a dict of arrays
+        indexed by link_index + 1 (i.e. the base comes first).
+        """
+        rows = self.body_indices == self.bodies.index(body)
+        return {name: value[rows] for name, value in self.current.items()}
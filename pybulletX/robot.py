@@ -9,15 +9,39 @@ import numpy as np
 import pybulletX as px  # noqa: F401
 import pybullet as p
 from .robot_interface_mixin import RobotInterfaceMixin
+from .robot_model import RobotModel
+from .utils.cache import cached_method, _to_hashable
 
 log = logging.getLogger(__name__)
 
 
-# convert any list in input arguments to tuple before calling the function
-def list_args_to_tuple(f):
-    def wrapper(*args, **kwargs):
-        args = [tuple(x) if type(x) == list else x for x in args]
-        return f(*args, **kwargs)
+def memoize_per_step(f):
+    """
+    Memoize the results of a method until the state version of the physics
+    client changes (stepping, resetting or changing the dynamics or the gravity
+    through pybulletX, see Client.state_version) or the state of the robot is
+    reset. Cached arrays are shared by all the callers and are therefore
+    read-only.
+    """
+
+    @functools.wraps(f)
+    def wrapper(self, *args, **kwargs):
+        stamp = (self.physics_client.state_version, self._state_version)
+        if self._per_step_cache_stamp != stamp:
+            self._per_step_cache = {}
+            self._per_step_cache_stamp = stamp
+
+        key = (
+            f.__name__,
+            tuple(map(_to_hashable, args)),
+            tuple((k, _to_hashable(v)) for k, v in sorted(kwargs.items())),
+        )
+        if key not in self._per_step_cache:
+            result = f(self, *args, **kwargs)
+            for array in result if isinstance(result, tuple) else (result,):
+                array.setflags(write=False)
+            self._per_step_cache[key] = result
+        return self._per_step_cache[key]
 
     return wrapper
 
@@ -27,15 +51,46 @@ class Robot(px.Body, RobotInterfaceMixin):
     MAX_FORCE = 1e4
 
     def __init__(self, *args, **kwargs):
+        self._per_step_cache = {}
+        self._per_step_cache_stamp = None
+        # joints whose force/torque sensor is currently enabled
+        self._force_torque_sensor_joints = set()
+
         super().__init__(*args, **kwargs)
 
+        # static information shared with the other robots of the same URDF
+        self.model = RobotModel.get(self)
+
         self._torque_control = False
 
-        self.free_joint_indices = self._get_free_joint_indices()
+        self.free_joint_indices = list(self._get_free_joint_indices())
 
         self.zero_pose = self._get_zero_joint_position()
 
-        self.set_joint_force_torque_sensor(True)
+    def _get_checkpoint_state(self):
+        return {
+            **super()._get_checkpoint_state(),
+            "torque_control": self._torque_control,
+            "free_joint_indices": list(self.free_joint_indices),
+            "zero_pose": np.asarray(self.zero_pose, dtype=np.float64).tolist(),
+            "use_state_space": dict(self._use_state_space),
+        }
+
+    def _set_checkpoint_state(self, state, body_id, physics_client):
+        # The joint motors aren't part of pybullet's checkpoints: only the
+        # torque control mode is set again, not the targets of the last actions.
+        self._per_step_cache = {}
+        self._per_step_cache_stamp = None
+        self._force_torque_sensor_joints = set()
+
+        super()._set_checkpoint_state(state, body_id, physics_client)
+
+        self.model = RobotModel.get(self)
+        self._use_state_space.update(state["use_state_space"])
+        self._torque_control = False
+        self.free_joint_indices = list(state["free_joint_indices"])
+        self.zero_pose = np.array(state["zero_pose"])
+        self.torque_control = state["torque_control"]
 
     def _set_velocity_control(self, max_forces):
         p.setJointMotorControlArray(
@@ -89,16 +144,58 @@ class Robot(px.Body, RobotInterfaceMixin):
     @free_joint_indices.setter
     def free_joint_indices(self, new_free_joint_indices):
         self._free_joint_indices = new_free_joint_indices
+        self._state_version += 1
+        self._update_force_torque_sensors()
+
+    def configure_state_space(self, *args, **kwargs):
+        super().configure_state_space(*args, **kwargs)
+        self._update_force_torque_sensors()
+
+    def _update_force_torque_sensors(self):
+        """
+        Keep the force/torque sensors of the free joints enabled only if the
+        joint reaction forces are part of the state space, since pybullet
+        computes them at every step for every enabled sensor.
+        """
+        if self._use_state_space["joint_reaction_forces"]:
+            wanted = set(self.free_joint_indices)
+        else:
+            wanted = set()
+
+        for joint_index in wanted - self._force_torque_sensor_joints:
+            self._enable_force_torque_sensor(joint_index, True)
+        for joint_index in self._force_torque_sensor_joints - wanted:
+            self._enable_force_torque_sensor(joint_index, False)
+
+    def _enable_force_torque_sensor(self, joint_index, on_off):
+        p.enableJointForceTorqueSensor(
+            self.id, joint_index, on_off, **self._client_kwargs
+        )
+        if on_off:
+            self._force_torque_sensor_joints.add(joint_index)
+        else:
+            self._force_torque_sensor_joints.discard(joint_index)
 
-    @functools.lru_cache(maxsize=None)
     def _get_free_joint_indices(self):
         """
         Exclude all fixed joints and return a list of free joint indices
         """
-        joint_infos = [self.get_joint_info(i) for i in range(self.num_joints)]
-        return [
-            info.joint_index for info in joint_infos if info.joint_type != p.JOINT_FIXED
-        ]
+        return self.model.movable_joint_indices
+
+    @property
+    def num_joints(self):
+        return self.model.num_joints
+
+    @property
+    def _joint_name_to_index(self):
+        return self.model.joint_name_to_index
+
+    @property
+    def full_state_space(self):
+        return self.model.shared(
+            ("full_state_space", tuple(self.free_joint_indices), self.dtype),
+            self._build_full_state_space,
+        )
 
     @property
     def zero_pose(self):
@@ -114,7 +211,8 @@ class Robot(px.Body, RobotInterfaceMixin):
 
         joint_infos = self.get_joint_infos()
         return np.zeros(self.num_dofs).clip(
-            min=joint_infos.joint_lower_limit, max=joint_infos.joint_upper_limit,
+            min=joint_infos.joint_lower_limit,
+            max=joint_infos.joint_upper_limit,
         )
 
     def joints_within_limits(self):
@@ -130,19 +228,25 @@ class Robot(px.Body, RobotInterfaceMixin):
         joints = {j.joint_name.decode(): j for j in joints}
         return joints[joint_name]
 
-    @list_args_to_tuple
-    @functools.lru_cache(maxsize=None)
+    @cached_method
     def joint_effort_limits(self, joint_indices):
         return self.get_joint_infos(joint_indices).joint_max_force
 
+    def get_joint_info(self, joint_index):
+        """
+        Get joint information and return as JointInfo, which is a structure.
+        """
+        return self.model.get_joint_info(joint_index)
+
     def get_joint_infos(self, joint_indices=None):
         """
         Get the joint informations of all controllable joints (`self.free_joint_indices`)
-        and return JointInfo, which is a structure of arrays (SoA).
+        and return JointInfo, which is a structure of arrays (SoA). The arrays
+        are shared by all the robots of the same model and are read-only.
         """
         if joint_indices is None:
             joint_indices = self.free_joint_indices
-        return super().get_joint_infos(joint_indices)
+        return self.model.get_joint_infos(joint_indices)
 
     def get_joint_states(self, joint_indices=None):
         """
@@ -172,16 +276,15 @@ class Robot(px.Body, RobotInterfaceMixin):
         Enable/Disable joint force torque sensor
         """
         for joint_index in self.free_joint_indices:
-            p.enableJointForceTorqueSensor(
-                self.id, joint_index, on_off, **self._client_kwargs
-            )
+            self._enable_force_torque_sensor(joint_index, on_off)
 
     def attach(
         self, new_robot, link_name, position=(0, 0, 0), orientation=(0, 0, 0, 1)
     ):
         """
         Attach a new robot (`new_robot`) to self by creating a fixed joint between
-        a specific link (`link_name`) and the base of the new robot.
+        a specific link (`link_name`) and the base of the new robot. Returns the
+        id of the constraint.
         """
         assert isinstance(new_robot, Robot)
         link_idx = self.get_joint_index_by_name(link_name)
@@ -191,7 +294,7 @@ class Robot(px.Body, RobotInterfaceMixin):
 
         new_robot.set_base_pose(link_pos)
 
-        p.createConstraint(
+        return self.physics_client.createConstraint(
             parentBodyUniqueId=self.id,
             parentLinkIndex=link_idx,
             childBodyUniqueId=new_robot.id,
@@ -202,7 +305,6 @@ class Robot(px.Body, RobotInterfaceMixin):
             childFramePosition=[0, 0, 0],
             parentFrameOrientation=orientation,
             childFrameOrientation=[0, 0, 0, 1],
-            **self._client_kwargs,
         )
 
     def reset(self):
@@ -210,6 +312,7 @@ class Robot(px.Body, RobotInterfaceMixin):
 
         for joint_index, joint_angle in zip(self.free_joint_indices, self.zero_pose):
             p.resetJointState(self.id, joint_index, joint_angle, **self._client_kwargs)
+        self._state_changed()
 
         if not self.joints_within_limits():
             log.warning("joint set to positions outside the limits")
@@ -223,6 +326,86 @@ class Robot(px.Body, RobotInterfaceMixin):
 
     def reset_joint_state(self, *args, **kwargs):
         p.resetJointState(self.id, *args, **kwargs, **self._client_kwargs)
+        self._state_changed()
+
+    @memoize_per_step
+    def _get_movable_joint_positions(self):
+        """
+        Get the positions of all non-fixed joints, which is what pybullet
+        expects as objPositions in calculateJacobian, calculateMassMatrix, and
+        calculateInverseDynamics, in float64 whatever the dtype of the robot.
+        """
+        movable_joint_indices = self._get_free_joint_indices()
+        joint_states = px.getJointStates(
+            self.id, movable_joint_indices, dtype=np.float64, **self._client_kwargs
+        )
+        return joint_states.joint_position
+
+    def _free_joint_columns(self, num_columns):
+        """
+        Column (or row) indices of the free joints in matrices returned by
+        pybullet, which span all non-fixed joints (plus the base DoFs for a
+        floating base, if any).
+        """
+        movable_joint_indices = self._get_free_joint_indices()
+        offset = num_columns - len(movable_joint_indices)
+        return [
+            offset + movable_joint_indices.index(joint_index)
+            for joint_index in self.free_joint_indices
+        ]
+
+    @memoize_per_step
+    def jacobian(self, link, local_position=(0, 0, 0)):
+        """
+        Get the Jacobian of a point (`local_position`, in the link frame) on a
+        link w.r.t. the free joints as a (6, num_dofs) np.ndarray. The first 3
+        rows are the linear part and the last 3 rows are the angular part.
+        """
+        if isinstance(link, str):
+            link = self.get_joint_index_by_name(link)
+
+        joint_positions = self._get_movable_joint_positions().tolist()
+        zeros = [0.0] * len(joint_positions)
+        linear, angular = p.calculateJacobian(
+            self.id,
+            link,
+            list(local_position),
+            joint_positions,
+            zeros,
+            zeros,
+            **self._client_kwargs,
+        )
+        jacobian = np.vstack([linear, angular])
+        return jacobian[:, self._free_joint_columns(jacobian.shape[1])]
+
+    @memoize_per_step
+    def mass_matrix(self):
+        """
+        Get the joint-space mass matrix of the free joints as a
+        (num_dofs, num_dofs) np.ndarray.
+        """
+        joint_positions = self._get_movable_joint_positions().tolist()
+        mass_matrix = np.array(
+            p.calculateMassMatrix(self.id, joint_positions, **self._client_kwargs)
+        )
+        columns = self._free_joint_columns(mass_matrix.shape[1])
+        return mass_matrix[np.ix_(columns, columns)]
+
+    @memoize_per_step
+    def gravity_torques(self):
+        """
+        Get the joint torques (of the free joints) needed to compensate gravity
+        at the current joint positions, i.e. inverse dynamics with zero joint
+        velocities and accelerations.
+        """
+        joint_positions = self._get_movable_joint_positions().tolist()
+        zeros = [0.0] * len(joint_positions)
+        torques = np.array(
+            p.calculateInverseDynamics(
+                self.id, joint_positions, zeros, zeros, **self._client_kwargs
+            )
+        )
+        return torques[self._free_joint_columns(len(torques))]
 
     def set_joint_position(
         self, joint_position, max_forces=None, use_joint_effort_limits=True
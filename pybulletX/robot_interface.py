@@ -3,18 +3,32 @@ import io
 from abc import ABCMeta
 import collections
 
-from attrdict import AttrMap
-
 from .helper import dump
-from .utils.space_dict import SpaceDict
+from .utils.fixed_dict import FixedDict, _type_checker
+
+
+def SpaceDict(*args, **kwargs):
+    # gym is imported lazily, only when a space is actually built
+    from .utils.space_dict import SpaceDict
+
+    return SpaceDict(*args, **kwargs)
+
+
+def _refill_states(robot, states):
+    """
+    Copy `states` into the FixedDict returned by the previous call (if it has
+    the same keys), so that get_states doesn't build a new container per call.
+    """
+    container = robot.__dict__.get("_px_states")
+    if container is None or container._keys != tuple(states):
+        container = robot.__dict__["_px_states"] = FixedDict(states)
+    else:
+        container.update(states)
+    return container
 
 
 def _remove_empty_dict_leaf(dict_):
-    return {
-        k: v
-        for k, v in dict_.items()
-        if not isinstance(v, collections.abc.Mapping) or len(v) > 0
-    }
+    return {k: v for k, v in dict_.items() if not _is_mapping(v) or len(v) > 0}
 
 
 class IRobot(metaclass=ABCMeta):
@@ -61,10 +75,11 @@ class IRobot(metaclass=ABCMeta):
         )
 
     def get_children_states(self):
-        return AttrMap(
+        return _refill_states(
+            self,
             _remove_empty_dict_leaf(
                 {k: v.get_states() for k, v in self.children().items()}
-            )
+            ),
         )
 
     def set_children_actions(self, actions):
@@ -80,7 +95,7 @@ class IRobot(metaclass=ABCMeta):
 
     def children(self):
         """Get all the children that's also instance of IRobot"""
-        return {k: v for k, v in self.__dict__.items() if isinstance(v, IRobot)}
+        return {k: v for k, v in self.__dict__.items() if _is_robot(v)}
 
     def __repr__(self):
         output = io.StringIO()
@@ -91,6 +106,10 @@ class IRobot(metaclass=ABCMeta):
         return output.getvalue()
 
 
+_is_robot = _type_checker(lambda cls: issubclass(cls, IRobot))
+_is_mapping = _type_checker(lambda cls: issubclass(cls, collections.abc.Mapping))
+
+
 def _check_dict_key_collision(d1, d2):
     return set(d1.keys()).intersection(d2.keys())
 
@@ -116,11 +135,10 @@ def router(func):
         attrs = {**childrens_attrs, **self_attrs}
         attrs = _remove_empty_dict_leaf(attrs)
 
-        # TODO(poweic): It's confusing to have both SpaceDict & AttrMap at the same
-        # time. Also, return AttrMap in new() method of SpaceDict is weird.
-        # Consider creating that's both SpaceDict and AttrMap at the same time.
+        # The states are returned in a FixedDict that is reused by the next call,
+        # copy() it to keep it around.
         if func.__name__ == "get_states":
-            attrs = AttrMap(attrs)
+            attrs = _refill_states(self, attrs)
         else:
             attrs = SpaceDict(attrs)
 
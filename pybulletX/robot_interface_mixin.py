@@ -1,33 +1,42 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
 import numpy as np
-from gym.spaces import Box
-from attrdict import AttrMap
-import functools
 
+from ._wrapper import _orig_pybullet
 from .robot_interface import IRobot, router, SpaceDict
+from .utils.cache import cached_property
+
+# fields of the state space, in the order of the tuples of p.getJointStates
+_JOINT_STATE_FIELDS = (
+    "joint_position",
+    "joint_velocity",
+    "joint_reaction_forces",
+    "applied_joint_motor_torque",
+)
 
 
 class RobotInterfaceMixin(IRobot):
+    def _box(self, low, high, shape):
+        from gym.spaces import Box
+
+        # cast the bounds first, gym warns when it lowers their precision
+        low = np.broadcast_to(low, shape).astype(self.dtype)
+        high = np.broadcast_to(high, shape).astype(self.dtype)
+        return Box(low=low, high=high, shape=shape, dtype=self.dtype)
+
     @property
     @router
     def action_space(self):
         info = self.get_joint_infos()
         if self.torque_control:
             return SpaceDict(
-                joint_torque=Box(
-                    low=-info.joint_max_force,
-                    high=info.joint_max_force,
-                    shape=[self.num_dofs],
-                    dtype=np.float64,
+                joint_torque=self._box(
+                    -info.joint_max_force, info.joint_max_force, [self.num_dofs]
                 ),
             )
         else:
             return SpaceDict(
-                joint_position=Box(
-                    low=info.joint_lower_limit,
-                    high=info.joint_upper_limit,
-                    shape=[self.num_dofs],
-                    dtype=np.float64,
+                joint_position=self._box(
+                    info.joint_lower_limit, info.joint_upper_limit, [self.num_dofs]
                 ),
             )
 
@@ -60,29 +69,21 @@ class RobotInterfaceMixin(IRobot):
                 "applied_joint_motor_torque"
             ] = applied_joint_motor_torque
 
-    @property
-    @functools.lru_cache(maxsize=None)
+    @cached_property
     def full_state_space(self):
+        return self._build_full_state_space()
+
+    def _build_full_state_space(self):
         info = self.get_joint_infos()
         return SpaceDict(
-            joint_position=Box(
-                low=info.joint_lower_limit,
-                high=info.joint_upper_limit,
-                shape=[self.num_dofs],
-                dtype=np.float64,
-            ),
-            joint_velocity=Box(
-                low=-info.joint_max_velocity,
-                high=info.joint_max_velocity,
-                shape=[self.num_dofs],
-                dtype=np.float64,
+            joint_position=self._box(
+                info.joint_lower_limit, info.joint_upper_limit, [self.num_dofs]
             ),
-            joint_reaction_forces=Box(
-                low=-np.inf, high=np.inf, shape=[self.num_dofs, 6], dtype=np.float64
-            ),
-            applied_joint_motor_torque=Box(
-                low=-np.inf, high=np.inf, shape=[self.num_dofs], dtype=np.float64
+            joint_velocity=self._box(
+                -info.joint_max_velocity, info.joint_max_velocity, [self.num_dofs]
             ),
+            joint_reaction_forces=self._box(-np.inf, np.inf, [self.num_dofs, 6]),
+            applied_joint_motor_torque=self._box(-np.inf, np.inf, [self.num_dofs]),
         )
 
     @property
@@ -102,5 +103,12 @@ class RobotInterfaceMixin(IRobot):
 
     @router
     def get_states(self):
-        states = self.get_joint_states()
-        return AttrMap({k: v for k, v in states.items() if self._use_state_space[k]})
+        # only the configured fields are converted to arrays
+        joint_states = _orig_pybullet.getJointStates(
+            self.id, self.free_joint_indices, **self._client_kwargs
+        )
+        return {
+            k: np.array([joint_state[i] for joint_state in joint_states], self.dtype)
+            for i, k in enumerate(_JOINT_STATE_FIELDS)
+            if self._use_state_space[k]
+        }
@@ -0,0 +1,85 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import logging
+import weakref
+
+import numpy as np
+import pybullet as p
+
+from ._wrapper import _raw_methods, _joint_infos_from_tuples
+from .joint_info import JointInfo
+from .utils.cache import cached_method
+
+log = logging.getLogger(__name__)
+
+# (urdf_path, flags, global_scaling) => RobotModel, a model lives as long as
+# one of the robots using it.
+_models = weakref.WeakValueDictionary()
+
+
+class RobotModel:
+    """
+    The static information of a robot (joint tables, limits, name indices and
+    gym spaces) shared by all the Robot instances loaded from the same URDF
+    with the same flags and scaling. It is read from pybullet once, when the
+    first of these robots is loaded, and never changes afterwards. Everything
+    it returns is shared and therefore read-only.
+    """
+
+    def __init__(self, body):
+        kwargs = body._client_kwargs
+        self.num_joints = p.getNumJoints(body.id, **kwargs)
+        self.joint_info_tuples = tuple(
+            _raw_methods["getJointInfos"](body.id, range(self.num_joints), **kwargs)
+        )
+
+        self.joint_name_to_index = {
+            info[1].decode(): info[0] for info in self.joint_info_tuples
+        }
+        # indices of all the joints that are not fixed
+        self.movable_joint_indices = tuple(
+            info[0] for info in self.joint_info_tuples if info[2] != p.JOINT_FIXED
+        )
+
+        self._shared = {}
+
+    @staticmethod
+    def key(body):
+        return (body.urdf_path, body.flags, body.global_scaling)
+
+    @classmethod
+    def get(cls, body):
+        """
+        Get the model of `body`, reading it from pybullet if no other body
+        with the same key is alive.
+        """
+        key = cls.key(body)
+        model = _models.get(key)
+        if model is None:
+            log.debug(f"Creating RobotModel for {key}")
+            model = _models[key] = cls(body)
+        return model
+
+    def get_joint_info(self, joint_index):
+        return JointInfo(*self.joint_info_tuples[joint_index])
+
+    @cached_method
+    def get_joint_infos(self, joint_indices):
+        joint_infos = _joint_infos_from_tuples(
+            [self.joint_info_tuples[i] for i in joint_indices]
+        )
+        if joint_infos is not None:
+            for value in joint_infos.__dict__.values():
+                if isinstance(value, np.ndarray):
+                    value.setflags(write=False)
+        return joint_infos
+
+    def shared(self, key, compute):
+        """
+        Get a value shared by all the robots of this model (ex: gym spaces),
+        calling compute() to create it the first time.
+        """
+        try:
+            return self._shared[key]
+        except KeyError:
+            value = self._shared[key] = compute()
+            return value
@@ -0,0 +1,143 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import logging
+import collections
+from dataclasses import dataclass
+
+import numpy as np
+
+import pybulletX as px
+from .utils.fixed_dict import FixedDict
+
+log = logging.getLogger(__name__)
+
+
+def _leaves(space, prefix=()):
+    """
+    Yield the (keys, space) of the leaves of a nested SpaceDict.
+    """
+    for key, value in space.items():
+        if isinstance(value, collections.abc.Mapping):
+            yield from _leaves(value, prefix + (key,))
+        else:
+            yield prefix + (key,), value
+
+
+def _nest(leaves):
+    """
+    Build a nested FixedDict from (keys, value) pairs.
+    """
+    root = {}
+    for keys, value in leaves:
+        node = root
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    return FixedDict(root)
+
+
+class _Buffers:
+    """
+    (length, *shape) arrays for every leaf of a space, written one row at a
+    time from nested states/actions.
+    """
+
+    def __init__(self, space, length):
+        self.leaves = [
+            (keys, np.zeros((length,) + tuple(leaf.shape), dtype=leaf.dtype))
+            for keys, leaf in _leaves(space)
+        ]
+
+    def write(self, values, t):
+        for keys, buffer in self.leaves:
+            value = values
+            for key in keys:
+                value = value[key]
+            buffer[t] = value
+
+    def views(self, length):
+        return _nest((keys, buffer[:length]) for keys, buffer in self.leaves)
+
+
+@dataclass
+class Rollout:
+    """
+    The states (num_steps + 1, ...) and actions (num_steps, ...) of an episode,
+    as nested FixedDict of arrays with the structure of the state and action
+    spaces. states[t] are the states the actions[t] were computed from, and
+    states[num_steps] are the states after the last step.
+    """
+
+    states: FixedDict
+    actions: FixedDict
+    num_steps: int
+
+    def __len__(self):
+        return self.num_steps
+
+
+class RolloutCollector:
+    """
+    Run episodes of a robot (any IRobot) and record its states and actions in
+    buffers preallocated from its state_space and action_space.
+
+    Every step calls robot.get_states(), policy(states), robot.set_actions()
+    and px.stepSimulation(), and copies the states and actions into row t of
+    the buffers. No per-step containers are allocated. collect() returns
+    views of the buffers, which are overwritten by the next collect(): copy
+    them to keep them around.
+
+    Example::
+        >>> collector = px.RolloutCollector(robot, max_steps=1000)
+        >>> rollout = collector.collect(policy, done=lambda states: ...)
+        >>> rollout.states.joint_position  # (rollout.num_steps + 1, num_dofs)
+    """
+
+    def __init__(self, robot, max_steps, physics_client=None):
+        if physics_client is None:
+            physics_client = getattr(robot, "physics_client", None)
+        if physics_client is None:
+            physics_client = px.current_client()
+        self.physics_client = physics_client
+
+        self.robot = robot
+        self.max_steps = max_steps
+        self._states = _Buffers(robot.state_space, max_steps + 1)
+        self._actions = _Buffers(robot.action_space, max_steps)
+
+    def collect(self, policy, num_steps=None, done=None):
+        """
+        Run `policy` (states => actions) for `num_steps` (max_steps by default)
+        steps, or until done(states) is True for the states after a step.
+        """
+        if num_steps is None:
+            num_steps = self.max_steps
+        assert num_steps <= self.max_steps, f"num_steps > {self.max_steps}"
+
+        get_states = self.robot.get_states
+        set_actions = self.robot.set_actions
+        write_states = self._states.write
+        write_actions = self._actions.write
+        step_simulation = px.stepSimulation
+        client_id = self.physics_client.id
+
+        states = get_states()
+        write_states(states, 0)
+
+        t = 0
+        while t < num_steps:
+            actions = policy(states)
+            write_actions(actions, t)
+            set_actions(actions)
+            step_simulation(physicsClientId=client_id)
+
+            t += 1
+            states = get_states()
+            write_states(states, t)
+            if done is not None and done(states):
+                break
+
+        return Rollout(
+            states=self._states.views(t + 1),
+            actions=self._actions.views(t),
+            num_steps=t,
+        )
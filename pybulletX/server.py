@@ -0,0 +1,416 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+"""
+Share one simulation process between several consumers (ex: a controller, a
+logger and a visualizer) running in other processes.
+
+The Server owns a physics client and serves its methods (and the methods of
+the bodies registered with it) over a local socket. A Server serves a single
+physics client: run one Server per physics client to share several of them. Consumers send batches of
+calls that are executed atomically, in a single round trip. The states of the
+registered robots are also published to shared memory after every step, so
+that consumers can read snapshots of them without any round trip and without
+waiting for the server.
+"""
+import os
+import sys
+import time
+import logging
+import tempfile
+import threading
+import traceback
+import functools
+from multiprocessing import connection
+from multiprocessing.reduction import ForkingPickler
+
+import numpy as np
+
+import pybulletX as px
+from .robot_interface import IRobot
+from .rollout import _nest
+from .utils.shared_arrays import SharedArrays, SharedMemory
+
+log = logging.getLogger(__name__)
+
+# header of the snapshots: [version, number of steps]. The version is odd while
+# the snapshots are being written (a seqlock).
+_HEADER_SIZE = 2
+# pause between two attempts to read a snapshot being written
+_RETRY_INTERVAL = 1e-4
+
+
+class RemoteError(RuntimeError):
+    """
+    Raised by the consumers when a call raised in the server.
+    """
+
+
+def _format_error():
+    error_type, error, _ = sys.exc_info()
+    return (error_type.__name__, str(error), traceback.format_exc())
+
+
+def _raise(target, name, error):
+    error_name, message, trace = error
+    log.debug(f"Remote traceback:\n{trace}")
+    target = "client" if target is None else target
+    raise RemoteError(f"{target}.{name} raised {error_name}: {message}")
+
+
+def _dumps_results(results):
+    """
+    Pickle the results of a batch. Return values that can't be pickled are
+    replaced by an error, only for the calls that returned them.
+    """
+    try:
+        return ForkingPickler.dumps(results)
+    except Exception:
+        # ex: a return value that holds a lambda or a lock
+        log.debug("Failed to pickle the results of a batch", exc_info=True)
+
+    checked = []
+    for success, value in results:
+        try:
+            ForkingPickler.dumps(value)
+            checked.append((success, value))
+        except Exception:
+            checked.append((False, _format_error()))
+    return ForkingPickler.dumps(checked)
+
+
+class Server:
+    """
+    Serve the methods of `physics_client` (current client by default) and of
+    the `bodies` (a dict name => Body/Robot) to consumers connecting to
+    `address` (a Unix socket in a temporary directory by default) with
+    `authkey` (random by default).
+
+    Every batch of calls runs under a lock, so the batch of a consumer (ex:
+    set_actions then stepSimulation) is never interleaved with the calls of
+    another consumer. The states of the robots (IRobot) among `bodies` are
+    published to shared memory after every batch that steps the simulation
+    (i.e. that changes physics_client.step_stats.num_steps, so steps made with
+    pybullet directly aren't seen); call publish() after stepping the
+    simulation from the server process.
+
+    Example::
+        >>> server = px.server.Server({"robot": robot})
+        >>> server.start()
+        >>> # in another process, with server.address and server.authkey
+        >>> client = px.server.connect(address, authkey)
+        >>> with client.batch() as batch:
+        ...     batch.body("robot").set_actions(actions)
+        ...     batch.stepSimulation()
+        >>> num_steps, states = client.snapshot("robot")
+    """
+
+    def __init__(self, bodies=None, address=None, authkey=None, physics_client=None):
+        if physics_client is None:
+            physics_client = px.current_client()
+        self.physics_client = physics_client
+        self.bodies = dict(bodies or {})
+
+        if address is None:
+            self._tmp_dir = tempfile.mkdtemp(prefix="pybulletX-")
+            address = os.path.join(self._tmp_dir, "server.sock")
+        else:
+            self._tmp_dir = None
+        self.authkey = os.urandom(32) if authkey is None else authkey
+        self._listener = connection.Listener(address, authkey=self.authkey)
+        self.address = self._listener.address
+
+        # serializes the batches of all the consumers and the snapshots
+        self._lock = threading.RLock()
+        self._connections = set()
+        self._accept_thread = None
+        self._closed = False
+
+        self._snapshots = {
+            name: SharedArrays(body.state_space, 1)
+            for name, body in self.bodies.items()
+            if isinstance(body, IRobot)
+        }
+        self._header_shm = SharedMemory(size=_HEADER_SIZE * np.dtype(np.int64).itemsize)
+        self._header = np.ndarray(_HEADER_SIZE, np.int64, buffer=self._header_shm.buf)
+        self._header[:] = 0
+        self.publish()
+
+    def _snapshot_info(self):
+        return {
+            "header": self._header_shm.name,
+            "bodies": {
+                name: (self.bodies[name].state_space, shared.name)
+                for name, shared in self._snapshots.items()
+            },
+        }
+
+    def publish(self):
+        """
+        Write the states of the robots to the shared memory snapshots.
+        """
+        with self._lock:
+            header = self._header
+            header[0] += 1
+            for name, shared in self._snapshots.items():
+                shared.write(self.bodies[name].get_states(), 0)
+            header[1] = self.physics_client.step_stats.num_steps
+            header[0] += 1
+
+    def execute(self, calls):
+        """
+        Run a batch of (target, method name, args, kwargs) calls, where target
+        is None for the physics client or the name of a body. Returns a
+        (success, return value or error) pair per call.
+        """
+        results = []
+        with self._lock:
+            num_steps = self.physics_client.step_stats.num_steps
+            for target, name, args, kwargs in calls:
+                try:
+                    if name.startswith("_"):
+                        if target is not None or name != "_snapshot_info":
+                            raise AttributeError(f"{name} is private")
+                        obj = self
+                    elif target is None:
+                        obj = self.physics_client
+                    else:
+                        obj = self.bodies[target]
+                    results.append((True, getattr(obj, name)(*args, **kwargs)))
+                except Exception:
+                    results.append((False, _format_error()))
+            if self.physics_client.step_stats.num_steps != num_steps:
+                self.publish()
+        return results
+
+    def _serve(self, conn):
+        try:
+            with conn:
+                while not self._closed:
+                    try:
+                        calls = conn.recv()
+                    except (EOFError, OSError):
+                        break
+                    results = self.execute(calls)
+                    try:
+                        conn.send_bytes(_dumps_results(results))
+                    except (EOFError, OSError):
+                        break
+        finally:
+            self._connections.discard(conn)
+
+    def serve_forever(self):
+        """
+        Accept consumers (each served by its own thread) until close().
+        """
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, connection.AuthenticationError):
+                if self._closed:
+                    break
+                log.warning("Rejected a connection", exc_info=True)
+                continue
+            self._connections.add(conn)
+            thread = threading.Thread(target=self._serve, args=(conn,), daemon=True)
+            thread.start()
+
+    def start(self):
+        """
+        Accept consumers from a background thread.
+        """
+        assert self._accept_thread is None, "Server already started"
+        self._accept_thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._accept_thread.start()
+
+    def close(self):
+        self._closed = True
+        self._listener.close()
+        for conn in list(self._connections):
+            conn.close()
+        with self._lock:
+            for shared in self._snapshots.values():
+                shared.close(unlink=True)
+            self._snapshots = {}
+            self._header = None
+            self._header_shm.close()
+            self._header_shm.unlink()
+        if self._tmp_dir is not None:
+            try:
+                os.rmdir(self._tmp_dir)
+            except OSError:
+                ...
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+
+class Pending:
+    """
+    The result of a call queued in a Batch, available once the batch is sent.
+    """
+
+    def __init__(self, target, name):
+        self._target = target
+        self._name = name
+        self._result = None
+
+    @property
+    def done(self):
+        return self._result is not None
+
+    def result(self):
+        if self._result is None:
+            raise RuntimeError(f"{self._name} hasn't been sent yet, flush() first")
+        success, value = self._result
+        if not success:
+            _raise(self._target, self._name, value)
+        return value
+
+
+class _Proxy:
+    """
+    Turns attribute accesses into calls of `call(target, name, ...)`.
+    """
+
+    def __init__(self, call, target):
+        self._call = call
+        self._target = target
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return functools.partial(self._call, self._target, name)
+
+
+class Batch(_Proxy):
+    """
+    Calls queued to be sent to the server in a single round trip (and run
+    atomically), when flush() is called or the `with` block ends. Calls
+    return a Pending result.
+    """
+
+    def __init__(self, client):
+        super().__init__(self.call, None)
+        self._client = client
+        self._calls = []
+        self._pending = []
+
+    def call(self, target, name, *args, **kwargs):
+        pending = Pending(target, name)
+        self._calls.append((target, name, args, kwargs))
+        self._pending.append(pending)
+        return pending
+
+    def body(self, name):
+        return _Proxy(self.call, name)
+
+    def __len__(self):
+        return len(self._calls)
+
+    def flush(self):
+        if not self._calls:
+            return
+        results = self._client._round_trip(self._calls)
+        for pending, result in zip(self._pending, results):
+            pending._result = result
+        self._calls, self._pending = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, *args, **kwargs):
+        if error_type is None:
+            self.flush()
+
+
+class RemoteClient(_Proxy):
+    """
+    A consumer of a Server: calling a method of the physics client (ex:
+    client.stepSimulation()) or of a body (client.body("robot").get_states())
+    runs it in the server and returns its result. Use batch() to send several
+    calls in one round trip and snapshot() to read the states of the robots
+    from shared memory.
+    """
+
+    def __init__(self, address, authkey):
+        super().__init__(self.call, None)
+        self._conn = connection.Client(address, authkey=authkey)
+        self._conn_lock = threading.Lock()
+        self._header = None
+        self._snapshots = None
+
+    def _round_trip(self, calls):
+        with self._conn_lock:
+            self._conn.send(calls)
+            return self._conn.recv()
+
+    def call(self, target, name, *args, **kwargs):
+        [(success, value)] = self._round_trip([(target, name, args, kwargs)])
+        if not success:
+            _raise(target, name, value)
+        return value
+
+    def body(self, name):
+        return _Proxy(self.call, name)
+
+    def batch(self):
+        return Batch(self)
+
+    def _attach_snapshots(self):
+        info = self.call(None, "_snapshot_info")
+        self._header_shm = SharedMemory(info["header"])
+        self._header = np.ndarray(_HEADER_SIZE, np.int64, buffer=self._header_shm.buf)
+        self._snapshots = {
+            name: SharedArrays(space, 1, shm_name)
+            for name, (space, shm_name) in info["bodies"].items()
+        }
+
+    def snapshot(self, name, timeout=1.0):
+        """
+        Read a consistent copy of the states of robot `name` as of the last
+        publish (i.e. the last step) of the server, without a round trip.
+        Returns (number of steps, states). Raises RemoteError if no consistent
+        copy could be read within `timeout` seconds (ex: the server died while
+        publishing).
+        """
+        if self._snapshots is None:
+            self._attach_snapshots()
+        shared = self._snapshots[name]
+
+        header = self._header
+        deadline = time.monotonic() + timeout
+        while True:
+            version = header[0]
+            if version % 2 == 0:
+                num_steps = int(header[1])
+                states = [(keys, array[0].copy()) for keys, array in shared.arrays]
+                if header[0] == version:
+                    return num_steps, _nest(states)
+            if time.monotonic() > deadline:
+                raise RemoteError(f"Timed out reading the snapshot of {name}")
+            time.sleep(_RETRY_INTERVAL)
+
+    def close(self):
+        self._conn.close()
+        if self._snapshots is not None:
+            for shared in self._snapshots.values():
+                shared.close()
+            self._header = None
+            self._header_shm.close()
+            self._snapshots = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+
+def connect(address, authkey):
+    """
+    Connect to the Server listening at `address`.
+    """
+    return RemoteClient(address, authkey)
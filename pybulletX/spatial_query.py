@@ -0,0 +1,143 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import logging
+
+import numpy as np
+import pybullet as p
+
+import pybulletX as px
+
+log = logging.getLogger(__name__)
+
+
+class SpatialQuery:
+    """
+    Vectorized AABB queries over a fixed set of bodies or links.
+
+    Each item is either a body (px.Body or body unique id), whose AABB is the
+    union of the AABBs of all its links, or a (body, link_index) tuple. The
+    AABBs of all the items are fetched from pybullet at most once per step (or
+    per teleport of one of the px.Body items) and stored as an (N, 2, 3) array
+    of [lower, upper] corners. All the queries are answered from that array.
+
+    The cache is only invalidated by the state changes pybulletX knows about
+    (see Client.state_version): px.stepSimulation, the methods of px.Client
+    that change the simulation and the set_base_pose/reset methods of px.Body.
+    Call invalidate() after stepping or moving bodies with pybullet directly
+    (ex: pybullet.stepSimulation, pybullet.resetBasePositionAndOrientation),
+    or the queries use stale AABBs.
+
+    Example::
+        >>> query = px.SpatialQuery([cube, sphere, (robot, gripper_link)])
+        >>> in_bin = query.inside(bin_lower, bin_upper)
+        >>> near_gripper = query.overlapping(2, margin=0.05)
+    """
+
+    def __init__(self, items, physics_client=None):
+        if physics_client is None:
+            physics_client = px.current_client()
+        self.physics_client = physics_client
+
+        self.items = list(items)
+        self._bodies = []
+        self._links = []
+        for item in self.items:
+            body, link = item if isinstance(item, tuple) else (item, None)
+            self._bodies.append(body)
+            self._links.append(link)
+
+        self._aabbs = None
+        self._stamp = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def _get_stamp(self):
+        return (self.physics_client.state_version,) + tuple(
+            body._state_version for body in self._bodies if isinstance(body, px.Body)
+        )
+
+    def _get_aabb(self, body_id, link_index):
+        if link_index is not None:
+            return p.getAABB(body_id, link_index, **self._client_kwargs)
+
+        num_joints = p.getNumJoints(body_id, **self._client_kwargs)
+        aabbs = np.array(
+            [
+                p.getAABB(body_id, link, **self._client_kwargs)
+                for link in range(-1, num_joints)
+            ]
+        )
+        return aabbs[:, 0].min(axis=0), aabbs[:, 1].max(axis=0)
+
+    @property
+    def _client_kwargs(self):
+        return {"physicsClientId": self.physics_client.id}
+
+    @property
+    def aabbs(self):
+        """
+        (N, 2, 3) read-only array of the [lower, upper] corners of the AABBs,
+        cached until the simulation is stepped or a px.Body item is teleported
+        (see invalidate).
+        """
+        stamp = self._get_stamp()
+        if self._stamp != stamp:
+            aabbs = np.empty((len(self.items), 2, 3))
+            for i, (body, link) in enumerate(zip(self._bodies, self._links)):
+                body_id = body.id if isinstance(body, px.Body) else body
+                aabbs[i] = self._get_aabb(body_id, link)
+            aabbs.setflags(write=False)
+            self._aabbs = aabbs
+            self._stamp = stamp
+        return self._aabbs
+
+    def invalidate(self):
+        """
+        Force the AABBs to be fetched again, ex: after the bodies were moved
+        with pybullet directly.
+        """
+        self._stamp = None
+
+    def overlaps_region(self, lower, upper):
+        """
+        Boolean mask of the items whose AABB overlaps the box [lower, upper].
+        """
+        aabbs = self.aabbs
+        return np.all(
+            (aabbs[:, 0] <= np.asarray(upper)) & (aabbs[:, 1] >= np.asarray(lower)),
+            axis=-1,
+        )
+
+    def inside(self, lower, upper):
+        """
+        Boolean mask of the items whose AABB is entirely inside [lower, upper].
+        """
+        aabbs = self.aabbs
+        return np.all(
+            (aabbs[:, 0] >= np.asarray(lower)) & (aabbs[:, 1] <= np.asarray(upper)),
+            axis=-1,
+        )
+
+    def overlapping(self, index, margin=0.0):
+        """
+        Indices of the items (other than `index`) whose AABB overlaps the AABB
+        of item `index` grown by `margin`.
+        """
+        lower, upper = self.aabbs[index]
+        mask = self.overlaps_region(lower - margin, upper + margin)
+        mask[index] = False
+        return np.flatnonzero(mask)
+
+    def overlapping_pairs(self, margin=0.0):
+        """
+        (K, 2) array of the index pairs (i < j) of items whose AABBs overlap
+        (once grown by `margin`).
+        """
+        aabbs = self.aabbs
+        lower = aabbs[:, 0] - margin
+        upper = aabbs[:, 1] + margin
+        overlap = np.all(
+            (lower[:, None] <= upper[None, :]) & (upper[:, None] >= lower[None, :]),
+            axis=-1,
+        )
+        return np.argwhere(np.triu(overlap, k=1))
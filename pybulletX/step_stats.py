@@ -0,0 +1,146 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import time
+import logging
+
+import numpy as np
+import pybullet as p
+
+log = logging.getLogger(__name__)
+
+
+class StepStats:
+    """
+    Timing telemetry of the steps of a physics client: number of steps,
+    simulated time, wall-clock duration of stepSimulation (percentiles over
+    the last `window` steps) and achieved real-time factor.
+
+    The stats of a Client (Client.step_stats) are updated by
+    px.stepSimulation / Client.stepSimulation only: pybulletX doesn't patch
+    pybullet.stepSimulation, so steps made with it directly aren't counted.
+    The simulated time is advanced by the time step of the physics server,
+    which is read once and read again after it's changed through
+    px.setParameters, Client.setParameters, Client.setTimeStep or
+    Client.setPhysicsEngineParameter.
+
+    Example::
+        >>> stats = client.step_stats
+        >>> for _ in range(1000):
+        ...     client.stepSimulation()
+        >>> stats.real_time_factor
+        >>> log.info(stats.as_dict())
+    """
+
+    def __init__(self, physics_client_id, window=1024):
+        self.physics_client_id = physics_client_id
+        self.window = window
+        self._time_step = None
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the counters, clocks and recorded step durations.
+        """
+        self.num_steps = 0
+        self.sim_time = 0.0
+        # total wall-clock time spent in stepSimulation
+        self.step_time = 0.0
+        self._durations = np.zeros(self.window)
+        # wall-clock time of the first step since the reset
+        self._start = None
+
+    @property
+    def time_step(self):
+        if self._time_step is None:
+            params = p.getPhysicsEngineParameters(
+                physicsClientId=self.physics_client_id
+            )
+            self._time_step = params["fixedTimeStep"]
+        return self._time_step
+
+    def invalidate_time_step(self):
+        """
+        Read the time step from the physics server again at the next step.
+        """
+        self._time_step = None
+
+    def record(self, start, end):
+        """
+        Record a step that started and ended at the given time.perf_counter().
+        """
+        if self._start is None:
+            self._start = start
+        self._durations[self.num_steps % self.window] = end - start
+        self.num_steps += 1
+        self.sim_time += self.time_step
+        self.step_time += end - start
+
+    @property
+    def wall_time(self):
+        """
+        Wall-clock time elapsed since the first step (after the last reset).
+        """
+        if self._start is None:
+            return 0.0
+        return time.perf_counter() - self._start
+
+    @property
+    def durations(self):
+        """
+        Wall-clock durations of the (up to `window`) last steps.
+        """
+        return self._durations[: min(self.num_steps, self.window)]
+
+    def percentiles(self, q=(50, 90, 99)):
+        """
+        Percentiles `q` of the wall-clock duration of the last steps.
+        """
+        if self.num_steps == 0:
+            return np.full(len(q), np.nan)
+        return np.percentile(self.durations, q)
+
+    @property
+    def mean_step_duration(self):
+        if self.num_steps == 0:
+            return np.nan
+        return self.step_time / self.num_steps
+
+    @property
+    def real_time_factor(self):
+        """
+        Simulated time over the wall-clock time elapsed since the first step,
+        i.e. the real-time factor achieved by the whole loop.
+        """
+        wall_time = self.wall_time
+        return self.sim_time / wall_time if wall_time > 0 else np.nan
+
+    @property
+    def max_real_time_factor(self):
+        """
+        Simulated time over the time spent in stepSimulation, i.e. the
+        real-time factor if nothing but stepping were done.
+        """
+        return self.sim_time / self.step_time if self.step_time > 0 else np.nan
+
+    def as_dict(self):
+        """
+        A snapshot of the stats as a flat dict of numbers, to be logged or
+        exported.
+        """
+        p50, p90, p99 = self.percentiles((50, 90, 99))
+        return {
+            "num_steps": self.num_steps,
+            "sim_time": self.sim_time,
+            "wall_time": self.wall_time,
+            "step_time": self.step_time,
+            "step_duration_mean": self.mean_step_duration,
+            "step_duration_p50": p50,
+            "step_duration_p90": p90,
+            "step_duration_p99": p99,
+            "real_time_factor": self.real_time_factor,
+            "max_real_time_factor": self.max_real_time_factor,
+        }
+
+    def __repr__(self):
+        return "StepStats({})".format(
+            ", ".join(f"{k}={v:.6g}" for k, v in self.as_dict().items())
+        )
@@ -1,3 +1,27 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
-from .simulation_thread import SimulationThread  # noqa: F401
-from .space_dict import SpaceDict  # noqa: F401
+
+# Imported on first access, SpaceDict pulls in gym which is slow to import and
+# optional for users who only query states.
+# name => module
+_LAZY_ATTRIBUTES = {
+    "SimulationThread": ".simulation_thread",
+    "SpaceDict": ".space_dict",
+    "AssetResolver": ".asset_resolver",
+    "FixedDict": ".fixed_dict",
+    "SharedArrays": ".shared_arrays",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    import importlib
+
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + list(_LAZY_ATTRIBUTES.keys()))
@@ -0,0 +1,224 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import os
+import json
+import time
+import logging
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+
+class _DirectoryIndex:
+    """
+    Index of the files under a search path, built lazily: a directory (relative
+    to the search path) is listed the first time a file is looked up in it, and
+    never recursively. For each listed directory we keep its mtime, the names
+    of its files and the names of its sub-directories. A directory whose mtime
+    changed (i.e. entries were added or removed) is listed again.
+
+    Missing directories are cached too: the search path itself is kept with a
+    None mtime, and a sub-directory is missing as long as the (up to date)
+    listing of its parent doesn't have it.
+    """
+
+    def __init__(self, root, dirs=None):
+        self.root = root
+        # relative directory => [mtime_ns or None, file names, sub-directory names]
+        self.dirs = dirs if dirs is not None else {}
+        # relative directory => time.monotonic() of the last mtime check
+        self._last_checked = {}
+
+    def _stat_mtime(self, rel_dir):
+        try:
+            return os.stat(os.path.join(self.root, rel_dir)).st_mtime_ns
+        except OSError:
+            return None
+
+    def scan(self, rel_dir=""):
+        """
+        List rel_dir (but not its sub-directories).
+        """
+        self._last_checked[rel_dir] = time.monotonic()
+        mtime = self._stat_mtime(rel_dir)
+
+        files, subdirs = [], []
+        try:
+            with os.scandir(os.path.join(self.root, rel_dir)) as it:
+                for entry in it:
+                    # nothing is listed recursively, so following symbolic
+                    # links (to directories) is safe
+                    if entry.is_file():
+                        files.append(entry.name)
+                    elif entry.is_dir():
+                        subdirs.append(entry.name)
+        except OSError:
+            mtime = None
+
+        self.dirs[rel_dir] = [mtime, set(files), set(subdirs)]
+
+    def _validate(self, rel_dir, check_interval):
+        """
+        List rel_dir if it's not indexed yet, or again if its mtime changed.
+        The mtime is checked at most once every `check_interval` seconds.
+        """
+        entry = self.dirs.get(rel_dir)
+        if entry is None:
+            self.scan(rel_dir)
+            return
+
+        now = time.monotonic()
+        if now - self._last_checked.get(rel_dir, -float("inf")) < check_interval:
+            return
+        self._last_checked[rel_dir] = now
+
+        if self._stat_mtime(rel_dir) != entry[0]:
+            log.debug(f"Re-indexing '{os.path.join(self.root, rel_dir)}'")
+            self.scan(rel_dir)
+
+    def _get_dir(self, rel_dir, check_interval):
+        """
+        Get the (validated) entry of rel_dir, or None if it doesn't exist.
+        """
+        if rel_dir:
+            parent, name = os.path.split(rel_dir)
+            parent_entry = self._get_dir(parent, check_interval)
+            if parent_entry is None or name not in parent_entry[2]:
+                return None
+
+        self._validate(rel_dir, check_interval)
+        entry = self.dirs[rel_dir]
+        return None if entry[0] is None else entry
+
+    def contains(self, rel_path, check_interval):
+        rel_dir, name = os.path.split(rel_path)
+        entry = self._get_dir(rel_dir, check_interval)
+        return entry is not None and name in entry[1]
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        while f.read(1 << 20):
+            pass
+    return path
+
+
+class AssetResolver:
+    """
+    Find asset files (URDF, meshes, textures, ...) in a list of search paths
+    (ex: pybulletX.path) without hitting the filesystem for every lookup.
+
+    The directories of a search path are indexed the first time a file is
+    looked up in them. Lookups are answered from the index, which is kept up to
+    date by checking the mtime of the directories involved at most once every
+    `check_interval` seconds: files created (or removed) since the last check
+    may be missed (or found) for up to `check_interval` seconds. Use
+    check_interval=0 or invalidate() to see them right away. Indices can be
+    saved to and loaded from disk so that they survive between runs.
+    """
+
+    def __init__(self, check_interval=1.0, cache_file=None, prefetch_workers=8):
+        self.check_interval = check_interval
+        self.prefetch_workers = prefetch_workers
+        self._indices = {}
+        self._executor = None
+        if cache_file is not None and os.path.isfile(cache_file):
+            self.load(cache_file)
+
+    def _get_index(self, search_path):
+        search_path = os.path.abspath(search_path)
+        if search_path not in self._indices:
+            self._indices[search_path] = _DirectoryIndex(search_path)
+        return self._indices[search_path]
+
+    def find(self, file_path, search_paths):
+        """
+        Return the path of `file_path` in the first search path that contains
+        it, or None if none of them does.
+        """
+        rel_path = os.path.normpath(file_path)
+        if os.path.isabs(rel_path):
+            return None
+
+        if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+            # outside of the search paths, hence not in their indices
+            for search_path in search_paths:
+                path = os.path.join(search_path, file_path)
+                if os.path.isfile(path):
+                    return path
+            return None
+
+        for search_path in search_paths:
+            index = self._get_index(search_path)
+            if index.contains(rel_path, self.check_interval):
+                return os.path.join(search_path, file_path)
+        return None
+
+    def invalidate(self, search_path=None):
+        """
+        Drop the index of a search path (or of all of them).
+        """
+        if search_path is None:
+            self._indices.clear()
+        else:
+            self._indices.pop(os.path.abspath(search_path), None)
+
+    def save(self, cache_file):
+        data = {
+            root: {d: [m, sorted(f), sorted(s)] for d, (m, f, s) in index.dirs.items()}
+            for root, index in self._indices.items()
+        }
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_file, cache_file)
+
+    def load(self, cache_file):
+        """
+        Load indices saved by save(). Stale directories are re-scanned on their
+        first lookup.
+        """
+        with open(cache_file, "r") as f:
+            data = json.load(f)
+        for root, dirs in data.items():
+            dirs = {d: [m, set(f), set(s)] for d, (m, f, s) in dirs.items()}
+            self._indices[root] = _DirectoryIndex(root, dirs)
+
+    def referenced_files(self, urdf_path, search_paths=()):
+        """
+        Get the paths of the mesh and texture files referenced by a URDF.
+        Relative file names are resolved w.r.t. the directory of the URDF, and
+        then w.r.t. the search paths (ROS style package:// prefixes are stripped).
+        """
+        urdf_dir = os.path.dirname(urdf_path)
+        file_paths = []
+        for element in ET.parse(urdf_path).iter():
+            file_name = element.get("filename")
+            if file_name is None:
+                continue
+
+            if file_name.startswith("package://"):
+                file_name = file_name[len("package://") :]
+
+            path = os.path.join(urdf_dir, file_name)
+            if not os.path.isfile(path):
+                path = self.find(file_name, search_paths)
+
+            if path is None:
+                log.warning(f"Can't find '{file_name}' referenced by '{urdf_path}'")
+            elif path not in file_paths:
+                file_paths.append(path)
+
+        return file_paths
+
+    def prefetch(self, urdf_path, search_paths=()):
+        """
+        Read the URDF and all the files it references in background threads so
+        that they are in the OS cache by the time pybullet loads them. Returns a
+        list of concurrent.futures.Future, one per file.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.prefetch_workers)
+
+        file_paths = [urdf_path] + self.referenced_files(urdf_path, search_paths)
+        return [self._executor.submit(_read_file, path) for path in file_paths]
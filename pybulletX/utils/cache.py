@@ -0,0 +1,86 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+"""
+Per-instance caching of methods and properties.
+
+Unlike functools.lru_cache, which keeps a strong reference to `self` in a cache
+shared by all the instances of a class, the values cached here are stored in
+the instance itself and are therefore released together with it.
+"""
+import functools
+
+import numpy as np
+
+# name of the attribute holding the cache of an instance
+_CACHE_ATTR = "_px_cache"
+
+
+def _get_cache(obj):
+    try:
+        return obj.__dict__[_CACHE_ATTR]
+    except KeyError:
+        return obj.__dict__.setdefault(_CACHE_ATTR, {})
+
+
+def _to_hashable(x):
+    if isinstance(x, (list, np.ndarray)):
+        return tuple(x)
+    return x
+
+
+class cached_property:
+    """
+    Like property, but the value is computed once per instance and cached until
+    clear_cache(obj, name) is called.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        functools.update_wrapper(self, func)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        cache = _get_cache(obj)
+        key = (self.name,)
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = self.func(obj)
+            return value
+
+
+def cached_method(func):
+    """
+    Cache the results of a method per instance and per (positional) arguments
+    until clear_cache(obj, name) is called. Lists and np.ndarray arguments are
+    converted to tuples to be used as keys.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args):
+        cache = _get_cache(self)
+        key = (name,) + tuple(map(_to_hashable, args))
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = func(self, *args)
+            return value
+
+    return wrapper
+
+
+def clear_cache(obj, *names):
+    """
+    Invalidate the cached values of the given methods/properties of `obj`, or
+    all of them if no name is given.
+    """
+    cache = _get_cache(obj)
+    if not names:
+        cache.clear()
+        return
+
+    for key in [key for key in cache if key[0] in names]:
+        del cache[key]
@@ -0,0 +1,138 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import keyword
+import collections
+
+# tuple of keys => FixedDict subclass with these keys as slots
+_classes = {}
+
+
+def _type_checker(predicate):
+    """
+    Memoize predicate(type(value)) per type. isinstance against an ABC (Mapping,
+    IRobot) is slow and runs for every value of every get_states.
+    """
+    results = {}
+
+    def check(value):
+        cls = type(value)
+        result = results.get(cls)
+        if result is None:
+            result = results[cls] = predicate(cls)
+        return result
+
+    return check
+
+
+def _fixed_dict_class(keys):
+    cls = _classes.get(keys)
+    if cls is None:
+        for key in keys:
+            if not isinstance(key, str) or not key.isidentifier():
+                raise ValueError(f"FixedDict keys must be identifiers, got {key!r}")
+            if keyword.iskeyword(key) or hasattr(FixedDict, key):
+                raise ValueError(f"{key!r} can't be used as a FixedDict key")
+        attrs = {"__slots__": keys, "_keys": keys, "_key_set": frozenset(keys)}
+        cls = _classes[keys] = type("FixedDict", (FixedDict,), attrs)
+    return cls
+
+
+class FixedDict(collections.abc.Mapping):
+    """
+    A nested container with a fixed set of keys, stored in slots. Values can be
+    accessed both as attributes and as items, nested mappings are converted to
+    FixedDict once when they are set (not on every access). Setting a key that
+    is not in the container raises.
+
+    A FixedDict is meant to be created once and refilled in place with
+    update(), ex: by get_states() on every step.
+
+    Example::
+        >>> states = FixedDict(arm={"joint_position": None}, gripper=None)
+        >>> states.update({"arm": {"joint_position": q}, "gripper": 0.5})
+        >>> states.arm.joint_position is states["arm"]["joint_position"]
+        True
+    """
+
+    __slots__ = ()
+    _keys = ()
+    _key_set = frozenset()
+
+    def __new__(cls, mapping=(), **kwargs):
+        if cls is FixedDict:
+            cls = _fixed_dict_class(tuple(dict(mapping, **kwargs)))
+        return super().__new__(cls)
+
+    def __init__(self, mapping=(), **kwargs):
+        for key in self._keys:
+            object.__setattr__(self, key, None)
+        self.update(mapping, **kwargs)
+
+    @classmethod
+    def with_keys(cls, keys):
+        """
+        Get the FixedDict class with the given keys.
+        """
+        return _fixed_dict_class(tuple(keys))
+
+    def update(self, mapping=(), **kwargs):
+        """
+        Set the values of (some of) the keys. Nested mappings with the same keys
+        as the FixedDict they replace are copied into it.
+        """
+        items = (
+            mapping.items() if isinstance(mapping, collections.abc.Mapping) else mapping
+        )
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key not in self._key_set:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._key_set:
+            raise KeyError(key)
+        if _is_plain_mapping(value):
+            current = getattr(self, key)
+            if isinstance(current, FixedDict) and current._key_set == value.keys():
+                current.update(value)
+                return
+            value = FixedDict(value)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._key_set
+
+    def __reduce__(self):
+        # the classes are created on the fly, rebuild them from the keys
+        return (FixedDict, (self.to_dict(),))
+
+    def copy(self):
+        """
+        Copy the container (and the nested FixedDict) but not the values.
+        """
+        return FixedDict(self.to_dict())
+
+    def to_dict(self):
+        return {
+            key: value.to_dict() if isinstance(value, FixedDict) else value
+            for key, value in self.items()
+        }
+
+    def __repr__(self):
+        return f"FixedDict({self.to_dict()!r})"
+
+
+_is_plain_mapping = _type_checker(
+    lambda cls: issubclass(cls, collections.abc.Mapping)
+    and not issubclass(cls, FixedDict)
+)
@@ -9,12 +9,22 @@ class LoopThread(threading.Thread):
         super().__init__()
         self.interval = interval
         self._callback = callback
+        self._stop_event = threading.Event()
 
     def run(self):
         """
         Use a soft real-time clock (Soft RTC) to call callback periodically.
         """
-        clock = SoftRealTimeClock(period=self.interval)
-        while threading.main_thread().is_alive():
+        clock = SoftRealTimeClock(period=self.interval, sleep=self._stop_event.wait)
+        while threading.main_thread().is_alive() and not self._stop_event.is_set():
             self._callback()
             clock.sleep()
+
+    def stop(self, timeout=None):
+        """
+        Stop calling callback (interrupting the wait for the next call) and
+        wait for the thread to finish.
+        """
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
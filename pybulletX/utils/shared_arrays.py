@@ -0,0 +1,110 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import os
+import mmap
+import logging
+import tempfile
+
+import numpy as np
+
+from ..rollout import _leaves, _nest
+
+log = logging.getLogger(__name__)
+
+# tmpfs on Linux: the blocks live in memory, like POSIX shared memory
+_SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class SharedMemory:
+    """
+    A block of memory shared between processes: a memory-mapped file (in
+    /dev/shm when available) that other processes attach to by name (its
+    path). Unlike multiprocessing.shared_memory, attaching to a block doesn't
+    make the attaching process responsible for unlinking it: only its creator
+    calls unlink().
+    """
+
+    def __init__(self, name=None, size=0):
+        if name is None:
+            fd, name = tempfile.mkstemp(prefix="pybulletX-", dir=_SHM_DIR)
+            try:
+                os.ftruncate(fd, size)
+            except OSError:
+                os.close(fd)
+                os.unlink(name)
+                raise
+        else:
+            fd = os.open(name, os.O_RDWR)
+            size = os.fstat(fd).st_size
+
+        try:
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self.name = name
+        self.size = size
+        self.buf = memoryview(self._mmap)
+
+    def close(self):
+        """
+        Raises BufferError if arrays using the buffer are still alive.
+        """
+        self.buf.release()
+        self._mmap.close()
+
+    def unlink(self):
+        os.unlink(self.name)
+
+
+class SharedArrays:
+    """
+    One (num_envs, *shape) array per leaf of a SpaceDict, all laid out in a
+    single shared memory block. Other processes attach to the block by name
+    (ex: px.gym.VecEnv workers, which only use their own rows).
+    """
+
+    _ALIGNMENT = 64
+
+    def __init__(self, space, num_envs, name=None):
+        self.layout = []
+        nbytes = 0
+        for keys, leaf in _leaves(space):
+            dtype = np.dtype(leaf.dtype)
+            shape = (num_envs,) + tuple(leaf.shape)
+            self.layout.append((keys, dtype, shape, nbytes))
+            size = int(np.prod(shape)) * dtype.itemsize
+            nbytes += -(-size // self._ALIGNMENT) * self._ALIGNMENT
+
+        self.shm = SharedMemory(name, max(nbytes, 1))
+        self.arrays = [
+            (keys, np.ndarray(shape, dtype, buffer=self.shm.buf, offset=offset))
+            for keys, dtype, shape, offset in self.layout
+        ]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def views(self, index=slice(None)):
+        """
+        Nested FixedDict of the arrays (or of rows `index` of the arrays).
+        """
+        return _nest((keys, array[index]) for keys, array in self.arrays)
+
+    def write(self, values, index=slice(None)):
+        for keys, array in self.arrays:
+            value = values
+            for key in keys:
+                value = value[key]
+            array[index] = value
+
+    def close(self, unlink=False):
+        # the arrays must not outlive the buffer
+        self.arrays = []
+        try:
+            self.shm.close()
+        except BufferError:
+            # views of the arrays are still alive (ex: with VecEnv(copy=False)),
+            # the memory is released with them
+            log.debug(f"Shared memory {self.name} is still in use")
+        if unlink:
+            self.shm.unlink()
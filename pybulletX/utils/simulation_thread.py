@@ -1,24 +1,29 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
 import threading
 
-import pybullet as p
+import pybulletX as px
 
 from .soft_real_time_clock import SoftRealTimeClock
 
 
 class SimulationThread(threading.Thread):
-    def __init__(self, real_time_factor):
+    def __init__(self, real_time_factor, physics_client=None):
         super().__init__()
         self.real_time_factor = real_time_factor
 
+        # capture the client here since the current client is thread-local
+        if physics_client is None:
+            physics_client = px.current_client()
+        self.physics_client = physics_client
+
     def run(self):
         """
         Use a soft real-time clock (Soft RTC) to step through the simulation.If
         the p.stepSimulation takes too long, slow down the clock by decreasing
         the real time factor.
         """
-        time_step = p.getPhysicsEngineParameters()["fixedTimeStep"]
+        time_step = self.physics_client.getPhysicsEngineParameters()["fixedTimeStep"]
         clock = SoftRealTimeClock(period=time_step / self.real_time_factor)
         while threading.main_thread().is_alive():
-            p.stepSimulation()
+            self.physics_client.stepSimulation()
             clock.sleep()
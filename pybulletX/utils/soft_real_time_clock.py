@@ -7,12 +7,14 @@ class SoftRealTimeClock:
     Convenience class for sleeping in a loop at a specified rate
     """
 
-    def __init__(self, hz=None, period=None):
+    def __init__(self, hz=None, period=None, sleep=time.sleep):
         assert (
             hz is not None or period is not None
         ), "Use either SoftRealTimeClock(hz=10) or SoftRealTimeClock(period=0.1)"
         self.last_time = self.gettime()
         self.sleep_dur = 1.0 / hz if hz is not None else period
+        # ex: threading.Event().wait, to be able to interrupt the sleep
+        self._sleep_fn = sleep
 
     def gettime(self):
         return time.clock_gettime(time.CLOCK_REALTIME)
@@ -27,7 +29,7 @@ class SoftRealTimeClock:
     def _sleep(self, duration):
         if duration < 0:
             return
-        time.sleep(duration)
+        self._sleep_fn(duration)
 
     def sleep(self):
         """
@@ -2,7 +2,7 @@
 import gym
 import collections
 
-from attrdict import AttrMap
+from .fixed_dict import FixedDict
 
 
 def _override_gym_spaces_dict_constructor():
@@ -79,9 +79,15 @@ class SpaceDict(gym.spaces.Dict, collections.abc.Mapping):
     def __dir__(self):
         return object.__dir__(self) + list(self.spaces.keys())
 
+    def contains(self, x):
+        # gym.spaces.Dict only accepts dict, states are FixedDict
+        if not isinstance(x, collections.abc.Mapping) or len(x) != len(self.spaces):
+            return False
+        return all(k in x and space.contains(x[k]) for k, space in self.spaces.items())
+
     def new(self):
         # TODO(poweic): instead of None, use torch.Tensor? (placeholder + strict schema)
-        return AttrMap(
+        return FixedDict(
             {
                 k: v.new() if isinstance(v, collections.abc.Mapping) else None
                 for k, v in self.spaces.items()
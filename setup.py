@@ -27,6 +27,8 @@ setup(
     url="https://github.com/facebookresearch/pybulletX",
     packages=find_packages(),
     install_requires=install_requires,
+    # gym is only needed for state_space/action_space (SpaceDict)
+    extras_require={"gym": ["gym >= 0.17.2"]},
     include_package_data=True,
     zip_safe=False,
 )
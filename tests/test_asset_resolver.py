@@ -0,0 +1,114 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import os
+from unittest import mock
+
+import pybullet_data
+
+from pybulletX.utils.asset_resolver import AssetResolver
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("")
+
+
+def test_asset_resolver_find(tmp_path):
+    a, b = str(tmp_path / "a"), str(tmp_path / "b")
+    _touch(os.path.join(a, "robot", "model.urdf"))
+    _touch(os.path.join(b, "robot", "model.urdf"))
+    _touch(os.path.join(b, "cube.urdf"))
+
+    resolver = AssetResolver(check_interval=0)
+    assert resolver.find("robot/model.urdf", [a, b]) == os.path.join(
+        a, "robot/model.urdf"
+    )
+    assert resolver.find("cube.urdf", [a, b]) == os.path.join(b, "cube.urdf")
+    assert resolver.find("sphere.urdf", [a, b]) is None
+    # paths out of the search paths are looked up on the filesystem
+    assert resolver.find("../b/cube.urdf", [a]) == os.path.join(a, "../b/cube.urdf")
+    assert resolver.find("../a/cube.urdf", [b]) is None
+
+    # new files and directories are picked up
+    _touch(os.path.join(a, "sphere.urdf"))
+    _touch(os.path.join(a, "new", "dir", "sphere.urdf"))
+    assert resolver.find("sphere.urdf", [a, b]) == os.path.join(a, "sphere.urdf")
+    assert resolver.find("new/dir/sphere.urdf", [a, b]) is not None
+
+    # and so are removed ones
+    os.remove(os.path.join(a, "robot", "model.urdf"))
+    assert resolver.find("robot/model.urdf", [a, b]) == os.path.join(
+        b, "robot/model.urdf"
+    )
+
+
+def test_asset_resolver_check_interval(tmp_path):
+    root = str(tmp_path / "assets")
+    missing = str(tmp_path / "missing")
+    _touch(os.path.join(root, "gen_0.urdf"))
+
+    resolver = AssetResolver(check_interval=3600)
+    assert resolver.find("gen_0.urdf", [missing, root]) is not None
+    assert resolver.find("robot/model.urdf", [missing, root]) is None
+
+    # within the check interval, hits and misses (in missing search paths and
+    # directories too) are answered from the index
+    with mock.patch("os.stat") as stat, mock.patch("os.scandir") as scandir:
+        with mock.patch("os.path.isfile") as isfile:
+            assert resolver.find("gen_0.urdf", [missing, root]) is not None
+            assert resolver.find("robot/model.urdf", [missing, root]) is None
+    stat.assert_not_called()
+    scandir.assert_not_called()
+    isfile.assert_not_called()
+
+    # new files show up after the next check
+    _touch(os.path.join(root, "gen_1.urdf"))
+    assert resolver.find("gen_1.urdf", [root]) is None
+    resolver.invalidate(root)
+    assert resolver.find("gen_1.urdf", [root]) == os.path.join(root, "gen_1.urdf")
+
+
+def test_asset_resolver_lazy_symlink_loop(tmp_path):
+    root = str(tmp_path / "assets")
+    _touch(os.path.join(root, "robot", "model.urdf"))
+    _touch(os.path.join(root, "other", "deep", "model.urdf"))
+    os.symlink(root, os.path.join(root, "loop"))
+
+    resolver = AssetResolver()
+    assert resolver.find("robot/model.urdf", [root]) is not None
+    assert resolver.find("loop/robot/model.urdf", [root]) is not None
+    assert resolver.find("loop/missing.urdf", [root]) is None
+
+    # only the directories of the lookups are listed
+    index = resolver._indices[os.path.abspath(root)]
+    assert sorted(index.dirs) == ["", "loop", "loop/robot", "robot"]
+
+
+def test_asset_resolver_save_load(tmp_path):
+    root = str(tmp_path / "assets")
+    _touch(os.path.join(root, "robot", "model.urdf"))
+    cache_file = str(tmp_path / "index.json")
+
+    resolver = AssetResolver()
+    assert resolver.find("robot/model.urdf", [root]) is not None
+    resolver.save(cache_file)
+
+    resolver = AssetResolver(check_interval=0, cache_file=cache_file)
+    assert os.path.abspath(root) in resolver._indices
+    assert resolver.find("robot/model.urdf", [root]) is not None
+
+    # stale entries of the cache file are refreshed
+    _touch(os.path.join(root, "robot", "other.urdf"))
+    assert resolver.find("robot/other.urdf", [root]) is not None
+
+
+def test_asset_resolver_referenced_files():
+    resolver = AssetResolver()
+    urdf_path = resolver.find("kuka_iiwa/model.urdf", [pybullet_data.getDataPath()])
+
+    file_paths = resolver.referenced_files(urdf_path)
+    assert len(file_paths) > 0
+    assert all(os.path.isfile(path) for path in file_paths)
+
+    futures = resolver.prefetch(urdf_path)
+    assert [f.result() for f in futures] == [urdf_path] + file_paths
@@ -0,0 +1,104 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_body_pool_reuse():
+    with px.Client(mode=p.DIRECT) as c:
+        pool = px.BodyPool(physics_client=c)
+        cube = pool.acquire("cube_small.urdf", base_position=(0, 0, 1))
+        cube.set_base_velocity((1, 0, 0), (0, 0, 1))
+        num_bodies = c.getNumBodies()
+
+        pool.release(cube)
+        assert pool.num_idle == 1
+
+        # parked bodies stay where they are
+        for _ in range(100):
+            c.stepSimulation()
+        assert np.allclose(cube.get_base_pose()[0], pool.park_position, atol=1e-3)
+
+        # a different load option doesn't reuse the parked cube
+        other = pool.acquire("cube_small.urdf", global_scaling=2.0)
+        assert other is not cube
+        pool.release(other)
+
+        reused = pool.acquire("cube_small.urdf", base_position=(0, 0, 1))
+        assert reused is cube
+        assert c.getNumBodies() == num_bodies + 1
+        assert np.allclose(reused.get_base_pose()[0], (0, 0, 1))
+        assert np.allclose(reused.get_base_velocity(), 0)
+
+        # the reused cube is simulated again and lands on the plane
+        for _ in range(240):
+            c.stepSimulation()
+        assert reused.get_base_pose()[0][2] < 0.1
+        assert len(c.getContactPoints(reused.id)) > 0
+
+
+def test_body_pool_prewarm_and_eviction():
+    with px.Client(mode=p.DIRECT) as c:
+        pool = px.BodyPool(max_idle=5, max_idle_per_key=3, physics_client=c)
+        num_bodies = c.getNumBodies()
+
+        pool.prewarm(3, "cube_small.urdf")
+        pool.prewarm(3, "cube_small.urdf")
+        assert pool.num_idle == 3
+        assert c.getNumBodies() == num_bodies + 3
+
+        cubes = [pool.acquire("cube_small.urdf") for _ in range(4)]
+        assert c.getNumBodies() == num_bodies + 4
+        for cube in cubes:
+            pool.release(cube)
+        assert pool.num_idle == 3
+
+        pool.prewarm(3, "sphere_small.urdf")
+        assert pool.num_idle == 5
+        assert c.getNumBodies() == num_bodies + 5
+
+        pool.clear()
+        assert pool.num_idle == 0
+        assert c.getNumBodies() == num_bodies
+
+
+def test_body_pool_robot_and_dtype():
+    with px.Client(mode=p.DIRECT) as c:
+        pool = px.BodyPool(physics_client=c)
+
+        cube = pool.acquire("cube_small.urdf", dtype=np.float32)
+        assert cube.dtype == np.float32
+        pool.release(cube)
+        assert pool.acquire("cube_small.urdf") is not cube
+        assert pool.acquire("cube_small.urdf", dtype="float32") is cube
+
+        robot = pool.acquire("kuka_iiwa/model.urdf", body_class=px.Robot)
+        zero_pose = robot.get_states().joint_position.copy()
+        robot.torque_control = True
+        robot.free_joint_indices = [0, 1]
+        robot.zero_pose = np.full(2, 0.3)
+        robot.configure_state_space(joint_velocity=False)
+        pool.release(robot)
+        robot = pool.acquire("kuka_iiwa/model.urdf", body_class=px.Robot)
+        assert not robot.torque_control
+        assert robot.free_joint_indices == list(range(7))
+        assert np.allclose(robot.zero_pose, zero_pose)
+        assert "joint_velocity" in robot.state_space.spaces
+
+        robot.set_actions({"joint_position": np.ones(robot.num_dofs)})
+        for _ in range(10):
+            c.stepSimulation()
+        pool.release(robot)
+
+        reused = pool.acquire(
+            "kuka_iiwa/model.urdf", base_position=(1, 0, 0), body_class=px.Robot
+        )
+        assert reused is robot
+        assert np.allclose(reused.get_states().joint_position, zero_pose)
+        assert np.allclose(reused.get_base_pose()[0], (1, 0, 0))
+
+        # the motors hold the zero pose instead of tracking the old targets
+        for _ in range(100):
+            c.stepSimulation()
+        assert np.allclose(reused.get_states().joint_position, zero_pose, atol=1e-3)
@@ -0,0 +1,71 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import gc
+import weakref
+import tracemalloc
+
+import pybullet as p
+import pybulletX as px
+from pybulletX.utils.cache import cached_method, cached_property, clear_cache
+
+
+class Counter:
+    def __init__(self):
+        self.num_calls = 0
+
+    @cached_property
+    def value(self):
+        self.num_calls += 1
+        return self.num_calls
+
+    @cached_method
+    def add(self, x):
+        self.num_calls += 1
+        return sum(x)
+
+
+def test_cache():
+    c = Counter()
+    assert c.value == 1 and c.value == 1
+    assert c.add([1, 2]) == 3 and c.add([1, 2]) == 3
+    assert c.num_calls == 2
+
+    clear_cache(c, "value")
+    assert c.value == 3
+    assert c.add([1, 2]) == 3
+
+    clear_cache(c)
+    assert c.add([1, 2]) == 3
+    assert c.num_calls == 4
+
+
+def _create_and_remove_robot(client):
+    robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+    # exercise all the cached methods and properties
+    robot.get_joint_index_by_name("lbr_iiwa_joint_1")
+    robot.joint_effort_limits(robot.free_joint_indices)
+    robot.full_state_space
+    robot.set_joint_position(robot.zero_pose)
+    client.removeBody(robot.id)
+    return weakref.ref(robot)
+
+
+def test_cache_released_with_robot():
+    with px.Client(mode=p.DIRECT) as c:
+        ref = _create_and_remove_robot(c)
+        gc.collect()
+        assert ref() is None
+
+        for _ in range(10):
+            _create_and_remove_robot(c)
+
+        gc.collect()
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(50):
+            _create_and_remove_robot(c)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # with per-class caches, each robot would be kept alive (~tens of KB)
+        assert after - before < 100 * 1024
@@ -0,0 +1,67 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_point_cloud():
+    with px.Client(mode=p.DIRECT) as c:
+        plane = px.Body("plane.urdf")
+        cube = px.Body("cube.urdf", base_position=(0, 0, 0.5), use_fixed_base=True)
+
+        camera = px.Camera(width=64, height=48, fov=60, near=0.1, far=10)
+        camera.look_at(eye=(0, 0, 3), target=(0, 0, 0), up=(0, 1, 0))
+
+        cloud = camera.point_cloud()
+        assert cloud.points.shape == (64 * 48, 3)
+        assert cloud.body_ids.shape == cloud.link_indices.shape == (64 * 48,)
+
+        # the top face of the cube is in the middle of the image
+        on_cube = cloud.body_ids == cube.id
+        on_plane = cloud.body_ids == plane.id
+        assert on_cube.sum() > 0 and on_plane.sum() > 0
+        assert on_cube[24 * 64 + 32]
+        assert np.allclose(cloud.points[on_cube, 2], 1.0, atol=0.02)
+        assert np.all(np.abs(cloud.points[on_cube, :2]) < 0.52)
+        assert np.allclose(cloud.points[on_plane, 2], 0.0, atol=0.02)
+        assert np.all(cloud.link_indices[on_cube | on_plane] == -1)
+
+        # points agree with ray casting
+        eye = np.array([0, 0, 3.0])
+        ends = eye + (cloud.points[:10] - eye) * 1.1
+        hits = p.rayTestBatch([eye] * 10, ends.tolist(), physicsClientId=c.id)
+        assert np.allclose([h[3] for h in hits], cloud.points[:10], atol=0.02)
+
+        downsampled = camera.point_cloud(voxel_size=0.25)
+        assert 0 < len(downsampled) < len(cloud)
+        voxels = np.floor(downsampled.points / 0.25)
+        assert len(np.unique(voxels, axis=0)) == len(downsampled)
+
+
+def test_decode_segmentation_mask():
+    from pybulletX.camera import decode_segmentation_mask
+
+    seg = np.array([-1, 3, 3 + (1 << 24), 7 + (5 << 24)])
+    body_ids, link_indices = decode_segmentation_mask(seg)
+    assert body_ids.tolist() == [-1, 3, 3, 7]
+    assert link_indices.tolist() == [-1, -1, 0, 4]
+
+
+def test_reconfigure_camera():
+    with px.Client(mode=p.DIRECT):
+        px.Body("plane.urdf")
+        camera = px.Camera(width=64, height=48, fov=60, near=0.1, far=10)
+        camera.look_at(eye=(0, 0, 3), target=(0, 0, 0), up=(0, 1, 0))
+        assert len(camera.point_cloud()) == 64 * 48
+
+        camera.width, camera.height, camera.fov = 32, 32, 90
+        assert np.allclose(
+            camera.projection_matrix,
+            p.computeProjectionMatrixFOV(90, 1.0, 0.1, 10),
+        )
+        cloud = camera.point_cloud()
+        assert len(cloud) == 32 * 32
+        assert np.allclose(cloud.points[:, 2], 0.0, atol=0.02)
+        # a 90 degree field of view sees 3 m on each side from 3 m high
+        assert np.allclose(np.abs(cloud.points[:, :2]).max(), 3.0, atol=0.1)
@@ -0,0 +1,117 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+import pytest
+
+
+def _build_world(c):
+    robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True, physics_client=c)
+    gripper = px.Robot("kuka_iiwa/model.urdf", physics_client=c, dtype=np.float32)
+    robot.attach(gripper, "lbr_iiwa_joint_7")
+    return robot, gripper
+
+
+def test_checkpoint(tmp_path):
+    path = str(tmp_path / "world.ckpt")
+
+    with px.Client(mode=p.DIRECT) as c:
+        c.setParameters({"timeStep": 0.002})
+        robot, gripper = _build_world(c)
+        robot.free_joint_indices = robot.free_joint_indices[:5]
+        robot.zero_pose = np.full(5, 0.2)
+        robot.configure_state_space(joint_velocity=False)
+        gripper.torque_control = True
+        robot.reset()
+        for _ in range(20):
+            c.stepSimulation()
+
+        px.checkpoint.save(path, {"robot": robot, "gripper": gripper})
+        states = robot.get_states().copy()
+        base_pose = gripper.get_base_pose()
+
+        # continue from the checkpoint
+        for _ in range(20):
+            c.stepSimulation()
+        expected = robot.get_joint_states().joint_position.copy()
+
+    with px.Client(mode=p.DIRECT) as c:
+        checkpoint = px.checkpoint.restore(path)
+        robot, gripper = checkpoint["robot"], checkpoint["gripper"]
+
+        assert isinstance(robot, px.Robot)
+        assert robot.physics_client is c
+        assert robot.free_joint_indices == [0, 1, 2, 3, 4]
+        assert np.allclose(robot.zero_pose, 0.2)
+        assert "joint_velocity" not in robot.state_space.spaces
+        assert gripper.torque_control
+        assert gripper.dtype == np.float32
+        assert c.getNumConstraints() == 1
+        assert c.getPhysicsEngineParameters()["fixedTimeStep"] == 0.002
+        assert c.step_stats.num_steps == 20
+
+        assert np.allclose(robot.get_states().joint_position, states.joint_position)
+        assert np.allclose(gripper.get_base_pose()[0], base_pose[0])
+
+        for _ in range(20):
+            c.stepSimulation()
+        actual = robot.get_joint_states().joint_position
+        assert np.allclose(actual, expected, atol=1e-6)
+
+
+def test_checkpoint_removed_bodies(tmp_path):
+    path = str(tmp_path / "world.ckpt")
+
+    with px.Client(mode=p.DIRECT) as c:
+        pool = px.BodyPool(max_idle=0, physics_client=c)
+        cubes = [pool.acquire("cube_small.urdf", (i, 0, 0.5)) for i in range(3)]
+        pool.release(cubes[0])  # evicted: removed from the world
+        robot, gripper = _build_world(c)
+        for _ in range(20):
+            c.stepSimulation()
+
+        px.checkpoint.save(path, {"gripper": gripper, "cube": cubes[2]})
+        base_pose = gripper.get_base_pose()
+        cube_pose = cubes[2].get_base_pose()
+        for _ in range(20):
+            c.stepSimulation()
+        expected = gripper.get_base_pose()
+        old_ids = (gripper.id, cubes[2].id)
+
+    with px.Client(mode=p.DIRECT) as c:
+        checkpoint = px.checkpoint.restore(path)
+        gripper, cube = checkpoint["gripper"], checkpoint["cube"]
+        assert (gripper.id, cube.id) == tuple(checkpoint.body_ids[i] for i in old_ids)
+        assert np.allclose(cube.get_base_pose()[0], cube_pose[0])
+        assert np.allclose(gripper.get_base_pose()[0], base_pose[0])
+
+        # the constraint between the robots is attached to their new ids
+        constraint_id = list(checkpoint.constraint_ids.values())[0]
+        info = c.getConstraintInfo(constraint_id)
+        assert info[2] == gripper.id
+
+        for _ in range(20):
+            c.stepSimulation()
+        assert np.allclose(gripper.get_base_pose()[0], expected[0], atol=1e-6)
+
+
+def test_checkpoint_unknown_body(tmp_path):
+    with px.Client(mode=p.DIRECT) as c:
+        p.loadURDF("kuka_iiwa/model.urdf", physicsClientId=c.id)
+        with pytest.raises(ValueError, match="weren't loaded"):
+            px.checkpoint.save(str(tmp_path / "world.ckpt"))
+
+
+def test_checkpointer(tmp_path):
+    path = str(tmp_path / "world.ckpt")
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", physics_client=c)
+        with px.checkpoint.Checkpointer(path, {"robot": robot}, 60) as checkpointer:
+            c.stepSimulation()
+        # saved when stopped, without waiting for the interval
+        assert checkpointer.num_checkpoints >= 1
+
+    with px.Client(mode=p.DIRECT):
+        assert px.checkpoint.restore(path)["robot"].num_dofs == 7
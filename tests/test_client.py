@@ -21,3 +21,27 @@ def test_client_destructor():
 
     for cid in client_ids:
         assert not p.isConnected(cid)
+
+
+def test_client_reused_id():
+    c = px.Client(mode=p.DIRECT)
+    c.loadURDF("cube_small.urdf", (0, 0, 1))
+    c.stepSimulation()
+    c.track_contacts()
+    c.closest_points_batch([(1, -1, 1, -1)], 0.1, cache=True)
+    c.createConstraint(1, -1, -1, -1, p.JOINT_FIXED, (0, 0, 0), (0, 0, 0), (0, 0, 0))
+    client_id = c.id
+    c.release()
+
+    for registry in ("_state_versions", "_contact_trackers", "_step_stats"):
+        assert client_id not in getattr(px.client, registry)
+    for registry in ("_closest_points_cache", "_loaded_urdfs", "_constraints"):
+        assert client_id not in getattr(px.client, registry)
+
+    # a new physics server that gets the same id starts from scratch
+    c = px.Client(mode=p.DIRECT)
+    assert c.state_version == 0
+    assert c.step_stats.num_steps == 0
+    assert list(px.client._loaded_urdfs[c.id]) == [0]
+    assert c.id not in px.client._contact_trackers
+    c.release()
@@ -0,0 +1,53 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+from pybulletX.closest_points import ALL_LINKS
+
+
+def test_closest_points_batch():
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        cube = px.Body("cube_small.urdf", base_position=(0.3, 0, 0.5))
+        far = px.Body("cube_small.urdf", base_position=(5, 0, 0.5))
+
+        pairs = [[robot.id, link, cube.id, -1] for link in range(robot.num_joints)]
+        pairs += [[robot.id, ALL_LINKS, cube.id, ALL_LINKS]]
+        pairs += [[robot.id, ALL_LINKS, far.id, -1]]
+        result = c.closest_points_batch(pairs, max_distance=1.0)
+
+        assert len(result) == len(pairs) == result.num_evaluated
+        for i, (body_a, link_a, body_b, link_b) in enumerate(pairs[:-2]):
+            points = p.getClosestPoints(
+                body_a, body_b, 1.0, link_a, link_b, physicsClientId=c.id
+            )
+            assert np.isclose(result.distance[i], min(pt[8] for pt in points))
+
+        assert np.isclose(result.distance[-2], result.distance[:-2].min())
+        assert result.link_index_a[-2] == np.argmin(result.distance[:-2])
+        assert result.link_index_b[-2] == -1
+        assert np.isinf(result.distance[-1])
+        assert np.all(np.isnan(result.position_on_a[-1]))
+
+        # not cached by default
+        assert c.closest_points_batch(pairs, max_distance=1.0) is not result
+        p.resetBasePositionAndOrientation(
+            cube.id, (0.2, 0, 0.5), (0, 0, 0, 1), physicsClientId=c.id
+        )
+        moved = c.closest_points_batch(pairs, max_distance=1.0)
+        assert moved.distance[-2] < result.distance[-2]
+        cube.set_base_pose((0.3, 0, 0.5))
+
+        # cached until the state of the simulation changes, if asked for
+        result = c.closest_points_batch(pairs, max_distance=1.0, cache=True)
+        assert c.closest_points_batch(pairs, max_distance=1.0, cache=True) is result
+        cube.set_base_pose((0.5, 0, 0.5))
+        moved = c.closest_points_batch(pairs, max_distance=1.0, cache=True)
+        assert moved is not result
+        assert moved.distance[-2] > result.distance[-2]
+
+        # early exit
+        first = c.closest_points_batch(pairs, max_distance=1.0, stop_below=10.0)
+        assert first.num_evaluated == 1
+        assert np.all(np.isnan(first.distance[1:]))
@@ -0,0 +1,70 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import gc
+
+import numpy as np
+import pytest
+
+import pybullet as p
+import pybulletX as px
+
+# the kuka arm folded onto itself
+FOLDED = [0, 2, 0, 2, 0, 2, 0]
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_self_collision(num_workers):
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+
+        joint_positions = np.zeros((8, robot.num_dofs))
+        joint_positions[1::2] = FOLDED
+
+        with px.CollisionChecker(robot, num_workers=num_workers) as checker:
+            in_collision, min_distances = checker.check(joint_positions)
+
+        assert in_collision.shape == min_distances.shape == (8,)
+        assert not np.any(in_collision[0::2])
+        assert np.all(in_collision[1::2])
+
+        # checking configurations doesn't move the robot in the original client
+        assert np.allclose(robot.get_joint_states().joint_position, 0)
+
+
+def test_obstacle_collision():
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        position = robot.get_link_state(4).link_world_position
+        obstacle = px.Body("cube_small.urdf", base_position=position)
+
+        joint_positions = np.zeros((2, robot.num_dofs))
+        joint_positions[1, 0] = np.pi / 2
+
+        with px.CollisionChecker(robot, [obstacle], self_collision=False) as checker:
+            in_collision, min_distances = checker.check(joint_positions)
+            assert in_collision[0]
+            assert min_distances[0] < 0
+
+            # rotating the first joint doesn't move the arm away from the cube
+            assert in_collision[1]
+
+        obstacle.set_base_pose([2.0, 0.0, 0.5])
+        with px.CollisionChecker(robot, [obstacle], self_collision=False) as checker:
+            in_collision, min_distances = checker.check(joint_positions)
+            assert not np.any(in_collision)
+            assert np.all(min_distances == np.inf)
+
+
+def test_release_on_garbage_collection():
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        checker = px.CollisionChecker(robot, num_workers=2)
+        checker.check(np.zeros((8, robot.num_dofs)))
+        checker.check(np.zeros(robot.num_dofs))
+        workers = list(checker._pool._pool)
+        client_id = checker._scene.client_id
+        assert all(worker.is_alive() for worker in workers)
+
+        del checker
+        gc.collect()
+        assert not any(worker.is_alive() for worker in workers)
+        assert not p.isConnected(physicsClientId=client_id)
@@ -0,0 +1,51 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+from pybulletX.contact_tracker import _pack_pairs, _unpack_keys
+
+
+def test_pack_pairs():
+    pairs = np.array([[0, -1, 1, -1], [3, 5, 7, 2], [1000, 4000, 0, -1]])
+    assert np.all(_unpack_keys(_pack_pairs(pairs)) == pairs)
+
+
+def test_contact_tracker():
+    with px.Client(mode=p.DIRECT) as c:
+        cube = px.Body("cube_small.urdf", base_position=(0, 0, 0.2))
+        sphere = px.Body("sphere_small.urdf", base_position=(1, 0, 0.2))
+        tracker = c.track_contacts()
+        cube_tracker = c.track_contacts([cube])
+
+        began, ended = [], []
+        for _ in range(240):
+            c.stepSimulation()
+            began += tracker.events.begin.pairs.tolist()
+            ended += tracker.events.end.pairs.tolist()
+
+        # both fell on the plane (body 0) and stay there
+        assert sorted(began) == [[0, -1, cube.id, -1], [0, -1, sphere.id, -1]]
+        assert ended == []
+        assert len(tracker.events.persist) == 2
+        assert np.all(tracker.contacts.normal_force > 0)
+        assert np.all(tracker.contacts.num_points >= 1)
+
+        # the filtered tracker only sees the cube
+        assert cube_tracker.contacts.pairs.tolist() == [[0, -1, cube.id, -1]]
+        assert np.allclose(
+            cube_tracker.contacts.normal_force,
+            tracker.contacts.involving(cube).normal_force,
+        )
+        assert len(tracker.contacts.involving(cube, other=sphere)) == 0
+
+        # lifting the cube ends its contact
+        cube.set_base_pose((0, 0, 1))
+        c.stepSimulation()
+        assert tracker.events.end.pairs.tolist() == [[0, -1, cube.id, -1]]
+        assert len(tracker.events.end.involving(cube, link=-1, other=0)) == 1
+        assert len(cube_tracker.contacts) == 0
+
+        c.untrack_contacts(cube_tracker)
+        c.stepSimulation()
+        assert len(cube_tracker.events.end) == 1
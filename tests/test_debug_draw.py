@@ -0,0 +1,86 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import itertools
+from unittest import mock
+
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_debug_draw():
+    # debug items only exist in the GUI, fake their ids in DIRECT mode
+    ids = itertools.count()
+
+    def add(*args, replaceItemUniqueId=-1, **kwargs):
+        return replaceItemUniqueId if replaceItemUniqueId >= 0 else next(ids)
+
+    with px.Client(mode=p.DIRECT), mock.patch(
+        "pybullet.addUserDebugLine", side_effect=add
+    ) as add_line, mock.patch("pybullet.addUserDebugText", side_effect=add), mock.patch(
+        "pybullet.removeUserDebugItem"
+    ) as remove:
+        draw = px.gui.DebugDraw()
+        draw.axes("frame", position=(0, 0, 1))
+        draw.trajectory("path", np.random.rand(5, 3))
+        draw.text("label", "hello", (0, 0, 2))
+        assert draw.num_items == 0
+        assert draw.flush()
+        assert draw.num_items == 3 + 4 + 1
+        assert add_line.call_count == 7
+        start, end, color = add_line.call_args_list[2][0]
+        assert np.allclose(start, (0, 0, 1)) and np.allclose(end, (0, 0, 1.1))
+        assert np.allclose(color, (0, 0, 1))
+
+        # unchanged items are not sent again, changed ones are replaced in place
+        add_line.reset_mock()
+        draw.axes("frame", position=(0, 0, 1))
+        draw.axes("frame", position=(1, 0, 1))
+        draw.flush()
+        assert add_line.call_count == 3
+        assert [c[1]["replaceItemUniqueId"] for c in add_line.call_args_list] == [
+            0,
+            1,
+            2,
+        ]
+        assert draw.num_items == 8
+
+        # only the surplus items are removed
+        add_line.reset_mock()
+        draw.trajectory("path", np.random.rand(3, 3))
+        draw.contacts("contacts", [])
+        draw.flush()
+        assert remove.call_count == 2
+        assert draw.num_items == 6
+
+        # contacts are drawn as arrows (shaft and 2 barbs)
+        add_line.reset_mock()
+        point = (0, 1, 2, -1, -1, (0, 0, 0), (0, 0, 0), (0, 0, 1), 0.0, 100.0)
+        draw.contacts("contacts", [point, point], scale=0.01)
+        draw.flush()
+        assert draw.num_items == 6 + 6
+        assert np.allclose(add_line.call_args_list[0][0][1], (0, 0, 1))
+
+        draw.clear()
+        draw.flush()
+        assert draw.num_items == 0
+        assert len(draw.keys()) == 0
+
+
+def test_debug_draw_max_rate():
+    with px.Client(mode=p.DIRECT), mock.patch(
+        "pybullet.addUserDebugLine", return_value=0
+    ) as add_line:
+        draw = px.gui.DebugDraw(max_rate=1e-3)
+        draw.line("line", (0, 0, 0), (1, 0, 0))
+        assert draw.flush()
+
+        # too early, coalesced with the next flush
+        draw.line("line", (0, 0, 0), (2, 0, 0))
+        draw.line("line", (0, 0, 0), (3, 0, 0))
+        assert not draw.flush()
+        assert add_line.call_count == 1
+
+        assert draw.flush(force=True)
+        assert add_line.call_count == 2
+        assert np.allclose(add_line.call_args[0][1], (3, 0, 0))
@@ -0,0 +1,65 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import warnings
+
+import numpy as np
+import pytest
+
+import pybullet as p
+import pybulletX as px
+
+
+@pytest.fixture()
+def float32():
+    px.set_default_dtype(np.float32)
+    yield
+    px.set_default_dtype(np.float64)
+
+
+def test_default_dtype(float32):
+    assert px.get_default_dtype() == np.float32
+    with pytest.raises(TypeError):
+        px.set_default_dtype(np.int32)
+
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        joint_states = px.getJointStates(robot.id, [0, 1], physicsClientId=c.id)
+        assert joint_states.joint_position.dtype == np.float32
+        assert joint_states.joint_reaction_forces.dtype == np.float32
+        link_states = robot.get_link_states()
+        assert link_states.link_world_position.dtype == np.float32
+
+        # the dtype can be chosen per call
+        joint_states = px.getJointStates(
+            robot.id, [0, 1], dtype=np.float64, physicsClientId=c.id
+        )
+        assert joint_states.joint_position.dtype == np.float64
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            state_space = robot.state_space
+        for key, value in robot.get_states().items():
+            assert value.dtype == np.float32
+            assert state_space[key].dtype == np.float32
+            assert state_space[key].contains(value)
+        assert robot.action_space.joint_position.dtype == np.float32
+
+        # the internal computations keep using float64
+        assert robot._get_movable_joint_positions().dtype == np.float64
+        tree = px.kinematics.KinematicTree(robot)
+        assert tree.default_joint_positions.dtype == np.float64
+
+
+def test_robot_dtype():
+    with px.Client(mode=p.DIRECT):
+        robot64 = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        robot32 = px.Robot(
+            "kuka_iiwa/model.urdf", use_fixed_base=True, dtype=np.float32
+        )
+        assert robot64.dtype == np.float64 and robot32.dtype == np.float32
+        assert robot64.get_states().joint_position.dtype == np.float64
+        assert robot32.get_states().joint_position.dtype == np.float32
+        assert robot32.get_joint_states().joint_velocity.dtype == np.float32
+
+        # the spaces are shared per model and dtype
+        assert robot64.state_space.joint_position.dtype == np.float64
+        assert robot32.state_space.joint_position.dtype == np.float32
@@ -0,0 +1,68 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+import pybullet as p
+import pybulletX as px
+from pybulletX.utils.fixed_dict import FixedDict
+
+
+def test_fixed_dict():
+    states = FixedDict(arm={"joint_position": np.zeros(3)}, gripper=0.5)
+    assert list(states) == ["arm", "gripper"]
+    assert isinstance(states.arm, FixedDict)
+    assert states.arm.joint_position is states["arm"]["joint_position"]
+    assert dict(states.arm) == {"joint_position": states.arm.joint_position}
+    assert type(states.arm) is type(FixedDict(joint_position=None))
+
+    # refilled in place, nested containers included
+    arm = states.arm
+    states.update({"arm": {"joint_position": np.ones(3)}, "gripper": 1.0})
+    assert states.arm is arm and np.all(arm.joint_position == 1)
+    assert states.gripper == 1.0
+
+    # the keys are fixed
+    with pytest.raises(AttributeError):
+        states.base = 1
+    with pytest.raises(KeyError):
+        states["base"] = 1
+    with pytest.raises(KeyError):
+        states["base"]
+    with pytest.raises(ValueError):
+        FixedDict({"not an identifier": 1})
+    with pytest.raises(ValueError):
+        FixedDict(items=1)
+
+    for clone in [
+        states.copy(),
+        copy.deepcopy(states),
+        pickle.loads(pickle.dumps(states)),
+    ]:
+        assert clone is not states and clone.arm is not states.arm
+        assert list(clone) == list(states)
+        assert np.all(clone.arm.joint_position == 1)
+
+
+def test_get_states_reuses_container():
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        states = robot.get_states()
+        assert isinstance(states, FixedDict)
+        q = states.joint_position.copy()
+
+        for joint_index in robot.free_joint_indices:
+            robot.reset_joint_state(joint_index, 0.3)
+        assert robot.get_states() is states
+        assert np.allclose(states.joint_position, 0.3) and not np.allclose(q, 0.3)
+
+        # the keys follow the configured state space
+        robot.configure_state_space(joint_reaction_forces=False)
+        assert "joint_reaction_forces" not in robot.get_states()
+
+        actions = robot.action_space.new()
+        assert isinstance(actions, FixedDict) and actions.joint_position is None
+        actions.joint_position = np.zeros(7)
+        robot.set_actions(actions)
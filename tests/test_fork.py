@@ -0,0 +1,43 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+import pytest
+
+
+def test_fork():
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", physics_client=c)
+
+        def branch(i):
+            assert px.current_client() is c
+            actions = robot.action_space.new()
+            actions.joint_position = np.full(robot.num_dofs, 0.1 * i)
+            robot.set_actions(actions)
+            for _ in range(100):
+                c.stepSimulation()
+            return robot.get_joint_states().joint_position
+
+        with c.fork(3, branch) as children:
+            positions = children.results()
+        assert children.done
+        for i, position in enumerate(positions):
+            assert np.allclose(position, 0.1 * i, atol=0.05)
+
+        # the children don't touch the world of the parent
+        assert np.allclose(robot.get_joint_states().joint_position, 0)
+
+
+def test_fork_error():
+    with px.Client(mode=p.DIRECT) as c:
+
+        def branch(i):
+            if i == 1:
+                raise ValueError("boom")
+            return i
+
+        children = c.fork(2, branch)
+        with pytest.raises(px.fork.ForkError, match="Child 1 raised ValueError"):
+            children.results()
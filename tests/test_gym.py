@@ -0,0 +1,86 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+import pytest
+
+import pybullet as p
+import pybulletX as px
+
+
+def make_env():
+    client = px.Client(mode=p.DIRECT)
+    robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True, physics_client=client)
+    robot.configure_state_space(joint_reaction_forces=False)
+
+    def reward_fn(states, actions):
+        return -np.abs(states.joint_position - actions.joint_position).sum()
+
+    return px.gym.RobotEnv(
+        robot, reward_fn=reward_fn, max_episode_steps=5, physics_client=client
+    )
+
+
+def failing_env():
+    raise ValueError("no robot")
+
+
+def test_robot_env():
+    env = make_env()
+    states = env.reset()
+    assert env.observation_space.contains(states)
+    actions = env.action_space.new()
+    actions.joint_position = np.full(7, 0.1)
+    for i in range(5):
+        states, reward, done, info = env.step(actions)
+        assert reward < 0 and done == (i == 4)
+    assert info["TimeLimit.truncated"]
+
+    # observations are not overwritten by the next steps
+    observations = [env.reset()]
+    for _ in range(2):
+        observations.append(env.step(actions)[0])
+    assert observations[0] is not observations[1]
+    assert not np.allclose(
+        observations[0].joint_position, observations[2].joint_position
+    )
+    env.close()
+
+
+def test_vec_env():
+    env = px.gym.VecEnv([make_env] * 3)
+    try:
+        assert env.num_envs == 3
+        assert set(env.single_observation_space) == {
+            "joint_position",
+            "joint_velocity",
+            "applied_joint_motor_torque",
+        }
+        states = env.reset()
+        assert states.joint_position.shape == (3, 7)
+        assert np.allclose(states.joint_position, 0)
+
+        # batched actions, one target per environment
+        targets = np.linspace(0.1, 0.3, 3)[:, None] * np.ones(7)
+        env.step_async({"joint_position": targets})
+        states, rewards, dones, infos = env.step_wait()
+        assert rewards.shape == dones.shape == (3,) and not dones.any()
+        for _ in range(3):
+            states, rewards, dones, infos = env.step({"joint_position": targets})
+        # the arms move towards their own targets
+        assert np.all(np.diff(states.joint_position[:, 0]) > 0)
+
+        # episodes are reset automatically
+        states, rewards, dones, infos = env.step(
+            [{"joint_position": target} for target in targets]
+        )
+        assert dones.all()
+        assert np.allclose(states.joint_position, 0)
+        terminal = infos[2]["terminal_observation"]
+        assert terminal["joint_position"][0] > 0
+    finally:
+        env.close()
+    assert all(not process.is_alive() for process in env.processes)
+
+
+def test_vec_env_worker_error():
+    with pytest.raises(RuntimeError, match="no robot"):
+        px.gym.VecEnv([make_env, failing_env])
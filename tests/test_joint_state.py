@@ -1,4 +1,7 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import pickle
+
+import numpy as np
 import pybullet as p
 import pybulletX  # noqa: F401
 
@@ -25,3 +28,13 @@ def test_get_joint_states(helpers, kuka_arm):
     for i, joint_state in enumerate(joint_states):
         assert joint_states[i] == joint_state
         helpers.check_getitem_method(joint_state)
+
+
+def test_pickle_joint_states(kuka_arm):
+    joint_state = p.getJointState(kuka_arm, 0)
+    assert pickle.loads(pickle.dumps(joint_state)) == joint_state
+
+    joint_states = pybulletX.getJointStates(kuka_arm, range(7))
+    unpickled = pickle.loads(pickle.dumps(joint_states))
+    assert np.array_equal(unpickled.joint_position, joint_states.joint_position)
+    assert unpickled[3] == joint_states[3]
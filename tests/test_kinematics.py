@@ -0,0 +1,46 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+import pytest
+
+import pybullet as p
+import pybulletX as px
+
+
+def _quat_allclose(q1, q2):
+    # q and -q represent the same rotation
+    return np.allclose(q1, q2, atol=1e-6) or np.allclose(q1, -q2, atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "urdf_path", ["kuka_iiwa/model.urdf", "franka_panda/panda.urdf", "r2d2.urdf"]
+)
+def test_forward_kinematics(urdf_path):
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot(
+            urdf_path,
+            base_position=(0.3, 0.2, 0.5),
+            base_orientation=p.getQuaternionFromEuler([0.3, 0.1, 0.7]),
+        )
+        tree = px.kinematics.KinematicTree(robot)
+
+        joint_positions = np.random.uniform(-0.5, 0.5, size=(5, robot.num_dofs))
+        poses = tree.forward_kinematics(joint_positions)
+
+        for key in ["link_world_position", "world_link_frame_position"]:
+            assert poses[key].shape == (5, robot.num_joints, 3)
+
+        joint_indices = range(robot.num_joints)
+        for i, joint_position in enumerate(joint_positions):
+            for joint_index, q in zip(robot.free_joint_indices, joint_position):
+                robot.reset_joint_state(joint_index, q)
+
+            link_states = robot.get_link_states(
+                joint_indices, computeForwardKinematics=True
+            )
+            for key, value in poses.items():
+                expected = getattr(link_states, key)
+                if key.endswith("position"):
+                    assert np.allclose(value[i], expected, atol=1e-6)
+                else:
+                    for q1, q2 in zip(value[i], expected):
+                        assert _quat_allclose(q1, q2)
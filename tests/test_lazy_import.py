@@ -0,0 +1,21 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import sys
+import subprocess
+
+import pybulletX as px
+
+
+def test_import_does_not_load_gym():
+    code = (
+        "import sys, pybulletX; "
+        "assert 'gym' not in sys.modules; "
+        "assert 'pybulletX.gui' not in sys.modules"
+    )
+    subprocess.check_call([sys.executable, "-c", code])
+
+
+def test_lazy_attributes():
+    assert px.gui.RobotControlPanel is not None
+    assert px.utils.SpaceDict is not None
+    assert px.CollisionChecker is px.collision_checker.CollisionChecker
+    assert "kinematics" in dir(px)
@@ -0,0 +1,83 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+import pytest
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_generic_robot_log(tmp_path):
+    path = str(tmp_path / "robot.log")
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        cube = px.Body("cube_small.urdf", base_position=(1, 0, 1))
+
+        log_id = c.startStateLogging(
+            p.STATE_LOGGING_GENERIC_ROBOT,
+            path,
+            objectUniqueIds=[robot.id, cube.id],
+            maxLogDof=16,
+        )
+        robot.set_actions({"joint_position": np.full(7, 0.5)})
+        for _ in range(10):
+            c.stepSimulation()
+        c.stopStateLogging(log_id)
+
+        log = px.logs.GenericRobotLog(path)
+        assert log.body_ids == [robot.id, cube.id]
+        assert robot in log and 42 not in log
+        with pytest.raises(KeyError):
+            log[42]
+
+        states = log[robot]
+        assert len(states) == 10
+        assert np.all(np.diff(states.step_count) == 1)
+        assert states.joint_position.shape == states.joint_velocity.shape == (10, 7)
+        assert np.abs(states.joint_velocity).max() > 0
+        assert states.base_orientation.shape == (10, 4)
+
+        # the last record is the current state
+        joint_states = robot.get_joint_states(robot.free_joint_indices)
+        assert np.allclose(
+            states.joint_position[-1], joint_states.joint_position, atol=1e-5
+        )
+
+        cube_states = log.bodies()[cube.id]
+        assert cube_states.joint_position.shape == (10, 0)
+        position, orientation = cube.get_base_pose()
+        assert np.allclose(cube_states.base_position[-1], position, atol=1e-5)
+        assert np.allclose(cube_states.base_orientation[-1], orientation, atol=1e-5)
+        assert np.all(np.diff(cube_states.base_linear_velocity[:, 2]) < 0)
+
+
+def test_truncated_log(tmp_path):
+    path = tmp_path / "robot.log"
+    with px.Client(mode=p.DIRECT) as c:
+        px.Body("cube_small.urdf", base_position=(0, 0, 1))
+        log_id = c.startStateLogging(p.STATE_LOGGING_GENERIC_ROBOT, str(path))
+        for _ in range(3):
+            c.stepSimulation()
+        c.stopStateLogging(log_id)
+
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    # 3 steps of the plane and the cube, the last record is incomplete
+    assert len(px.logs.GenericRobotLog(str(path))) == 5
+
+    # records not starting with the marker
+    path.write_bytes(data[:-10].replace(b"\xaa\xbb", b"\x00\x00"))
+    with pytest.raises(ValueError):
+        px.logs.GenericRobotLog(str(path))
+
+
+def test_log_dtype(tmp_path):
+    path = str(tmp_path / "robot.log")
+    with px.Client(mode=p.DIRECT) as c:
+        cube = px.Body("cube_small.urdf", base_position=(0, 0, 1))
+        log_id = c.startStateLogging(p.STATE_LOGGING_GENERIC_ROBOT, path)
+        c.stepSimulation()
+        c.stopStateLogging(log_id)
+
+    states = px.logs.GenericRobotLog(path, dtype=np.float32)[cube]
+    assert states.base_position.dtype == np.float32
+    assert states.joint_position.dtype == np.float32
@@ -0,0 +1,82 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_dynamics_randomizer():
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot("kuka_iiwa/model.urdf")
+        cube = px.Body("cube_small.urdf")
+
+        randomizer = px.randomization.DynamicsRandomizer(
+            [robot, cube],
+            seed=0,
+            mass=(0.8, 1.2),
+            lateral_friction=(0.5, 1.5),
+            joint_damping=(0.0, 2.0),
+        )
+        assert randomizer.num_links == robot.num_joints + 1 + cube.num_joints + 1
+
+        nominal_mass = robot.get_dynamics_infos(range(-1, robot.num_joints)).mass
+
+        values = randomizer.randomize()
+        mass = robot.get_dynamics_infos(range(-1, robot.num_joints)).mass
+        assert np.allclose(mass, randomizer.get_values(robot)["mass"])
+        assert np.all(mass >= nominal_mass * 0.8)
+        assert np.all(mass <= nominal_mass * 1.2)
+        assert not np.allclose(mass, nominal_mass)
+
+        # nothing changed, nothing to apply
+        assert randomizer.apply(values) == 0
+
+        randomizer.restore()
+        mass = robot.get_dynamics_infos(range(-1, robot.num_joints)).mass
+        assert np.allclose(mass, nominal_mass)
+
+
+def test_dynamics_randomizer_callable():
+    with px.Client(mode=p.DIRECT):
+        cube = px.Body("cube_small.urdf")
+
+        randomizer = px.randomization.DynamicsRandomizer(
+            [cube],
+            restitution=lambda rng, nominal: rng.uniform(0.2, 0.8, nominal.shape),
+        )
+        randomizer.randomize()
+        restitution = cube.get_dynamics_info(-1).restitution
+        assert 0.2 <= restitution <= 0.8
+
+
+def test_dynamics_randomizer_robot_control():
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        robot.reset_joint_state(1, 0.5)
+        joint_position = robot.get_states().joint_position.copy()
+
+        randomizer = px.randomization.DynamicsRandomizer(
+            [robot],
+            mass=(2.0, 2.0),
+            joint_friction=lambda rng, nominal: np.where(
+                np.isnan(nominal), np.nan, 0.1
+            ),
+        )
+
+        # changing the masses invalidates the per-step caches of the robot
+        M = robot.mass_matrix()
+        randomizer.randomize()
+        assert robot.mass_matrix() is not M
+
+        # the weak friction motors don't hold the robot against gravity
+        for _ in range(100):
+            c.stepSimulation()
+        assert not np.allclose(robot.get_states().joint_position, joint_position)
+
+        # but its motors are locked again once restored
+        assert not robot.torque_control
+        randomizer.restore()
+        joint_position = robot.get_states().joint_position.copy()
+        for _ in range(100):
+            c.stepSimulation()
+        assert np.allclose(robot.get_states().joint_position, joint_position, atol=1e-3)
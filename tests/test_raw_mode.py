@@ -0,0 +1,51 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import os
+import sys
+import subprocess
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_client_raw_mode():
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+
+        assert isinstance(c.getJointInfo(robot.id, 0), px.JointInfo)
+        assert isinstance(c.getJointState(robot.id, 0), px.JointState)
+
+        with c.raw_mode():
+            assert isinstance(c.getJointInfo(robot.id, 0), tuple)
+            assert isinstance(c.getJointStates(robot.id, [0, 1]), tuple)
+            assert isinstance(c.getLinkState(robot.id, 0), tuple)
+            assert isinstance(c.getDynamicsInfos(robot.id, [0, 1])[0], tuple)
+            # Body methods always return pybulletX structs
+            assert isinstance(robot.get_joint_state(0), px.JointState)
+
+        assert isinstance(c.getJointInfo(robot.id, 0), px.JointInfo)
+
+
+def test_unpatched_pybullet():
+    code = (
+        "import pybullet as p, pybulletX as px\n"
+        "with px.Client(mode=p.DIRECT) as c:\n"
+        "    robot = px.Robot('kuka_iiwa/model.urdf')\n"
+        "    info = p.getJointInfo(robot.id, 0, physicsClientId=c.id)\n"
+        "    assert isinstance(info, tuple)\n"
+        "    assert not hasattr(p, 'getJointInfos')\n"
+        "    assert not hasattr(p, 'setParameters')\n"
+        "    assert isinstance(c.getJointInfo(robot.id, 0), px.JointInfo)\n"
+        "    assert isinstance(robot.get_joint_states().joint_position[0], float)\n"
+    )
+    env = dict(os.environ, PYBULLETX_PATCH_PYBULLET="0")
+    subprocess.check_call([sys.executable, "-c", code], env=env)
+
+
+def test_patch_unpatch_pybullet():
+    try:
+        px.unpatch_pybullet()
+        assert p.getJointStates is px._wrapper._orig_pybullet.getJointStates
+        assert not hasattr(p, "getJointInfos")
+    finally:
+        px.patch_pybullet()
+    assert p.getJointInfo is px.getJointInfo
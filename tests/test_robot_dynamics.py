@@ -0,0 +1,78 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_robot_dynamics():
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+
+        J = robot.jacobian(6)
+        M = robot.mass_matrix()
+        tau = robot.gravity_torques()
+
+        assert J.shape == (6, robot.num_dofs)
+        assert M.shape == (robot.num_dofs, robot.num_dofs)
+        assert tau.shape == (robot.num_dofs,)
+        assert np.allclose(M, M.T)
+
+        # repeated queries within the same step are served from the cache
+        assert robot.jacobian(6) is J
+        assert robot.mass_matrix() is M
+        assert robot.gravity_torques() is tau
+
+        # resetting the joint states invalidates the cache
+        robot.reset_joint_state(1, 0.5)
+        assert robot.jacobian(6) is not J
+        assert not np.allclose(robot.jacobian(6), J)
+
+        # so does stepping the simulation, when the joints move
+        robot.torque_control = True
+        M = robot.mass_matrix()
+        c.stepSimulation()
+        assert robot.mass_matrix() is not M
+
+        # and so do the state changes made through the client
+        M = robot.mass_matrix()
+        c.resetJointState(robot.id, 2, 1.0)
+        assert not np.allclose(robot.mass_matrix(), M)
+
+        M = robot.mass_matrix()
+        c.changeDynamics(robot.id, 3, mass=10.0)
+        assert robot.mass_matrix() is not M
+
+        tau = robot.gravity_torques()
+        c.setGravity(0, 0, -1)
+        assert not np.allclose(robot.gravity_torques(), tau)
+
+        # changes made with pybullet directly need invalidate_caches()
+        for _ in range(240):
+            p.stepSimulation(physicsClientId=c.id)
+        c.invalidate_caches()
+        expected = np.array(
+            p.calculateMassMatrix(
+                robot.id,
+                robot.get_states().joint_position.tolist(),
+                physicsClientId=c.id,
+            )
+        )
+        assert np.allclose(robot.mass_matrix(), expected)
+
+
+def test_robot_dynamics_free_joint_indices():
+    free_joint_indices = [1, 2, 4, 5]
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+
+        J_full = robot.jacobian(6)
+        M_full = robot.mass_matrix()
+
+        robot.free_joint_indices = free_joint_indices
+
+        assert np.allclose(robot.jacobian(6), J_full[:, free_joint_indices])
+        assert np.allclose(
+            robot.mass_matrix(), M_full[np.ix_(free_joint_indices, free_joint_indices)]
+        )
+        assert robot.gravity_torques().shape == (len(free_joint_indices),)
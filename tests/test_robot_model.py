@@ -0,0 +1,37 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import gc
+
+import numpy as np
+import pybullet as p
+import pybulletX as px
+from pybulletX.robot_model import RobotModel, _models
+
+
+def test_robot_model_shared():
+    with px.Client(mode=p.DIRECT):
+        r1 = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        r2 = px.Robot("kuka_iiwa/model.urdf", base_position=(1, 0, 0))
+        r3 = px.Robot("kuka_iiwa/model.urdf", global_scaling=2.0)
+
+        assert r1.model is r2.model
+        assert r1.model is not r3.model
+        assert r1.full_state_space is r2.full_state_space
+
+        # the model returns the same thing as pybullet
+        assert r1.num_joints == p.getNumJoints(r1.id, **r1._client_kwargs)
+        info = r2.get_joint_infos()
+        expected = px.getJointInfos(r2.id, r2.free_joint_indices, **r2._client_kwargs)
+        assert np.all(info.joint_upper_limit == expected.joint_upper_limit)
+        assert r2.get_joint_info(3).joint_name == expected.joint_name[3]
+        assert not info.joint_upper_limit.flags.writeable
+
+        # free joint indices are per instance
+        r1.free_joint_indices = [0, 1]
+        assert r2.num_dofs == 7
+        assert r1.full_state_space["joint_position"].shape == (2,)
+        assert r2.full_state_space["joint_position"].shape == (7,)
+
+        key = RobotModel.key(r1)
+        del r1, r2, r3
+        gc.collect()
+        assert key not in _models
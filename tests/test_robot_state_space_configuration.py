@@ -28,3 +28,21 @@ def test_robot_state_space_configuration(
             assert applied_joint_motor_torque == hasattr(
                 S, "applied_joint_motor_torque"
             )
+
+
+def test_force_torque_sensors_follow_state_space():
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        assert robot._force_torque_sensor_joints == set(robot.free_joint_indices)
+
+        robot.configure_state_space(joint_reaction_forces=False)
+        assert robot._force_torque_sensor_joints == set()
+        c.stepSimulation()
+        assert not robot.get_joint_states().joint_reaction_forces.any()
+
+        robot.configure_state_space(joint_reaction_forces=True)
+        c.stepSimulation()
+        assert robot.get_states().joint_reaction_forces.any()
+
+        robot.free_joint_indices = robot.free_joint_indices[:3]
+        assert robot._force_torque_sensor_joints == set(robot.free_joint_indices)
@@ -0,0 +1,49 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_rollout_collector():
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        robot.configure_state_space(joint_reaction_forces=False)
+        target = np.full(robot.num_dofs, 0.5)
+
+        def policy(states):
+            actions = robot.action_space.new()
+            actions.joint_position = target - 0.1 * states.joint_position
+            return actions
+
+        collector = px.RolloutCollector(robot, max_steps=50)
+        rollout = collector.collect(policy)
+        assert rollout.num_steps == len(rollout) == 50
+        assert set(rollout.states) == {
+            "joint_position",
+            "joint_velocity",
+            "applied_joint_motor_torque",
+        }
+        assert rollout.states.joint_position.shape == (51, robot.num_dofs)
+        assert rollout.actions.joint_position.shape == (50, robot.num_dofs)
+
+        # states[t] are the inputs of actions[t], states[-1] the final states
+        assert np.allclose(
+            rollout.actions.joint_position,
+            target - 0.1 * rollout.states.joint_position[:-1],
+        )
+        assert np.allclose(
+            rollout.states.joint_position[-1], robot.get_states().joint_position
+        )
+        assert np.abs(rollout.states.joint_velocity).max() > 0
+
+        # early termination, the views share the (reused) buffers
+        first = rollout.states.joint_position
+        robot.reset()
+        rollout = collector.collect(
+            policy, done=lambda states: states.joint_position[0] > 0.3
+        )
+        assert 0 < rollout.num_steps < 50
+        assert rollout.states.joint_position[-1, 0] > 0.3
+        assert np.all(rollout.states.joint_position[:-1, 0] <= 0.3)
+        assert np.shares_memory(first, rollout.states.joint_position)
@@ -0,0 +1,114 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import time
+import multiprocessing as mp
+
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+import pytest
+
+
+def _consumer(address, authkey, queue):
+    with px.server.connect(address, authkey) as client:
+        num_dofs = client.body("robot").get_joint_states().joint_position.shape[0]
+
+        with client.batch() as batch:
+            actions = {"joint_position": np.full(num_dofs, 0.3)}
+            batch.body("robot").set_actions(actions)
+            steps = [batch.stepSimulation() for _ in range(200)]
+            num_bodies = batch.getNumBodies()
+            missing = batch.body("robot").no_such_method()
+        assert all(step.done for step in steps)
+
+        with pytest.raises(px.server.RemoteError, match="AttributeError"):
+            missing.result()
+        with pytest.raises(px.server.RemoteError, match="KeyError"):
+            client.body("no_such_body").get_states()
+
+        num_steps, states = client.snapshot("robot")
+        queue.put((num_bodies.result(), num_steps, states.joint_position))
+
+
+def test_server():
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+
+        with px.server.Server({"robot": robot}) as server:
+            ctx = mp.get_context("fork")
+            queue = ctx.Queue()
+            process = ctx.Process(
+                target=_consumer, args=(server.address, server.authkey, queue)
+            )
+            process.start()
+            num_bodies, num_steps, joint_position = queue.get(timeout=60)
+            process.join(60)
+            assert process.exitcode == 0
+
+        assert num_bodies == 2
+        assert num_steps == c.step_stats.num_steps == 200
+        assert np.allclose(joint_position, robot.get_states().joint_position)
+        assert np.allclose(joint_position, 0.3, atol=0.05)
+
+
+def test_server_connections_and_snapshot_timeout():
+    with px.Client(mode=p.DIRECT):
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+
+        with px.server.Server({"robot": robot}) as server:
+            for _ in range(3):
+                with px.server.connect(server.address, server.authkey) as client:
+                    client.stepSimulation()
+                    num_steps, _ = client.snapshot("robot")
+                    assert num_steps >= 1
+
+            # the connections of the consumers that left are dropped
+            deadline = time.monotonic() + 10
+            while server._connections and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert not server._connections
+
+            # a server that died in the middle of a publish
+            client = px.server.connect(server.address, server.authkey)
+            client.snapshot("robot")
+            server._header[0] += 1
+            with pytest.raises(px.server.RemoteError, match="Timed out"):
+                client.snapshot("robot", timeout=0.05)
+            server._header[0] += 1
+            client.close()
+
+
+class _Stepper:
+    def __init__(self, physics_client):
+        self.physics_client = physics_client
+
+    def step(self):
+        self.physics_client.stepSimulation()
+
+    def unpicklable(self):
+        return lambda: None
+
+
+def test_server_execute():
+    with px.Client(mode=p.DIRECT) as c:
+        robot = px.Robot("kuka_iiwa/model.urdf", use_fixed_base=True)
+        stepper = _Stepper(c)
+
+        with px.server.Server({"robot": robot, "stepper": stepper}) as server:
+            with px.server.connect(server.address, server.authkey) as client:
+                # steps made by a body method are published too
+                client.body("stepper").step()
+                num_steps, _ = client.snapshot("robot")
+                assert num_steps == 1
+
+                # only the call whose result can't be pickled fails
+                with client.batch() as batch:
+                    step = batch.body("stepper").step()
+                    bad = batch.body("stepper").unpicklable()
+                    num_bodies = batch.getNumBodies()
+                assert step.result() is None
+                assert num_bodies.result() == 2
+                with pytest.raises(px.server.RemoteError):
+                    bad.result()
+                assert client.snapshot("robot")[0] == 2
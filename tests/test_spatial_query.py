@@ -0,0 +1,50 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+from unittest import mock
+
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_spatial_query():
+    with px.Client(mode=p.DIRECT) as c:
+        cube = px.Body("cube_small.urdf", base_position=(0, 0, 0.5))
+        sphere = px.Body("sphere_small.urdf", base_position=(0.04, 0, 0.5))
+        far = px.Body("cube_small.urdf", base_position=(2, 0, 0.5))
+        robot = px.Robot("kuka_iiwa/model.urdf", base_position=(-2, 0, 0))
+
+        query = px.SpatialQuery([cube, sphere, far.id, (robot, 6)])
+        aabbs = query.aabbs
+        assert aabbs.shape == (4, 2, 3)
+        assert np.allclose(aabbs[0], p.getAABB(cube.id, physicsClientId=c.id))
+        assert np.allclose(aabbs[3], p.getAABB(robot.id, 6, physicsClientId=c.id))
+
+        # cached until the next step
+        with mock.patch("pybullet.getAABB") as getAABB:
+            assert query.aabbs is aabbs
+            getAABB.assert_not_called()
+
+        inside = query.inside((-1, -1, 0), (1, 1, 1))
+        assert inside.tolist() == [True, True, False, False]
+        overlaps = query.overlaps_region((1.9, -1, 0), (3, 1, 1))
+        assert overlaps.tolist() == [False, False, True, False]
+        assert query.overlapping(0).tolist() == [1]
+        assert query.overlapping(2, margin=1.0).tolist() == []
+        assert query.overlapping_pairs().tolist() == [[0, 1]]
+
+        # teleporting a body invalidates the cache
+        cube.set_base_pose((2, 0, 0.5))
+        assert query.overlapping_pairs().tolist() == [[0, 2]]
+
+        # so does stepping the simulation
+        aabbs = query.aabbs
+        c.stepSimulation()
+        assert query.aabbs is not aabbs
+
+        # changes made with pybullet directly need invalidate()
+        p.resetBasePositionAndOrientation(
+            cube.id, (0, 0, 0.5), (0, 0, 0, 1), physicsClientId=c.id
+        )
+        query.invalidate()
+        assert query.overlapping_pairs().tolist() == [[0, 1]]
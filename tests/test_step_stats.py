@@ -0,0 +1,49 @@
+# Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
+import numpy as np
+
+import pybullet as p
+import pybulletX as px
+
+
+def test_step_stats():
+    with px.Client(mode=p.DIRECT) as c:
+        stats = c.step_stats
+        assert stats.num_steps == 0
+        assert np.isnan(stats.real_time_factor)
+        assert np.all(np.isnan(stats.percentiles()))
+
+        for _ in range(10):
+            c.stepSimulation()
+        px.setParameters({"timeStep": 0.01})
+        for _ in range(5):
+            px.stepSimulation()
+
+        # the same stats are shared by all the clients of a physics server
+        assert px.Client(client_id=c.id).step_stats is stats
+        assert stats.num_steps == 15
+        assert np.isclose(stats.sim_time, 10 / 240 + 5 * 0.01)
+        assert len(stats.durations) == 15
+        p50, p99 = stats.percentiles((50, 99))
+        assert 0 < p50 <= p99
+        assert stats.wall_time >= stats.step_time > 0
+        assert stats.max_real_time_factor >= stats.real_time_factor > 0
+
+        c.setTimeStep(0.1)
+        c.stepSimulation()
+        assert np.isclose(stats.sim_time, 10 / 240 + 5 * 0.01 + 0.1)
+
+        exported = stats.as_dict()
+        assert exported["num_steps"] == 16
+        assert set(exported) >= {"step_duration_p50", "real_time_factor"}
+
+        stats.reset()
+        assert stats.num_steps == 0 and stats.sim_time == 0
+
+
+def test_step_stats_window():
+    with px.Client(mode=p.DIRECT) as c:
+        stats = px.step_stats.StepStats(c.id, window=4)
+        for i in range(10):
+            stats.record(i, i + 0.5 * i)
+        assert stats.num_steps == 10
+        assert sorted(stats.durations) == [3, 3.5, 4, 4.5]